@@ -1,122 +1,184 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+import asyncio
 import pytz
-from scipy import stats
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 import warnings
+import argparse
+import glob
+import os
+import pickle
+from asx_bar_cache import CachedBarProvider, provider_identity
+from asx_calendar import session_calendar
+from asx_checkpoint import RunCheckpoint, config_key
+from asx_screening import screen_universe
+from asx_significance import SIGNIFICANCE_ALPHA, series_seed, slot_significance
+from asx_instrumentation import RunRecorder, frame_bytes
+from asx_live import LiveSlotMonitor
+from asx_pipeline import run_pipeline
+from asx_report_writer import open_report_writer
+from asx_resample import resample_bars, splice_history
+from asx_results import (SlotResults, best_opportunities, build_results_frame, executive_summary,
+                         sector_period_returns, sector_summary, slot_correlation_table, stock_opportunities,
+                         subsector_summary)
+from asx_universe import (DEFAULT_UNIVERSE, flatten_sectors, load_universe, parse_shard, shard_path,
+                          shard_sectors)
+from asx_slots import SLOT_MINUTES, SLOT_RESOLUTIONS, assign_slots, prepare_returns, slot_labels, slot_statistics
+from asx_stats_store import SlotStatsStore, multi_resolution_statistics
 warnings.filterwarnings('ignore')
 
 awst = pytz.timezone('Australia/Perth')
 
+INTRADAY_TIMEFRAMES = ['1min', '5min', '15min', '30min', '1hour']
+# Timeframes requested from the bar provider: timeframe -> (Yahoo interval, history window)
+DOWNLOADED_TIMEFRAMES = {
+    '1min': ('1m', '7d'),
+    '5min': ('5m', '60d'),
+    '1hour': ('1h', '730d'),
+}
+# Timeframes built locally from a finer one: timeframe -> (source timeframe, resample rule).
+# 1hour keeps the downloaded bars only for history older than the 5min window.
+RESAMPLED_TIMEFRAMES = {
+    '15min': ('5min', '15min'),
+    '30min': ('5min', '30min'),
+    '1hour': ('5min', '1h'),
+}
+
+# (provider identity, ticker, timeframe, downloads) -> (provider, load time, AWST trading-hours bars), shared by
+# every analyzer's lazy loads. Providers serving the same bars (e.g. two CachedBarProviders on one cache_dir)
+# share entries; any other provider is keyed by id, and the entry holds it so the id cannot be reused.
+SHARED_BARS_MAX_ENTRIES = 256
+# Older entries are refetched (through the provider's own cache), so a long-lived process sees new bars
+SHARED_BARS_MAX_AGE_SECONDS = 300
+_shared_bars = OrderedDict()
+_shared_bars_lock = threading.Lock()
+
+def clear_shared_bars(bar_provider=None):
+    """Drop every shared entry, or only the ones loaded through bar_provider"""
+    with _shared_bars_lock:
+        if bar_provider is None:
+            _shared_bars.clear()
+            return
+        identity = provider_identity(bar_provider)
+        for key in [key for key in _shared_bars if key[0] == identity]:
+            del _shared_bars[key]
+
+def timeframe_downloads(timeframe):
+    """The (interval, period) provider requests a timeframe's bars come from"""
+    downloads = [DOWNLOADED_TIMEFRAMES[timeframe]] if timeframe in DOWNLOADED_TIMEFRAMES else []
+    if timeframe in RESAMPLED_TIMEFRAMES:
+        downloads.extend(timeframe_downloads(RESAMPLED_TIMEFRAMES[timeframe][0]))
+    return tuple(downloads)
+
+class LazyStockData(Mapping):
+    """Timeframe -> bars mapping that only fetches a timeframe the first time it is read.
+
+    Loaded timeframes go into a small LRU cache shared across analyzer instances,
+    so repeated consumers of the same ticker never refetch, even through their
+    own provider instances. Entries are keyed by bar provider identity and
+    download period as well as ticker and timeframe, and expire after
+    SHARED_BARS_MAX_AGE_SECONDS.
+    """
+
+    def __init__(self, analyzer, ticker, timeframes):
+        self.analyzer = analyzer
+        self.ticker = ticker
+        self.timeframes = [tf for tf in INTRADAY_TIMEFRAMES if tf in timeframes]
+        self.raw_bars = {}
+
+    def load(self, timeframe):
+        provider = self.analyzer.bar_provider
+        key = (provider_identity(provider), self.ticker, timeframe, timeframe_downloads(timeframe))
+        with _shared_bars_lock:
+            entry = _shared_bars.get(key)
+            if entry is not None and time.monotonic() - entry[1] < SHARED_BARS_MAX_AGE_SECONDS:
+                _shared_bars.move_to_end(key)
+                return entry[2]
+        data = self.analyzer.load_timeframe(self.ticker, timeframe, self.raw_bars)
+        with _shared_bars_lock:
+            _shared_bars[key] = (provider, time.monotonic(), data)
+            _shared_bars.move_to_end(key)
+            while len(_shared_bars) > SHARED_BARS_MAX_ENTRIES:
+                _shared_bars.popitem(last=False)
+        return data
+
+    def __getitem__(self, timeframe):
+        if timeframe not in self.timeframes:
+            raise KeyError(timeframe)
+        data = self.load(timeframe)
+        if len(data) <= 20:
+            raise KeyError(timeframe)
+        return data
+
+    def __contains__(self, timeframe):
+        return timeframe in self.timeframes and len(self.load(timeframe)) > 20
+
+    def __iter__(self):
+        return (tf for tf in self.timeframes if tf in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
 class MiningTimeOfDayAnalyzer:
-    def __init__(self):
-        self.mining_stocks = {
-            # LITHIUM & BATTERY MATERIALS
-            'PLS.AX': 'Pilbara Minerals', 'MIN.AX': 'Mineral Resources', 'IGO.AX': 'IGO Limited',
-            'NVX.AX': 'Novonix', 'VUL.AX': 'Vulcan Energy Resources', 'SYA.AX': 'Sayona Mining',
-            'LTR.AX': 'Liontown Resources', 'CXO.AX': 'Core Lithium', 'INR.AX': 'Ioneer',
-            'EMH.AX': 'European Metals Holdings', 'PSC.AX': 'Prospect Resources', 'GLN.AX': 'Galan Lithium',
-            'LKE.AX': 'Lake Resources', 'ASN.AX': 'Anson Resources', 'EUR.AX': 'European Lithium',
-            # GOLD MINERS
-            'NCM.AX': 'Newcrest Mining', 'NST.AX': 'Northern Star', 'EVN.AX': 'Evolution Mining',
-            'WGX.AX': 'Westgold Resources', 'GOR.AX': 'Gold Road Resources', 'RSG.AX': 'Resolute Mining',
-            'PRU.AX': 'Perseus Mining', 'RRL.AX': 'Regis Resources', 'SBM.AX': 'St Barbara',
-            'RMS.AX': 'Ramelius Resources', 'DEG.AX': 'De Grey Mining', 'WAF.AX': 'West African Resources',
-            'PNR.AX': 'PanTerra Gold', 'AQG.AX': 'Alacer Gold', 'KGN.AX': 'Kogan Gold', 'CGF.AX': 'Challenger Gold',
-            # IRON ORE & STEEL
-            'BHP.AX': 'BHP Billiton', 'RIO.AX': 'Rio Tinto', 'FMG.AX': 'Fortescue Metals',
-            'MGX.AX': 'Mount Gibson Iron', 'GRR.AX': 'Grange Resources', 'FEX.AX': 'Fenix Resources',
-            'CIA.AX': 'Champion Iron', 'GBG.AX': 'Gindalbie Metals',
-            # COPPER & BASE METALS
-            'S32.AX': 'South32', 'OZL.AX': 'OZ Minerals', 'SFR.AX': 'Sandfire Resources',
-            'C6C.AX': 'Copper Mountain', 'HCU.AX': 'Havilah Resources', 'AIS.AX': 'Aeris Resources',
-            'MOD.AX': 'MOD Resources', 'HOT.AX': 'Hot Chili',
-            # COAL MINERS
-            'WHC.AX': 'Whitehaven Coal', 'NHC.AX': 'New Hope Corporation', 'YAL.AX': 'Yancoal Australia',
-            'CNU.AX': 'Cerro Negro', 'SMR.AX': 'Stanmore Coal', 'CKA.AX': 'Cokal Limited',
-            # NICKEL MINERS
-            'WSA.AX': 'Western Areas', 'MCR.AX': 'Mincor Resources', 'PAN.AX': 'Panoramic Resources',
-            'NIC.AX': 'Nickel Mines', 'MRE.AX': 'Minara Resources', 'JPR.AX': 'Jupiter Mines',
-            # RARE EARTHS & URANIUM
-            'LYC.AX': 'Lynas Rare Earths', 'AR3.AX': 'American Rare Earths', 'HAS.AX': 'Hastings Technology',
-            'IXR.AX': 'Ionic Rare Earths', 'VML.AX': 'Vital Metals', 'REE.AX': 'Rare Element Resources',
-            'PDN.AX': 'Paladin Energy', 'PEN.AX': 'Peninsula Energy', 'BOE.AX': 'Boss Energy',
-            'BMN.AX': 'Bannerman Energy', 'DYL.AX': 'Deep Yellow', 'LOT.AX': 'Lotus Resources',
-            # ZINC, LEAD & OTHER METALS
-            'ZFX.AX': 'Zinifex Limited', 'CBH.AX': 'CBH Resources', 'KZL.AX': 'Kagara Limited',
-            'TNG.AX': 'TNG Limited', 'TMZ.AX': 'Thomson Resources', 'AAC.AX': 'Australian Agricultural',
-            # INDUSTRIAL MINERALS & DIVERSIFIED
-            'AWC.AX': 'Alumina Limited', 'IPL.AX': 'Incitec Pivot', 'NMT.AX': 'Neometals',
-            'SYR.AX': 'Syrah Resources', 'MYX.AX': 'Mayne Pharma', 'SLX.AX': 'Silex Systems',
-            # SMALLER MINERS & EXPLORERS
-            'AZJ.AX': 'Austar Gold', 'BDR.AX': 'Beadell Resources', 'EMR.AX': 'Emerald Resources',
-            'GDI.AX': 'GDI Property', 'KIN.AX': 'Kin Mining', 'LEG.AX': 'Legend Mining',
-            'MEI.AX': 'Meteoric Resources', 'NTM.AX': 'Northern Minerals', 'RED.AX': 'Red 5 Limited',
-            'WRM.AX': 'White Rock Minerals', 'ABX.AX': 'ABx Group', 'AEF.AX': 'Australian Ethical',
-            'ARL.AX': 'Ardea Resources', 'BSX.AX': 'Blackstone Minerals', 'CLA.AX': 'Celsius Resources',
-            'CNB.AX': 'Carnaby Resources', 'EME.AX': 'Energy Metals', 'GSN.AX': 'Great Southern Mining',
-            'KAI.AX': 'Kairos Minerals', 'LAM.AX': 'Lachlan Star', 'LML.AX': 'Lincoln Minerals',
-            'MAN.AX': 'Mandrake Resources', 'NVA.AX': 'Nova Minerals', 'CXZ.AX': 'Corazon Mining'
-        }
+    def __init__(self, bar_provider=None, significance_resamples=0, universe=DEFAULT_UNIVERSE,
+                 slot_minutes=SLOT_MINUTES, track_memory=False):
+        self.bar_provider = bar_provider if bar_provider is not None else CachedBarProvider()
+        # >0 adds permutation p-values and bootstrap CIs per slot and gates signals on them
+        self.significance_resamples = significance_resamples
+        # Width of the time-of-day slots every report row describes
+        self.slot_minutes = slot_minutes
+        # Sub-sector -> {ticker: name}; sector summaries are also broken down by these groups
+        self.universe = universe
+        self.mining_sectors = load_universe(universe)
+        self.mining_stocks = flatten_sectors(self.mining_sectors)
         self.valid_stocks = {}
-        self.all_results = {}
+        self.all_results = SlotResults()
+        self.failures = {}
+        self.pipeline_stats = {}
+        self.min_price = 0.10
+        self.results = None
+        self.results_key = None
+        self.report = None
+        self.checkpoint = None
+        # Directory of the persisted SlotStatsStore the run reports from, if any
+        self.stats_dir = None
+        # Peak memory per stage in the run report; slows the run, and only meaningful for serial stages
+        self.recorder = RunRecorder('analyzer', track_memory=track_memory)
 
-    def filter_mining_stocks(self):
-        print(f"Filtering {len(self.mining_stocks)} mining stocks (price > $0.10)...")
-        valid_count = 0
-        for ticker, name in self.mining_stocks.items():
-            try:
-                recent_data = yf.download(ticker, period="5d", interval="1d", progress=False)
-                if not recent_data.empty:
-                    current_price = float(recent_data['Close'].iloc[-1])
-                    avg_volume = float(recent_data['Volume'].mean()) if 'Volume' in recent_data.columns else 0
-                    if current_price > 0.10:
-                        self.valid_stocks[ticker] = {
-                            'name': name,
-                            'current_price': current_price,
-                            'avg_volume': avg_volume
-                        }
-                        valid_count += 1
-                        print(f"  ✓ {ticker}: ${current_price:.3f}")
-                    else:
-                        print(f"  ✗ {ticker}: ${current_price:.3f} (below $0.10)")
-                else:
-                    print(f"  ? {ticker}: No data")
-            except Exception as e:
-                continue
-        print(f"\nFound {valid_count} valid stocks")
+    def filter_mining_stocks(self, min_price=0.10, min_avg_volume=0, min_avg_turnover=0):
+        self.min_price = min_price
+        print(f"Filtering {len(self.mining_stocks)} mining stocks (price > ${min_price:.2f})...")
+        with self.recorder.stage('screen') as record:
+            screen = screen_universe(self.bar_provider, self.mining_stocks, min_price=min_price,
+                                     min_avg_volume=min_avg_volume, min_avg_turnover=min_avg_turnover)
+            record.add(rows=len(screen))
+        passed = screen[screen['Passed']]
+        self.valid_stocks.update(passed[['name', 'current_price', 'avg_volume']].to_dict('index'))
+        for ticker, row in screen.iterrows():
+            if pd.isna(row['current_price']):
+                print(f"  ? {ticker}: No data")
+            elif row['Passed']:
+                print(f"  ✓ {ticker}: ${row['current_price']:.3f}")
+            elif row['current_price'] <= min_price:
+                print(f"  ✗ {ticker}: ${row['current_price']:.3f} (below ${min_price:.2f})")
+            else:
+                print(f"  ✗ {ticker}: ${row['current_price']:.3f} (below volume/turnover filter)")
+        print(f"\nFound {len(passed)} valid stocks")
         return len(self.valid_stocks) > 0
 
-    def fetch_stock_intraday_data(self, ticker):
+    def fetch_stock_intraday_data(self, ticker, timeframes=None, lazy=False):
+        if lazy:
+            return LazyStockData(self, ticker, timeframes or INTRADAY_TIMEFRAMES)
         try:
             print(f"  Fetching {ticker}...", end="")
-            datasets = {}
-            datasets['1min'] = yf.download(ticker, period="7d", interval="1m", progress=False)
-            datasets['5min'] = yf.download(ticker, period="60d", interval="5m", progress=False)
-            datasets['15min'] = yf.download(ticker, period="60d", interval="15m", progress=False)
-            datasets['30min'] = yf.download(ticker, period="60d", interval="30m", progress=False)
-            datasets['1hour'] = yf.download(ticker, period="730d", interval="1h", progress=False)
-            stock_data = {}
-            total_points = 0
-            for tf, data in datasets.items():
-                if not data.empty:
-                    if isinstance(data.columns, pd.MultiIndex):
-                        data.columns = data.columns.droplevel(1)
-                    if data.index.tz is not None:
-                        data.index = data.index.tz_convert(awst)
-                    else:
-                        data.index = data.index.tz_localize('UTC').tz_convert(awst)
-                    data.index = data.index.tz_localize(None)
-                    trading_data = data[
-                        (data.index.hour >= 10) &
-                        (data.index.hour <= 15) &
-                        (data.index.weekday < 5)
-                    ]
-                    if len(trading_data) > 20:
-                        stock_data[tf] = trading_data
-                        total_points += len(trading_data)
+            stock_data = self.load_intraday_data(ticker, timeframes)
             if stock_data:
+                total_points = sum(len(data) for data in stock_data.values())
                 print(f" ✓ ({total_points:,} total AWST trading hours data points)")
                 return stock_data
             else:
@@ -126,96 +188,288 @@ class MiningTimeOfDayAnalyzer:
             print(f" ✗ (error: {str(e)[:30]})")
             return None
 
-    def analyze_stock_tod_patterns(self, ticker, stock_data):
+    def load_intraday_data(self, ticker, timeframes=None):
+        """Fetch the requested intraday timeframes (default all) for a ticker; raises on provider errors"""
+        stock_data = {}
+        raw_bars = {}
+        for tf in INTRADAY_TIMEFRAMES:
+            if timeframes is not None and tf not in timeframes:
+                continue
+            trading_data = self.load_timeframe(ticker, tf, raw_bars)
+            if len(trading_data) > 20:
+                stock_data[tf] = trading_data
+        return stock_data
+
+    def provider_requests(self, timeframes=None):
+        """How many bar-provider requests load_intraday_data makes per ticker"""
+        timeframes = INTRADAY_TIMEFRAMES if timeframes is None else timeframes
+        return len({download for tf in timeframes for download in timeframe_downloads(tf)})
+
+    def load_timeframe(self, ticker, timeframe, raw_bars=None):
+        """AWST trading-hours bars for one timeframe; raw_bars memoizes provider downloads between calls"""
+        return self.to_awst_trading_hours(self.load_raw_bars(ticker, timeframe, {} if raw_bars is None else raw_bars))
+
+    def load_raw_bars(self, ticker, timeframe, raw_bars):
+        if timeframe in raw_bars:
+            return raw_bars[timeframe]
+        bars = pd.DataFrame()
+        if timeframe in DOWNLOADED_TIMEFRAMES:
+            interval, period = DOWNLOADED_TIMEFRAMES[timeframe]
+            bars = self.bar_provider.get_bars(ticker, interval, period)
+        if timeframe in RESAMPLED_TIMEFRAMES:
+            source_tf, rule = RESAMPLED_TIMEFRAMES[timeframe]
+            bars = splice_history(bars, resample_bars(self.load_raw_bars(ticker, source_tf, raw_bars), rule))
+        raw_bars[timeframe] = bars
+        return bars
+
+    def to_awst_trading_hours(self, data):
+        if data.empty:
+            return data
+        data = data.copy()
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.droplevel(1)
+        if data.index.tz is not None:
+            data.index = data.index.tz_convert(awst)
+        else:
+            data.index = data.index.tz_localize('UTC').tz_convert(awst)
+        data.index = data.index.tz_localize(None)
+        # Trading hours on trading days per the ASX calendar (holidays, early closes, DST all handled)
+        return data[session_calendar().in_session(data.index)]
+
+    def analyze_stock_tod_patterns(self, ticker, stock_data, errors=None):
         stock_results = {}
         for timeframe, data in stock_data.items():
             try:
-                data_work = data.copy()
-                data_work['returns'] = data_work['Close'].pct_change() * 100
-                data_work['hour'] = data_work.index.hour
-                data_work['minute'] = data_work.index.minute
-                data_work = data_work.dropna()
-                data_work = data_work[abs(data_work['returns']) < 25]
+                data_work = prepare_returns(data)
                 if len(data_work) < 20:
                     continue
-                time_periods = {
-                    '10:00-10:15': data_work[(data_work['hour'] == 10) & (data_work['minute'] <= 15)]['returns'],
-                    '10:15-10:30': data_work[(data_work['hour'] == 10) & (data_work['minute'] > 15) & (data_work['minute'] <= 30)]['returns'],
-                    '10:30-10:45': data_work[(data_work['hour'] == 10) & (data_work['minute'] > 30) & (data_work['minute'] <= 45)]['returns'],
-                    '10:45-11:00': data_work[(data_work['hour'] == 10) & (data_work['minute'] > 45)]['returns'],
-                    '11:00-11:15': data_work[(data_work['hour'] == 11) & (data_work['minute'] <= 15)]['returns'],
-                    '11:15-11:30': data_work[(data_work['hour'] == 11) & (data_work['minute'] > 15) & (data_work['minute'] <= 30)]['returns'],
-                    '11:30-11:45': data_work[(data_work['hour'] == 11) & (data_work['minute'] > 30) & (data_work['minute'] <= 45)]['returns'],
-                    '11:45-12:00': data_work[(data_work['hour'] == 11) & (data_work['minute'] > 45)]['returns'],
-                    '12:00-12:15': data_work[(data_work['hour'] == 12) & (data_work['minute'] <= 15)]['returns'],
-                    '12:15-12:30': data_work[(data_work['hour'] == 12) & (data_work['minute'] > 15) & (data_work['minute'] <= 30)]['returns'],
-                    '12:30-12:45': data_work[(data_work['hour'] == 12) & (data_work['minute'] > 30) & (data_work['minute'] <= 45)]['returns'],
-                    '12:45-13:00': data_work[(data_work['hour'] == 12) & (data_work['minute'] > 45)]['returns'],
-                    '13:00-13:15': data_work[(data_work['hour'] == 13) & (data_work['minute'] <= 15)]['returns'],
-                    '13:15-13:30': data_work[(data_work['hour'] == 13) & (data_work['minute'] > 15) & (data_work['minute'] <= 30)]['returns'],
-                    '13:30-13:45': data_work[(data_work['hour'] == 13) & (data_work['minute'] > 30) & (data_work['minute'] <= 45)]['returns'],
-                    '13:45-14:00': data_work[(data_work['hour'] == 13) & (data_work['minute'] > 45)]['returns'],
-                    '14:00-14:15': data_work[(data_work['hour'] == 14) & (data_work['minute'] <= 15)]['returns'],
-                    '14:15-14:30': data_work[(data_work['hour'] == 14) & (data_work['minute'] > 15) & (data_work['minute'] <= 30)]['returns'],
-                    '14:30-14:45': data_work[(data_work['hour'] == 14) & (data_work['minute'] > 30) & (data_work['minute'] <= 45)]['returns'],
-                    '14:45-15:00': data_work[(data_work['hour'] == 14) & (data_work['minute'] > 45)]['returns'],
-                    '15:00-15:15': data_work[(data_work['hour'] == 15) & (data_work['minute'] <= 15)]['returns']
-                }
-                time_stats = []
-                for period_name, period_returns in time_periods.items():
-                    if not period_returns.empty and len(period_returns) >= 3:
-                        avg_volume = 0
-                        volume_ratio = 1.0
-                        if 'Volume' in data_work.columns:
-                            period_mask = self.get_detailed_time_mask(data_work, period_name)
-                            if period_mask.any():
-                                period_volume = data_work[period_mask]['Volume']
-                                avg_volume = period_volume.mean() if not period_volume.empty else 0
-                                daily_avg_vol = data_work['Volume'].mean()
-                                volume_ratio = avg_volume / max(daily_avg_vol, 1)
-                        returns_clean = period_returns.dropna()
-                        time_stats.append({
-                            'Ticker': ticker,
-                            'Timeframe': timeframe,
-                            'Time_Period_AWST': period_name,
-                            'Avg_Return_%': round(returns_clean.mean(), 5),
-                            'Median_Return_%': round(returns_clean.median(), 5),
-                            'Std_Dev_%': round(returns_clean.std(), 5),
-                            'Min_Return_%': round(returns_clean.min(), 5),
-                            'Max_Return_%': round(returns_clean.max(), 5),
-                            'Observations': len(returns_clean),
-                            'Positive_Returns': len(returns_clean[returns_clean > 0]),
-                            'Negative_Returns': len(returns_clean[returns_clean < 0]),
-                            'Win_Rate_%': round(len(returns_clean[returns_clean > 0]) / len(returns_clean) * 100, 2),
-                            'Avg_Volume': round(avg_volume, 0),
-                            'Volume_Ratio_vs_Daily': round(volume_ratio, 3),
-                            'Volatility_Rank': 'HIGH' if returns_clean.std() > 2 else 'MEDIUM' if returns_clean.std() > 1 else 'LOW',
-                            'Pattern_Strength': 'STRONG' if abs(returns_clean.mean()) > 0.15 else 'MODERATE' if abs(returns_clean.mean()) > 0.08 else 'WEAK',
-                            'Trading_Signal': self.get_trading_signal(returns_clean.mean(), len(returns_clean))
-                        })
-                if time_stats:
-                    stock_results[timeframe] = pd.DataFrame(time_stats)
+                slot_stats = slot_statistics(data_work, self.slot_minutes)
+                if not slot_stats.empty and self.significance_resamples:
+                    slot_stats = slot_stats.join(slot_significance(
+                        data_work, self.slot_minutes, n_resamples=self.significance_resamples,
+                        seed=series_seed(ticker, timeframe)))
+                if not slot_stats.empty:
+                    stock_results[timeframe] = self.format_slot_statistics(ticker, timeframe, slot_stats)
             except Exception as e:
-                print(f"    Error analyzing {timeframe}: {e}")
+                if errors is not None:
+                    errors.append(f"{timeframe}: {e}")
+                else:
+                    print(f"    Error analyzing {timeframe}: {e}")
+                continue
+        return stock_results
+
+    def analyze_stock_resolutions(self, ticker, stock_data, resolutions=SLOT_RESOLUTIONS):
+        """{timeframe: formatted slot statistics} at several slot sizes at once, with a Slot_Minutes column.
+
+        Each timeframe's returns are prepared and accumulated once and every
+        resolution is rolled up from the finest one. Significance columns are
+        left out: resampling has to revisit the bars for every grid.
+        """
+        stock_results = {}
+        for timeframe, data in stock_data.items():
+            data_work = prepare_returns(data)
+            if len(data_work) < 20:
                 continue
+            slot_stats = multi_resolution_statistics(data_work, resolutions)
+            if not slot_stats.empty:
+                formatted = self.format_slot_statistics(ticker, timeframe, slot_stats)
+                formatted.insert(0, 'Slot_Minutes', slot_stats.index.get_level_values('slot_minutes'))
+                stock_results[timeframe] = formatted
         return stock_results
 
+    def resolution_sweep(self, resolutions=SLOT_RESOLUTIONS, tickers=None):
+        """Slot statistics for every valid stock at every slot size, as one long frame keyed by Slot_Minutes"""
+        tickers = list(self.valid_stocks.keys()) if tickers is None else list(tickers)
+        frames = []
+        for ticker in tickers:
+            with self.recorder.stage('fetch', ticker) as record:
+                try:
+                    stock_data = self.load_intraday_data(ticker)
+                except Exception as e:
+                    record['error'] = f"Data fetch failed: {e}"
+                    continue
+                record.add(rows=sum(len(data) for data in stock_data.values()))
+            with self.recorder.stage('sweep', ticker) as record:
+                record.add(rows=sum(len(data) for data in stock_data.values()))
+                frames.extend(self.analyze_stock_resolutions(ticker, stock_data, resolutions).values())
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True).sort_values('Slot_Minutes', kind='stable', ignore_index=True)
+
+    def print_resolution_sweep(self, sweep, timeframe='5min'):
+        """Best and worst sector-average slot at each slot size"""
+        print(f"\nRESOLUTION SWEEP ({timeframe} bars, average across stocks):")
+        print(f"{'Slot':>6} {'Slots':>6} {'Best Slot':<12} {'Avg%':>8} {'Worst Slot':<12} {'Avg%':>8}")
+        print("-" * 58)
+        rows = sweep[sweep['Timeframe'] == timeframe]
+        for slot_minutes, group in rows.groupby('Slot_Minutes'):
+            by_slot = group.groupby('Time_Period_ASX')['Avg_Return_%'].mean()
+            print(f"{slot_minutes:>4}m {len(by_slot):>6} {by_slot.idxmax():<12} {by_slot.max():>8.3f} "
+                  f"{by_slot.idxmin():<12} {by_slot.min():>8.3f}")
+
+    def run_resolution_sweep(self, resolutions=SLOT_RESOLUTIONS):
+        """Screen the universe, sweep every slot size and save the long frame as CSV"""
+        if not self.filter_mining_stocks():
+            print("No valid mining stocks found!")
+            return None
+        sweep = self.resolution_sweep(resolutions)
+        if sweep.empty:
+            print("No analysis results generated")
+            return None
+        self.print_resolution_sweep(sweep)
+        path = f"Mining_TOD_Resolution_Sweep_{datetime.now(awst).strftime('%Y%m%d_%H%M%S')}.csv"
+        sweep.to_csv(path, index=False)
+        print(f"Resolution sweep saved: {path}")
+        return path
+
+    def analyze_ticker(self, ticker):
+        """Fetch and analyze one ticker, returning (results, error) instead of printing"""
+        errors = []
+        with self.recorder.stage('fetch', ticker) as record:
+            try:
+                stock_data = self.load_intraday_data(ticker)
+            except Exception as e:
+                record['error'] = f"Data fetch failed: {e}"
+                return None, record['error']
+            record.add(rows=sum(len(data) for data in stock_data.values()),
+                       bytes=sum(frame_bytes(data) for data in stock_data.values()))
+            if not stock_data:
+                record['error'] = "Data fetch failed: insufficient data"
+                return None, record['error']
+        with self.recorder.stage('analyze', ticker) as record:
+            record.add(rows=sum(len(data) for data in stock_data.values()))
+            stock_results = self.analyze_stock_tod_patterns(ticker, stock_data, errors)
+            if not stock_results:
+                record['error'] = "Pattern analysis failed" + (f" ({'; '.join(errors)})" if errors else "")
+                return None, record['error']
+        return stock_results, None
+
+    def analyze_universe(self, workers=1, tickers=None):
+        """Analyze every valid stock (or just `tickers`), optionally across a process pool.
+
+        Results arrive in valid_stocks order whatever the worker count, and
+        per-ticker failures are collected in self.failures.
+        """
+        tickers = list(self.valid_stocks.keys()) if tickers is None else list(tickers)
+        if workers > 1:
+            initargs = (self.bar_provider, self.significance_resamples, self.slot_minutes,
+                        self.recorder.track_memory)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+                outcomes = []
+                for packed, error, records in executor.map(_analyze_in_worker, tickers):
+                    self.recorder.extend(records)
+                    outcomes.append((packed, error))
+        else:
+            outcomes = map(self.analyze_ticker, tickers)
+        successful_stocks = 0
+        for ticker, (stock_results, error) in zip(tickers, outcomes):
+            successful_stocks += self.store_ticker_results(ticker, stock_results, error)
+        return successful_stocks
+
+    def store_ticker_results(self, ticker, stock_results, error, checkpoint=True):
+        """Record one ticker's outcome, checkpoint it and stream its sheets to the open report; returns 1 on success"""
+        if checkpoint and self.checkpoint is not None:
+            if stock_results and not isinstance(stock_results, SlotResults):
+                stock_results = pack_ticker_results(ticker, stock_results)
+            self.checkpoint.record(ticker, stock_results or None, error)
+        if isinstance(stock_results, SlotResults):
+            # Already array-packed by a worker process
+            self.all_results.extend(stock_results)
+            total_periods = stock_results.row_count()
+            stock_results = stock_results[ticker]
+        elif stock_results:
+            self.all_results[ticker] = stock_results
+            total_periods = sum(len(df) for df in stock_results.values())
+        else:
+            self.failures[ticker] = error
+            print(f"    ✗ {ticker}: {error}")
+            return 0
+        if self.report is not None:
+            with self.recorder.stage('excel', ticker) as record:
+                self.report.write_ticker(ticker, stock_results)
+                record.add(rows=total_periods)
+        print(f"    ✓ {ticker}: {total_periods} time periods analyzed")
+        return 1
+
+    def analyze_incremental(self, ticker, stock_data, store):
+        """Fold only the bars the store has not seen yet, then report from its accumulators"""
+        for timeframe, data in stock_data.items():
+            store.update(ticker, timeframe, data)
+        stock_results = {}
+        for timeframe in store.timeframes(ticker):
+            slot_stats = store.slot_statistics(ticker, timeframe, slot_minutes=self.slot_minutes)
+            if not slot_stats.empty:
+                stock_results[timeframe] = self.format_slot_statistics(ticker, timeframe, slot_stats)
+        return stock_results
+
+    def analyze_universe_incremental(self, store, tickers=None):
+        """Analyze every valid stock (or just `tickers`) through the stats store, then save it"""
+        tickers = list(self.valid_stocks.keys()) if tickers is None else list(tickers)
+        successful_stocks = 0
+        for ticker in tickers:
+            with self.recorder.stage('fetch', ticker) as record:
+                try:
+                    stock_data = self.load_intraday_data(ticker)
+                    record.add(rows=sum(len(data) for data in stock_data.values()))
+                except Exception as e:
+                    record['error'] = f"Data fetch failed: {e}"
+                    stock_data = None
+            stock_results, error = None, record.get('error')
+            if stock_data is not None:
+                with self.recorder.stage('analyze', ticker) as record:
+                    record.add(rows=sum(len(data) for data in stock_data.values()))
+                    stock_results = self.analyze_incremental(ticker, stock_data, store)
+                    if not stock_results:
+                        record['error'] = error = "Pattern analysis failed"
+            successful_stocks += self.store_ticker_results(ticker, stock_results, error)
+        store.save()
+        print(f"Stats store saved: {store.root}")
+        return successful_stocks
+
+    def format_slot_statistics(self, ticker, timeframe, slot_stats):
+        std = slot_stats['std']
+        abs_mean = slot_stats['mean'].abs()
+        p_values = slot_stats['p_adjusted'] if 'p_adjusted' in slot_stats else [None] * len(slot_stats)
+        formatted = pd.DataFrame({
+            'Ticker': ticker,
+            'Timeframe': timeframe,
+            'Time_Period_ASX': slot_stats['period'].values,
+            'Avg_Return_%': slot_stats['mean'].round(5).values,
+            'Median_Return_%': slot_stats['median'].round(5).values,
+            'Std_Dev_%': std.round(5).values,
+            'Min_Return_%': slot_stats['min'].round(5).values,
+            'Max_Return_%': slot_stats['max'].round(5).values,
+            'Observations': slot_stats['count'].values,
+            'Positive_Returns': slot_stats['positive'].values,
+            'Negative_Returns': slot_stats['negative'].values,
+            'Win_Rate_%': (slot_stats['positive'] / slot_stats['count'] * 100).round(2).values,
+            'Avg_Volume': slot_stats['avg_volume'].round(0).values,
+            'Volume_Ratio_vs_Daily': slot_stats['volume_ratio'].round(3).values,
+            'Volatility_Rank': np.select([std > 2, std > 1], ['HIGH', 'MEDIUM'], 'LOW'),
+            'Pattern_Strength': np.select([abs_mean > 0.15, abs_mean > 0.08], ['STRONG', 'MODERATE'], 'WEAK'),
+            'Trading_Signal': [self.get_trading_signal(m, n, p)
+                               for m, n, p in zip(slot_stats['mean'], slot_stats['count'], p_values)]
+        })
+        if 'p_value' in slot_stats:
+            formatted['P_Value'] = slot_stats['p_value'].round(5).values
+            formatted['P_Adjusted'] = slot_stats['p_adjusted'].round(5).values
+            formatted['CI_Low_%'] = slot_stats['ci_low'].round(5).values
+            formatted['CI_High_%'] = slot_stats['ci_high'].round(5).values
+        return formatted
+
     def get_detailed_time_mask(self, data, period_name):
-        try:
-            start_time, end_time = period_name.split('-')
-            start_hour, start_min = map(int, start_time.split(':'))
-            end_hour, end_min = map(int, end_time.split(':'))
-            if start_hour == end_hour:
-                return (data['hour'] == start_hour) & (data['minute'] > start_min) & (data['minute'] <= end_min)
-            else:
-                return ((data['hour'] == start_hour) & (data['minute'] > start_min)) | \
-                       ((data['hour'] == end_hour) & (data['minute'] <= end_min))
-        except:
-            return pd.Series([False] * len(data))
+        codes = assign_slots(data.index, self.slot_minutes)
+        labels = slot_labels(self.slot_minutes)
+        if period_name not in labels:
+            return pd.Series(False, index=data.index)
+        return pd.Series(codes == labels.index(period_name), index=data.index)
 
-    def get_trading_signal(self, avg_return, observations):
+    def get_trading_signal(self, avg_return, observations, p_value=None):
         if observations < 5:
             return 'INSUFFICIENT_DATA'
+        elif p_value is not None and not p_value <= SIGNIFICANCE_ALPHA:
+            # Mean not distinguishable from zero after the multiple-comparison correction
+            return 'NEUTRAL'
         elif avg_return > 0.2:
             return 'STRONG_BUY'
         elif avg_return > 0.1:
@@ -231,201 +485,193 @@ class MiningTimeOfDayAnalyzer:
         else:
             return 'NEUTRAL'
 
-    def run_comprehensive_analysis(self):
+    def analyze_universe_pipelined(self, concurrency=8, rate=5.0, max_retries=4, tickers=None):
+        """Overlap fetching and analysis: downloads run concurrently under a rate
+        limit and each ticker is analyzed as soon as its bars arrive."""
+        tickers = list(self.valid_stocks.keys()) if tickers is None else list(tickers)
+        outcomes = asyncio.run(run_pipeline(self, tickers, concurrency, rate, max_retries))
+        successful_stocks = 0
+        for ticker, (stock_results, error, stats) in outcomes.items():
+            self.pipeline_stats[ticker] = stats
+            fetch_failed = error is not None and error.startswith('Data fetch failed')
+            self.recorder.add('fetch', ticker, seconds=stats['fetch_seconds'], rows=stats.get('rows', 0),
+                              bytes=stats.get('bytes', 0), retries=stats['retries'],
+                              error=error if fetch_failed else None)
+            if 'analyze_seconds' in stats:
+                self.recorder.add('analyze', ticker, seconds=stats['analyze_seconds'], rows=stats.get('rows', 0),
+                                  error=None if fetch_failed else error)
+            successful_stocks += self.store_ticker_results(ticker, stock_results, error)
+        return successful_stocks
+
+    def run_comprehensive_analysis(self, workers=1, pipelined=False, report_backend='xlsx', run_report=True,
+                                   checkpoint_dir=None, stats_dir=None):
+        """Screen, analyze and report on the universe.
+
+        With checkpoint_dir every ticker's results are checkpointed as it
+        completes; rerunning with the same configuration skips the screening
+        and every ticker already done. With stats_dir the statistics come from
+        the persisted stats store, which each run extends with only the bars
+        it has not seen (run daily to keep history beyond Yahoo's windows).
+        """
         print("="*80)
-        print("ASX MINING SECTOR TIME-OF-DAY COMPREHENSIVE ANALYSIS (AWST)")
+        print("ASX MINING SECTOR TIME-OF-DAY COMPREHENSIVE ANALYSIS (ASX SESSION TIME, SYDNEY)")
         print("="*80)
         print(f"Analysis Start Time: {datetime.now(awst).strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        if not self.filter_mining_stocks():
+        self.stats_dir = stats_dir
+        if checkpoint_dir is not None:
+            self.checkpoint = RunCheckpoint(checkpoint_dir, self.checkpoint_config())
+            print(f"Checkpointing to {self.checkpoint.directory}")
+        screened = self.checkpoint.load_screen() if self.checkpoint is not None else None
+        if screened is not None:
+            self.valid_stocks.update(screened)
+            print(f"Resuming: {len(screened)} valid stocks from the checkpointed screen")
+        elif self.filter_mining_stocks():
+            if self.checkpoint is not None:
+                self.checkpoint.save_screen(self.valid_stocks)
+        if not self.valid_stocks:
             print("No valid mining stocks found!")
             return
         print(f"\nAnalyzing time-of-day patterns for {len(self.valid_stocks)} mining stocks...")
-        successful_stocks = 0
-        for ticker in self.valid_stocks.keys():
-            stock_data = self.fetch_stock_intraday_data(ticker)
-            if stock_data:
-                stock_results = self.analyze_stock_tod_patterns(ticker, stock_data)
-                if stock_results:
-                    self.all_results[ticker] = stock_results
-                    successful_stocks += 1
-                    total_periods = sum(len(df) for df in stock_results.values())
-                    print(f"    ✓ {ticker}: {total_periods} time periods analyzed")
-                else:
-                    print(f"    ✗ {ticker}: Pattern analysis failed")
-            else:
-                print(f"    ✗ {ticker}: Data fetch failed")
+        self.open_report(report_backend)
+        successful_stocks = self.resume_from_checkpoint()
+        remaining = [t for t in self.valid_stocks if t not in self.all_results]
+        if self.stats_dir is not None:
+            store = SlotStatsStore(self.stats_dir, self.slot_minutes)
+            successful_stocks += self.analyze_universe_incremental(store, tickers=remaining)
+        elif pipelined:
+            successful_stocks += self.analyze_universe_pipelined(tickers=remaining)
+        else:
+            successful_stocks += self.analyze_universe(workers, tickers=remaining)
         print(f"\nSuccessfully analyzed {successful_stocks} stocks")
         if self.all_results:
-            excel_file = self.create_comprehensive_excel()
+            excel_file = self.create_comprehensive_excel(report_backend)
             if excel_file:
                 self.print_comprehensive_summary()
         else:
+            self.report.discard()
+            self.report = None
             print("No analysis results generated")
+        if run_report:
+            self.write_run_report()
+
+    def checkpoint_config(self):
+        """Everything that changes a ticker's results; checkpoints from any other configuration are ignored"""
+        return {
+            # The download windows, not the run date, so a run resumes across midnight
+            'periods': DOWNLOADED_TIMEFRAMES,
+            'universe': sorted(self.mining_stocks),
+            'bar_provider': type(self.bar_provider).__name__,
+            'min_price': self.min_price,
+            'timeframes': INTRADAY_TIMEFRAMES,
+            'slot_minutes': self.slot_minutes,
+            'significance_resamples': self.significance_resamples,
+            'stats_dir': self.stats_dir,
+        }
 
-    def create_comprehensive_excel(self):
+    def resume_from_checkpoint(self):
+        """Load every ticker the checkpoint already has; returns how many"""
+        if self.checkpoint is None:
+            return 0
+        done = [t for t in self.checkpoint.completed() if t in self.valid_stocks and t not in self.all_results]
+        if done:
+            print(f"Resuming: {len(done)} stocks already analyzed")
+        for ticker in done:
+            self.store_ticker_results(ticker, self.checkpoint.load(ticker), None, checkpoint=False)
+        return len(done)
+
+    def write_run_report(self):
+        """Dump this run's per-stage/per-ticker metrics as JSON and Prometheus text"""
+        self.recorder.print_summary()
         timestamp = datetime.now(awst).strftime('%Y%m%d_%H%M%S')
-        filename = f"Mining_Sector_TimeOfDay_Comprehensive_{timestamp}.xlsx"
+        paths = self.recorder.write_report(f"Mining_TOD_run_{timestamp}")
+        print(f"Run report saved: {', '.join(paths)}")
+        return paths
+
+    def get_results_frame(self):
+        if not isinstance(self.all_results, SlotResults):
+            return build_results_frame(self.all_results)
+        key = (id(self.all_results), self.all_results.version)
+        if self.results_key != key:
+            with self.recorder.stage('aggregate') as record:
+                self.results = self.all_results.to_frame()
+                record.add(rows=len(self.results))
+            self.results_key = key
+        return self.results
+
+    def create_live_monitor(self, timeframe='5min'):
+        """Streaming monitor that scores live bars against this run's slot statistics"""
+        return LiveSlotMonitor(self.get_results_frame(), timeframe, self.slot_minutes)
+
+    def open_report(self, backend='xlsx'):
+        """Start a streaming report; ticker sheets are written as each ticker's analysis completes"""
+        timestamp = datetime.now(awst).strftime('%Y%m%d_%H%M%S')
+        self.report = open_report_writer(f"Mining_Sector_TimeOfDay_Comprehensive_{timestamp}", backend)
+        return self.report
+
+    def create_comprehensive_excel(self, backend='xlsx'):
         try:
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                exec_summary = []
-                for ticker, stock_results in self.all_results.items():
-                    stock_info = self.valid_stocks[ticker]
-                    all_periods = []
-                    for timeframe, df in stock_results.items():
-                        for _, row in df.iterrows():
-                            all_periods.append({
-                                'period': row['Time_Period_AWST'],
-                                'return': row['Avg_Return_%'],
-                                'observations': row['Observations'],
-                                'volume': row['Avg_Volume'],
-                                'timeframe': timeframe
-                            })
-                    if all_periods:
-                        best_period = max(all_periods, key=lambda x: x['return'])
-                        worst_period = min(all_periods, key=lambda x: x['return'])
-                        morning_periods = [p for p in all_periods if p['period'].startswith(('10:', '11:'))]
-                        afternoon_periods = [p for p in all_periods if p['period'].startswith(('13:', '14:'))]
-                        avg_morning = np.mean([p['return'] for p in morning_periods]) if morning_periods else 0
-                        avg_afternoon = np.mean([p['return'] for p in afternoon_periods]) if afternoon_periods else 0
-                        morning_dip_strength = 'STRONG' if avg_morning < -0.15 else 'MODERATE' if avg_morning < -0.08 else 'WEAK' if avg_morning < 0 else 'NONE'
-                        afternoon_rally_strength = 'STRONG' if avg_afternoon > 0.15 else 'MODERATE' if avg_afternoon > 0.08 else 'WEAK' if avg_afternoon > 0 else 'NONE'
-                        total_swing = avg_afternoon - avg_morning
-                        exec_summary.append({
-                            'Ticker': ticker,
-                            'Company': stock_info['name'],
-                            'Current_Price_$': stock_info['current_price'],
-                            'Avg_Daily_Volume': stock_info['avg_volume'],
-                            'Total_Time_Periods_Analyzed': len(all_periods),
-                            'Total_Observations': sum(p['observations'] for p in all_periods),
-                            'Best_Time_Period_AWST': best_period['period'],
-                            'Best_Period_Return_%': round(best_period['return'], 4),
-                            'Worst_Time_Period_AWST': worst_period['period'],
-                            'Worst_Period_Return_%': round(worst_period['return'], 4),
-                            'Intraday_Range_%': round(best_period['return'] - worst_period['return'], 4),
-                            'Average_Morning_Return_%': round(avg_morning, 4),
-                            'Average_Afternoon_Return_%': round(avg_afternoon, 4),
-                            'Morning_Afternoon_Swing_%': round(total_swing, 4),
-                            'Morning_Dip_Strength': morning_dip_strength,
-                            'Afternoon_Rally_Strength': afternoon_rally_strength,
-                            'Pattern_Consistency': len(set(p['period'] for p in all_periods if abs(p['return']) > 0.1)),
-                            'Trading_Strategy_Viability': 'HIGH' if total_swing > 0.3 else 'MEDIUM' if total_swing > 0.15 else 'LOW',
-                            'Recommended_Entry_Time': worst_period['period'],
-                            'Recommended_Exit_Time': best_period['period'],
-                            'Expected_Swing_%': round(total_swing, 4),
-                            'Risk_Level': 'HIGH' if abs(worst_period['return']) > 0.5 else 'MEDIUM' if abs(worst_period['return']) > 0.2 else 'LOW',
-                            'Position_Size_Recommendation': '10%' if total_swing > 0.5 else '5%' if total_swing > 0.25 else '2%',
-                            'Data_Quality_Score': 'EXCELLENT' if sum(p['observations'] for p in all_periods) > 1000 else 'GOOD' if sum(p['observations'] for p in all_periods) > 500 else 'FAIR'
-                        })
-                if exec_summary:
-                    exec_df = pd.DataFrame(exec_summary)
-                    exec_df = exec_df.sort_values('Morning_Afternoon_Swing_%', ascending=False)
-                    exec_df.to_excel(writer, sheet_name='Executive_Summary', index=False)
-                for ticker, stock_results in self.all_results.items():
-                    for timeframe, df in stock_results.items():
-                        sheet_name = f'{ticker.replace(".AX", "")}_{timeframe}'[:31]
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                sector_summary = []
-                all_time_data = {}
+            if self.report is None:
+                self.open_report(backend)
                 for ticker, stock_results in self.all_results.items():
-                    for timeframe, df in stock_results.items():
-                        for _, row in df.iterrows():
-                            period = row['Time_Period_AWST']
-                            if period not in all_time_data:
-                                all_time_data[period] = []
-                            all_time_data[period].append({
-                                'ticker': ticker,
-                                'return': row['Avg_Return_%'],
-                                'observations': row['Observations'],
-                                'volume': row['Avg_Volume'],
-                                'timeframe': timeframe
-                            })
-                for period, period_data in all_time_data.items():
-                    if len(period_data) >= 3:
-                        returns = [p['return'] for p in period_data]
-                        total_obs = sum(p['observations'] for p in period_data)
-                        weighted_return = sum(r * o for r, o in zip(returns, [p['observations'] for p in period_data])) / total_obs
-                        sector_summary.append({
-                            'Time_Period_AWST': period,
-                            'Sector_Weighted_Return_%': round(weighted_return, 5),
-                            'Stocks_Confirming_Pattern': len(period_data),
-                            'Total_Observations': total_obs,
-                            'Return_Standard_Deviation': round(np.std(returns), 4),
-                            'Strongest_Stock': max(period_data, key=lambda x: x['return'])['ticker'],
-                            'Weakest_Stock': min(period_data, key=lambda x: x['return'])['ticker'],
-                            'Sector_Trading_Signal': self.get_trading_signal(weighted_return, len(period_data)),
-                            'Pattern_Reliability': 'HIGH' if len(period_data) >= 5 and np.std(returns) < 0.3 else 'MEDIUM' if len(period_data) >= 3 else 'LOW'
-                        })
-                if sector_summary:
-                    sector_df = pd.DataFrame(sector_summary)
-                    sector_df = sector_df.sort_values('Sector_Weighted_Return_%', ascending=False)
-                    sector_df.to_excel(writer, sheet_name='Sector_TimeOfDay_Summary', index=False)
-                best_opportunities = []
-                for ticker, stock_results in self.all_results.items():
-                    stock_opportunities = []
-                    for timeframe, df in stock_results.items():
-                        for _, row in df.iterrows():
-                            if abs(row['Avg_Return_%']) > 0.08:
-                                stock_opportunities.append({
-                                    'ticker': ticker,
-                                    'timeframe': timeframe,
-                                    'period': row['Time_Period_AWST'],
-                                    'return': row['Avg_Return_%'],
-                                    'observations': row['Observations'],
-                                    'signal': row['Trading_Signal']
-                                })
-                    if stock_opportunities:
-                        best_opp = max(stock_opportunities, key=lambda x: abs(x['return']))
-                        worst_opp = min(stock_opportunities, key=lambda x: x['return'])
-                        swing = best_opp['return'] - worst_opp['return']
-                        best_opportunities.append({
-                            'Ticker': ticker,
-                            'Company': self.valid_stocks[ticker]['name'],
-                            'Current_Price_$': self.valid_stocks[ticker]['current_price'],
-                            'Best_Entry_Time_AWST': worst_opp['period'],
-                            'Entry_Expected_Return_%': round(worst_opp['return'], 4),
-                            'Best_Exit_Time_AWST': best_opp['period'],
-                            'Exit_Expected_Return_%': round(best_opp['return'], 4),
-                            'Total_Expected_Swing_%': round(swing, 4),
-                            'Entry_Observations': worst_opp['observations'],
-                            'Exit_Observations': best_opp['observations'],
-                            'Strategy_Confidence': 'HIGH' if min(worst_opp['observations'], best_opp['observations']) > 20 else 'MEDIUM',
-                            'Risk_Reward_Ratio': round(abs(best_opp['return']) / max(abs(worst_opp['return']), 0.01), 2)
-                        })
-                if best_opportunities:
-                    opportunities_df = pd.DataFrame(best_opportunities)
-                    opportunities_df = opportunities_df.sort_values('Total_Expected_Swing_%', ascending=False)
-                    opportunities_df.to_excel(writer, sheet_name='Best_Opportunities', index=False)
+                    with self.recorder.stage('excel', ticker) as record:
+                        self.report.write_ticker(ticker, stock_results)
+                        record.add(rows=sum(len(df) for df in stock_results.values()))
+            report, self.report = self.report, None
+            results = self.get_results_frame()
+            # Summary sheets and closing the file; ticker sheets are timed per ticker
+            with self.recorder.stage('excel') as record:
+                if not results.empty:
+                    report.write_table('Executive_Summary', executive_summary(results, self.valid_stocks))
+                sector_df = sector_summary(results, self.get_trading_signal)
+                if not sector_df.empty:
+                    report.write_table('Sector_TimeOfDay_Summary', sector_df)
+                subsector_df = subsector_summary(results, self.sector_groups())
+                if not subsector_df.empty:
+                    report.write_table('Subsector_TimeOfDay_Summary', subsector_df)
+                correlation_df = slot_correlation_table(results)
+                if not correlation_df.empty:
+                    report.write_table('Sector_Slot_Correlation', correlation_df)
+                opportunities_df = best_opportunities(results, self.valid_stocks)
+                if not opportunities_df.empty:
+                    report.write_table('Best_Opportunities', opportunities_df)
                 metadata = pd.DataFrame([{
                     'Analysis_Date_Time_AWST': datetime.now(awst).strftime('%Y-%m-%d %H:%M:%S %Z'),
                     'Sector': 'ASX Mining & Resources Sector',
                     'Exchange': 'ASX (Australian Securities Exchange)',
-                    'Timezone': 'AWST (Australian Western Standard Time)',
-                    'Trading_Hours_Analyzed': '10:00-15:00 AWST (Weekdays Only)',
+                    'Timezone': 'Slot labels: ASX session clock, Sydney time (10:00 = open); run times: AWST',
+                    'Trading_Hours_Analyzed': 'ASX session 10:00-16:00 Sydney time, trading days only',
                     'Total_Stocks_Screened': len(self.mining_stocks),
                     'Valid_Stocks_Analyzed': len(self.all_results),
                     'Analysis_Type': 'High-Frequency Time-of-Day Impact Analysis',
-                    'Minimum_Price_Filter': '$0.10',
-                    'Time_Period_Granularity': '15-minute intervals',
+                    'Minimum_Price_Filter': f'${self.min_price:.2f}',
+                    'Time_Period_Granularity': f'{self.slot_minutes}-minute intervals of the session (10:00 = open)',
                     'Maximum_Data_Range': '730 days (hourly), 60 days (intraday)',
-                    'Total_Time_Periods': sum(sum(len(tf_data) for tf_data in stock_data.values()) for stock_data in self.all_results.values()),
+                    'Total_Time_Periods': len(results),
                     'Total_Observations': self.calculate_total_observations(),
                     'Analysis_Quality': 'INSTITUTIONAL_GRADE',
                     'Currency': 'AUD',
-                    'Data_Source': 'Yahoo Finance'
+                    'Data_Source': 'Yahoo Finance',
+                    'Statistics_Source': (f'Persisted stats store ({self.stats_dir}), completed sessions only; '
+                                          'Median_Return_% not available (medians are not mergeable)'
+                                          if self.stats_dir is not None else 'Downloaded bars'),
                 }])
-                metadata.to_excel(writer, sheet_name='Analysis_Metadata', index=False)
+                report.write_table('Analysis_Metadata', metadata)
+                filename = report.close()
+                record.add(rows=len(results))
             print(f"Comprehensive Excel analysis saved: {filename}")
             return filename
         except Exception as e:
             print(f"Excel creation error: {e}")
             return None
 
+    def sector_groups(self):
+        """{sub-sector: tickers} for the analyzed stocks, dropping sectors with none"""
+        groups = {sector: [t for t in stocks if t in self.all_results]
+                  for sector, stocks in self.mining_sectors.items()}
+        return {sector: tickers for sector, tickers in groups.items() if tickers}
+
     def calculate_total_observations(self):
-        total = 0
-        for stock_results in self.all_results.values():
-            for df in stock_results.values():
-                total += df['Observations'].sum()
-        return total
+        return self.get_results_frame()['Observations'].sum()
 
     def print_comprehensive_summary(self):
         if not self.all_results:
@@ -436,79 +682,48 @@ class MiningTimeOfDayAnalyzer:
         print(f"Analysis Completion Time: {datetime.now(awst).strftime('%Y-%m-%d %H:%M:%S %Z')}")
         print(f"Total Stocks Analyzed: {len(self.all_results)}")
         print(f"Total Observations: {self.calculate_total_observations():,}")
-        print(f"\nSECTOR-WIDE TIME-OF-DAY PATTERNS (AWST):")
+        print(f"\nSECTOR-WIDE TIME-OF-DAY PATTERNS (ASX SESSION TIME):")
         print(f"{'Time Period':<15} {'Avg Return%':<12} {'Stocks':<7} {'Pattern':<12} {'Strength':<10}")
         print(f"{'-'*70}")
-        sector_periods = {}
-        for ticker, stock_results in self.all_results.items():
-            for timeframe, df in stock_results.items():
-                for _, row in df.iterrows():
-                    period = row['Time_Period_AWST']
-                    if period not in sector_periods:
-                        sector_periods[period] = []
-                    sector_periods[period].append({
-                        'return': row['Avg_Return_%'],
-                        'observations': row['Observations']
-                    })
-        sector_summary = []
-        for period, data in sector_periods.items():
-            if len(data) >= 3:
-                returns = [d['return'] for d in data]
-                weighted_return = np.mean(returns)
-                pattern_type = ('DIP' if weighted_return < -0.05 else
-                              'RALLY' if weighted_return > 0.05 else 'NEUTRAL')
-                strength = ('STRONG' if abs(weighted_return) > 0.15 else
-                           'MODERATE' if abs(weighted_return) > 0.08 else 'WEAK')
-                sector_summary.append({
-                    'period': period,
-                    'return': weighted_return,
-                    'stocks': len(data),
-                    'pattern': pattern_type,
-                    'strength': strength
-                })
-                print(f"{period:<15} {weighted_return:>10.3f}% {len(data):<7} {pattern_type:<12} {strength:<10}")
-        if sector_summary:
-            sector_df = pd.DataFrame(sector_summary).sort_values('return')
-            worst_time = sector_df.iloc[0]
-            best_time = sector_df.iloc[-1]
+        results = self.get_results_frame()
+        sector_periods = sector_period_returns(results)
+        sector_periods = sector_periods[sector_periods['stocks'] >= 3]
+        for period, row in sector_periods.iterrows():
+            weighted_return = row['return']
+            pattern_type = ('DIP' if weighted_return < -0.05 else
+                          'RALLY' if weighted_return > 0.05 else 'NEUTRAL')
+            strength = ('STRONG' if abs(weighted_return) > 0.15 else
+                       'MODERATE' if abs(weighted_return) > 0.08 else 'WEAK')
+            print(f"{period:<15} {weighted_return:>10.3f}% {int(row['stocks']):<7} {pattern_type:<12} {strength:<10}")
+        if not sector_periods.empty:
+            worst_period = sector_periods['return'].idxmin()
+            best_period = sector_periods['return'].idxmax()
+            worst_time = sector_periods.loc[worst_period]
+            best_time = sector_periods.loc[best_period]
             print(f"\nSECTOR-WIDE OPTIMAL TIMING:")
-            print(f"  WORST TIME (ENTRY): {worst_time['period']} ({worst_time['return']:+.3f}%)")
-            print(f"  BEST TIME (EXIT): {best_time['period']} ({best_time['return']:+.3f}%)")
+            print(f"  WORST TIME (ENTRY): {worst_period} ({worst_time['return']:+.3f}%)")
+            print(f"  BEST TIME (EXIT): {best_period} ({best_time['return']:+.3f}%)")
             print(f"  SECTOR SWING: {best_time['return'] - worst_time['return']:.3f}%")
-            print(f"  PATTERN RELIABILITY: {min(worst_time['stocks'], best_time['stocks'])} stocks confirm")
+            print(f"  PATTERN RELIABILITY: {int(min(worst_time['stocks'], best_time['stocks']))} stocks confirm")
+        subsectors = subsector_summary(results, self.sector_groups(), by_timeframe=False)
+        if not subsectors.empty:
+            print(f"\nSUB-SECTOR OPTIMAL TIMING (observation-weighted):")
+            print(f"{'Sector':<36} {'Entry':<12} {'Return%':>8} {'Exit':<12} {'Return%':>8}")
+            print(f"{'-'*80}")
+            for sector, rows in subsectors.groupby('Sector', sort=False):
+                entry = rows.loc[rows['Sector_Weighted_Return_%'].idxmin()]
+                exit_ = rows.loc[rows['Sector_Weighted_Return_%'].idxmax()]
+                print(f"{sector:<36} {entry['Time_Period_ASX']:<12} {entry['Sector_Weighted_Return_%']:>8.3f} "
+                      f"{exit_['Time_Period_ASX']:<12} {exit_['Sector_Weighted_Return_%']:>8.3f}")
         print(f"\nTOP 10 INDIVIDUAL STOCK OPPORTUNITIES:")
         print(f"{'Ticker':<8} {'Entry Time':<12} {'Exit Time':<12} {'Swing%':<8} {'Price':<8} {'Quality':<10}")
         print(f"{'-'*70}")
-        individual_opportunities = []
-        for ticker, stock_results in self.all_results.items():
-            all_returns = []
-            for timeframe, df in stock_results.items():
-                for _, row in df.iterrows():
-                    all_returns.append({
-                        'period': row['Time_Period_AWST'],
-                        'return': row['Avg_Return_%'],
-                        'observations': row['Observations']
-                    })
-            if all_returns:
-                best = max(all_returns, key=lambda x: x['return'])
-                worst = min(all_returns, key=lambda x: x['return'])
-                swing = best['return'] - worst['return']
-                quality = ('EXCELLENT' if min(best['observations'], worst['observations']) > 50 else
-                          'GOOD' if min(best['observations'], worst['observations']) > 20 else 'FAIR')
-                individual_opportunities.append({
-                    'ticker': ticker,
-                    'entry_time': worst['period'],
-                    'exit_time': best['period'],
-                    'swing': swing,
-                    'price': self.valid_stocks[ticker]['current_price'],
-                    'quality': quality
-                })
-        top_opportunities = sorted(individual_opportunities, key=lambda x: x['swing'], reverse=True)[:10]
-        for opp in top_opportunities:
-            print(f"{opp['ticker'].replace('.AX', ''):<8} {opp['entry_time']:<12} {opp['exit_time']:<12} "
-                  f"{opp['swing']:>6.2f}% ${opp['price']:>6.2f} {opp['quality']:<10}")
-        avg_sector_swing = np.mean([opp['swing'] for opp in individual_opportunities])
-        viable_strategies = len([opp for opp in individual_opportunities if opp['swing'] > 0.3])
+        individual_opportunities = stock_opportunities(results, self.valid_stocks)
+        for opp in individual_opportunities.head(10).itertuples():
+            print(f"{opp.ticker.replace('.AX', ''):<8} {opp.entry_time:<12} {opp.exit_time:<12} "
+                  f"{opp.swing:>6.2f}% ${opp.price:>6.2f} {opp.quality:<10}")
+        avg_sector_swing = individual_opportunities['swing'].mean()
+        viable_strategies = int((individual_opportunities['swing'] > 0.3).sum())
         print(f"\nSECTOR CONCLUSION:")
         print(f"  Average Stock Swing: {avg_sector_swing:.2f}%")
         print(f"  Viable Trading Strategies: {viable_strategies}/{len(individual_opportunities)} stocks")
@@ -521,9 +736,118 @@ class MiningTimeOfDayAnalyzer:
             print(f"  SECTOR STRATEGY: NOT VIABLE - Insufficient consistent patterns")
         print(f"{'='*100}")
 
-    def run_complete_analysis(self):
-        self.run_comprehensive_analysis()
+    def run_complete_analysis(self, workers=1):
+        self.run_comprehensive_analysis(workers)
+
+    def run_shard(self, shard, n_shards, shard_dir='shards', workers=1):
+        """Screen and analyze one crc32 shard of the universe and save its results for merge_shards.
+
+        Shards are independent, so they can run in separate processes or on
+        separate machines sharing shard_dir; each only ever holds its own tickers.
+        The shard file records a hash of the whole universe's run configuration
+        so merge_shards can refuse shards from a different run.
+        """
+        run_key = config_key(self.checkpoint_config())
+        self.mining_sectors = shard_sectors(self.mining_sectors, shard, n_shards)
+        self.mining_stocks = flatten_sectors(self.mining_sectors)
+        print(f"Shard {shard}/{n_shards}: {len(self.mining_stocks)} tickers")
+        if self.filter_mining_stocks():
+            successful_stocks = self.analyze_universe(workers)
+            print(f"\nSuccessfully analyzed {successful_stocks} stocks")
+        os.makedirs(shard_dir, exist_ok=True)
+        path = shard_path(shard_dir, shard, n_shards)
+        output = {
+            'shard': shard,
+            'n_shards': n_shards,
+            'config_key': run_key,
+            'screened': len(self.mining_stocks),
+            'valid_stocks': self.valid_stocks,
+            'failures': self.failures,
+            'results': self.all_results,
+            'records': self.recorder.records,
+        }
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        print(f"Shard results saved: {path}")
+        return path
+
+    def merge_shards(self, shard_dir='shards', report_backend='xlsx'):
+        """Fold every shard's results into this analyzer and write the usual report and summary.
+
+        Shards are loaded one at a time into the compact results store; all
+        n shards of the same split must be present, and every shard must come
+        from this analyzer's run configuration (universe, filters, slot size, ...).
+        """
+        paths = sorted(glob.glob(os.path.join(shard_dir, 'shard_*_of_*.pkl')))
+        if not paths:
+            raise FileNotFoundError(f"No shard results in {shard_dir}")
+        run_key = config_key(self.checkpoint_config())
+        seen = {}
+        for path in paths:
+            with open(path, 'rb') as f:
+                output = pickle.load(f)
+            if output.get('config_key') != run_key:
+                raise ValueError(f"{path} was produced by a different run configuration")
+            seen.setdefault(output['n_shards'], set()).add(output['shard'])
+            if len(seen) > 1:
+                raise ValueError(f"{shard_dir} mixes shard counts {sorted(seen)}")
+            self.all_results.extend(output['results'])
+            self.valid_stocks.update(output['valid_stocks'])
+            self.failures.update(output['failures'])
+            self.recorder.extend(output['records'])
+        (n_shards, shards), = seen.items()
+        missing = sorted(set(range(n_shards)) - shards)
+        if missing:
+            raise ValueError(f"Shards {missing} of {n_shards} have no results in {shard_dir}")
+        print(f"Merged {n_shards} shards: {len(self.all_results)} stocks analyzed, {len(self.failures)} failed")
+        if self.all_results and self.create_comprehensive_excel(report_backend):
+            self.print_comprehensive_summary()
+
+def pack_ticker_results(ticker, stock_results):
+    """Array-backed results for one ticker; much cheaper to pickle between processes"""
+    packed = SlotResults()
+    packed[ticker] = stock_results
+    return packed
+
+_worker_analyzer = None
+
+def _init_worker(bar_provider, significance_resamples=0, slot_minutes=SLOT_MINUTES, track_memory=False):
+    global _worker_analyzer
+    _worker_analyzer = MiningTimeOfDayAnalyzer(bar_provider, significance_resamples, slot_minutes=slot_minutes,
+                                               track_memory=track_memory)
+
+def _analyze_in_worker(ticker):
+    # Metrics travel back with the results and are folded into the parent's recorder
+    _worker_analyzer.recorder.records = []
+    stock_results, error = _worker_analyzer.analyze_ticker(ticker)
+    packed = pack_ticker_results(ticker, stock_results) if stock_results else None
+    return packed, error, _worker_analyzer.recorder.records
 
 if __name__ == "__main__":
-    analyzer = MiningTimeOfDayAnalyzer()
-    analyzer.run_complete_analysis()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='ASX mining time-of-day analysis')
+    parser.add_argument('--universe', default=DEFAULT_UNIVERSE, help='universe file (ticker,name,sector,tags)')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--backend', default='xlsx', help='report backend: xlsx, parquet or arrow')
+    parser.add_argument('--shard', help="run only shard i of n, e.g. '3/16', and save it to --shard-dir")
+    parser.add_argument('--merge', action='store_true', help='merge the results in --shard-dir into one report')
+    parser.add_argument('--shard-dir', default='shards')
+    parser.add_argument('--checkpoint-dir', help='checkpoint every ticker here and resume from it on rerun')
+    parser.add_argument('--stats-dir', help='accumulate slot statistics in this store across runs (run daily)')
+    parser.add_argument('--track-memory', action='store_true',
+                        help='record peak memory per stage in the run report (slower; serial stages only)')
+    parser.add_argument('--slot-minutes', type=int, default=SLOT_MINUTES, choices=SLOT_RESOLUTIONS)
+    parser.add_argument('--sweep', type=int, nargs='*', choices=SLOT_RESOLUTIONS,
+                        help='slot statistics at each of these slot sizes (default all) in one pass, saved as CSV')
+    args = parser.parse_args()
+    analyzer = MiningTimeOfDayAnalyzer(universe=args.universe, slot_minutes=args.slot_minutes,
+                                       track_memory=args.track_memory)
+    if args.sweep is not None:
+        analyzer.run_resolution_sweep(tuple(args.sweep) or SLOT_RESOLUTIONS)
+    elif args.shard:
+        analyzer.run_shard(*parse_shard(args.shard), shard_dir=args.shard_dir, workers=args.workers)
+    elif args.merge:
+        analyzer.merge_shards(args.shard_dir, args.backend)
+    else:
+        analyzer.run_comprehensive_analysis(args.workers, report_backend=args.backend,
+                                            checkpoint_dir=args.checkpoint_dir, stats_dir=args.stats_dir)
@@ -1,81 +1,314 @@
+import argparse
 import pandas as pd
+import numpy as np
 import concurrent.futures
 import matplotlib.pyplot as plt
+from datetime import datetime
 from ASX_Mining_TOD import MiningTimeOfDayAnalyzer
+from asx_calendar import session_calendar
+from asx_instrumentation import RunRecorder, frame_bytes
+from asx_slots import (SESSION_START_MINUTE, SLOT_MINUTES, minute_label, prepare_returns, slot_codes, slot_labels,
+                       slot_of_minute, slot_statistics)
 from asx_top_mining_tickers import TOP_ASX_MINING
 
+recorder = RunRecorder('backtest')
+
 def get_stock_prices(ticker):
-    analyzer = MiningTimeOfDayAnalyzer()
-    analyzer.mining_stocks = {ticker: ''}
-    data = analyzer.fetch_stock_intraday_data(ticker)
-    
-    if data and '5min' in data:
-        df = data['5min'].copy()
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-        df = df.loc[:, ~df.columns.duplicated()]
-        if 'Close' in df.columns:
-            return df[['Close']].copy()
+    try:
+        with recorder.stage('fetch', ticker) as record:
+            analyzer = MiningTimeOfDayAnalyzer()
+            analyzer.mining_stocks = {ticker: ''}
+            data = analyzer.fetch_stock_intraday_data(ticker, timeframes=['5min'], lazy=True)
+            
+            if data and '5min' in data:
+                df = data['5min'].copy()
+                if isinstance(df.columns, pd.MultiIndex):
+                    df.columns = df.columns.get_level_values(0)
+                df = df.loc[:, ~df.columns.duplicated()]
+                if 'Close' in df.columns:
+                    record.add(rows=len(df), bytes=frame_bytes(df))
+                    return df[['Close']].copy()
+            record['error'] = "insufficient data"
+    except Exception as e:
+        # Already recorded against the fetch stage; the ticker is just skipped
+        print(f"{ticker}: fetch failed ({e})")
     return None
 
-def find_daily_patterns(prices):
+def find_daily_patterns(prices, slot_minutes=SLOT_MINUTES):
     if prices is None or prices.empty:
         return None, None
     
-    work_df = prices.copy()
-    work_df['returns'] = work_df['Close'].pct_change() * 100
-    work_df['hour'] = work_df.index.hour
-    work_df['minute'] = work_df.index.minute
+    # Returns restart each session, so the overnight gap stays out of the first slot
+    work_df = prepare_returns(prices)
+    slot_stats = slot_statistics(work_df, slot_minutes, min_observations=6)
+    if slot_stats.empty:
+        return None, None
+    best_time = slot_stats.loc[slot_stats['mean'].idxmax(), 'period']
+    worst_time = slot_stats.loc[slot_stats['mean'].idxmin(), 'period']
+    return best_time, worst_time
+
+def session_clock(index):
+    """Session date and session-clock minute (10:00 = the open) per bar; minute is -1 outside trading hours"""
+    calendar = session_calendar()
+    position = calendar.locate(index)
+    dates = np.asarray(calendar.sessions.index, dtype=object)[np.maximum(position.session, 0)]
+    return dates, np.where(position.minute >= 0, SESSION_START_MINUTE + position.minute, -1)
+
+def build_price_matrix(prices):
+    """Dense session x session-clock close matrix (columns 'HH:MM'); missing bars stay NaN"""
+    dates, minutes = session_clock(prices.index)
+    trading = minutes >= 0
+    labels = [minute_label(m) for m in minutes[trading]]
+    keys = [pd.Index(dates[trading], name='date'), pd.Index(labels, name='time')]
+    return prices['Close'][trading].groupby(keys).first().unstack('time')
+
+def slot_close(matrix, period):
+    """Each session's price at the end of a 'HH:MM-HH:MM' slot: the close of the last bar inside it.
+
+    No bar starts at the slot end itself (none at all at the 16:00 close), so
+    trades at a slot's end execute on its last bar; NaN when the slot has none.
+    """
+    start, end = period.split('-')
+    columns = [c for c in matrix.columns if start <= c < end]
+    if not columns:
+        return pd.Series(np.nan, index=matrix.index)
+    return matrix[columns].ffill(axis=1).iloc[:, -1]
+
+def slot_close_matrix(matrix, slot_minutes=SLOT_MINUTES):
+    """slot_close for every slot of the grid at once: session x slot-label prices at each slot end"""
+    labels = slot_labels(slot_minutes)
+    minutes = [int(c[:2]) * 60 + int(c[3:]) - SESSION_START_MINUTE for c in matrix.columns]
+    # last() skips NaN, so each slot gets its last bar that has a price
+    closes = matrix.T.groupby(slot_of_minute(minutes, slot_minutes)).last().T.reindex(columns=range(len(labels)))
+    closes.columns = labels
+    return closes
+
+def price_matrix_coverage(matrix, slot_minutes=SLOT_MINUTES):
+    """Sessions with a tradable price at the end of each slot, indexed by slot label"""
+    return slot_close_matrix(matrix, slot_minutes).notna().sum()
+
+def test_strategy(prices, buy_time, sell_time, matrix=None):
+    """Buy at the end of the buy_time slot and sell at the end of the sell_time slot, every session"""
+    if matrix is None:
+        matrix = build_price_matrix(prices)
+    buy_prices = slot_close(matrix, buy_time)
+    sell_prices = slot_close(matrix, sell_time)
+    day_returns = (sell_prices - buy_prices) / buy_prices
+    trades = day_returns.dropna()
+    
+    results = pd.DataFrame({'date': trades.index, 'return': trades.values})
+    results.attrs['coverage'] = {
+        'days': len(matrix),
+        'buy_bars': int(buy_prices.notna().sum()),
+        'sell_bars': int(sell_prices.notna().sum()),
+        'trades': len(trades),
+        'dropped': len(matrix) - len(trades),
+    }
+    return results
+
+def pair_return_sums(matrices, slot_minutes=SLOT_MINUTES):
+    """Return sums, wins and trade counts for every (entry, exit) slot pair of every ticker.
     
-    time_slots = {}
-    for hour in range(10, 16):
-        for start_min in [0, 15, 30, 45]:
-            end_min = start_min + 15
-            if hour == 15 and end_min > 60: break
-            
-            slot_name = f"{hour:02d}:{start_min:02d}-{hour:02d}:{end_min:02d}"
-            in_slot = (work_df['hour'] == hour) & (work_df['minute'] >= start_min) & (work_df['minute'] < end_min)
-            slot_returns = work_df[in_slot]['returns'].dropna()
-            
-            if len(slot_returns) > 5:
-                time_slots[slot_name] = slot_returns.mean()
-    
-    if time_slots:
-        best_time = max(time_slots, key=time_slots.get)
-        worst_time = min(time_slots, key=time_slots.get)
-        return best_time, worst_time
-    return None, None
-
-def test_strategy(prices, buy_time, sell_time):
-    buy_hour, buy_min = map(int, buy_time.split('-')[1].split(':'))
-    sell_hour, sell_min = map(int, sell_time.split('-')[1].split(':'))
-    
-    daily_trades = []
-    for date, day_prices in prices.groupby(prices.index.date):
-        buy_price = day_prices[(day_prices.index.hour == buy_hour) & (day_prices.index.minute == buy_min)]
-        sell_price = day_prices[(day_prices.index.hour == sell_hour) & (day_prices.index.minute == sell_min)]
-        
-        if not buy_price.empty and not sell_price.empty:
-            return_pct = (sell_price['Close'].iloc[0] - buy_price['Close'].iloc[0]) / buy_price['Close'].iloc[0]
-            daily_trades.append({'date': date, 'return': return_pct})
+    Entries and exits execute at slot ends, as in test_strategy, on the grid
+    of slot_minutes. All tickers' day rows are stacked and priced in one
+    broadcast, then summed back per ticker. Arrays are (tickers, entry, exit);
+    only exit > entry is used. Tickers with no day rows get all-zero sums.
+    """
+    tickers = list(matrices)
+    n_slots = len(slot_labels(slot_minutes))
+    blocks = [slot_close_matrix(matrices[t], slot_minutes).to_numpy(dtype=float) for t in tickers]
+    # reduceat needs strictly increasing offsets, so only tickers with rows take part
+    filled = [i for i, b in enumerate(blocks) if len(b)]
+    prices = np.vstack([blocks[i] for i in filled]) if filled else np.empty((0, n_slots))
+    day_returns = prices[:, None, :] / prices[:, :, None] - 1
+    valid = ~np.isnan(day_returns)
+    starts = np.cumsum([0] + [len(blocks[i]) for i in filled[:-1]])
+    upper = np.triu(np.ones((n_slots, n_slots), dtype=bool), k=1)
+    
+    def per_ticker(values):
+        sums = np.zeros((len(tickers),) + upper.shape, dtype=values.dtype)
+        if filled:
+            sums[filled] = np.add.reduceat(values, starts, axis=0) * upper
+        return sums
+    
+    return {
+        'tickers': tickers,
+        'sum': per_ticker(np.where(valid, day_returns, 0.0)),
+        'wins': per_ticker((day_returns > 0).astype(np.int64)),
+        'count': per_ticker(valid.astype(np.int64)),
+    }
+
+def pair_surface(total, wins, count, slot_minutes=SLOT_MINUTES):
+    """Entry x exit slot frames of mean return %, win rate % and trade count"""
+    periods = slot_labels(slot_minutes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(count > 0, total / count * 100, np.nan)
+        win_rate = np.where(count > 0, wins / count * 100, np.nan)
+    frame = lambda values: pd.DataFrame(values, index=pd.Index(periods, name='entry'),
+                                        columns=pd.Index(periods, name='exit'))
+    return {'mean_return_%': frame(mean), 'win_rate_%': frame(win_rate), 'trades': frame(count.astype(int))}
+
+def rank_pairs(surface, top_n=10, min_trades=5):
+    pairs = pd.DataFrame({name: values.stack() for name, values in surface.items()})
+    pairs = pairs[(pairs['trades'] >= min_trades)].dropna()
+    return pairs.sort_values('mean_return_%', ascending=False).head(top_n).reset_index()
+
+def search_all_pairs(prices_by_ticker, top_n=10, min_trades=5, slot_minutes=SLOT_MINUTES):
+    """Exhaustive entry/exit slot pair search per ticker and for the pooled sector"""
+    matrices = {t: build_price_matrix(p) for t, p in prices_by_ticker.items() if p is not None and not p.empty}
+    # Tickers with no bars inside the session have nothing to search
+    matrices = {t: matrix for t, matrix in matrices.items() if not matrix.empty}
+    sums = pair_return_sums(matrices, slot_minutes)
+    ticker_surfaces, ticker_top = {}, []
+    for i, ticker in enumerate(sums['tickers']):
+        surface = pair_surface(sums['sum'][i], sums['wins'][i], sums['count'][i], slot_minutes)
+        ticker_surfaces[ticker] = surface
+        top = rank_pairs(surface, top_n, min_trades)
+        top.insert(0, 'ticker', ticker)
+        ticker_top.append(top)
+    sector_surface = pair_surface(sums['sum'].sum(axis=0), sums['wins'].sum(axis=0), sums['count'].sum(axis=0),
+                                  slot_minutes)
+    return {
+        'ticker_surfaces': ticker_surfaces,
+        'ticker_top_pairs': pd.concat(ticker_top, ignore_index=True) if ticker_top else pd.DataFrame(),
+        'sector_surface': sector_surface,
+        'sector_top_pairs': rank_pairs(sector_surface, top_n, min_trades),
+    }
+
+def run_pair_search(tickers, top_n=10, slot_minutes=SLOT_MINUTES):
+    prices_by_ticker = {ticker: get_stock_prices(ticker) for ticker in tickers}
+    with recorder.stage('aggregate') as record:
+        search = search_all_pairs(prices_by_ticker, top_n, slot_minutes=slot_minutes)
+        record.add(rows=sum(len(p) for p in prices_by_ticker.values() if p is not None))
+    
+    print("\n" + "="*80)
+    print(f"SECTOR ENTRY/EXIT PAIR SEARCH (all {slot_minutes}-min slot pairs, traded at slot end)")
+    print("="*80)
+    print("Entry slot   | Exit slot    | Avg Return | Win Rate | Trades")
+    print("-" * 62)
+    for _, pair in search['sector_top_pairs'].iterrows():
+        print(f"{pair['entry']}  | {pair['exit']}  | {pair['mean_return_%']:>8.3f}% | "
+              f"{pair['win_rate_%']:>6.0f}%  | {pair['trades']:>6}")
+    
+    search['sector_surface']['mean_return_%'].to_csv("mining_pair_surface.csv")
+    search['ticker_top_pairs'].to_csv("mining_ticker_top_pairs.csv", index=False)
+    return search
+
+def slot_end_time(slot, slot_minutes=SLOT_MINUTES):
+    return slot_labels(slot_minutes)[slot].split('-')[1]
+
+def daily_slot_sums(prices, slot_minutes=SLOT_MINUTES):
+    """Per-day sum and count of bar returns for each slot of the grid find_daily_patterns uses"""
+    work = prepare_returns(prices)
+    n_slots = len(slot_labels(slot_minutes))
+    slots = slot_codes(work, slot_minutes)
+    in_grid = slots < n_slots
+    session_dates = np.asarray(session_calendar().sessions.index, dtype=object)
+    frame = pd.DataFrame({'date': session_dates[work['session'].to_numpy()[in_grid]], 'slot': slots[in_grid],
+                          'returns': work['returns'].to_numpy()[in_grid]})
+    dates, minutes = session_clock(prices.index)
+    days = pd.Index(sorted(set(dates[minutes >= 0])), name='date')
+    grouped = frame.groupby(['date', 'slot'])['returns']
+    shape = dict(index=days, columns=range(n_slots), fill_value=0)
+    sums = grouped.sum().unstack('slot').reindex(**shape).fillna(0).to_numpy()
+    counts = grouped.count().unstack('slot').reindex(**shape).fillna(0).to_numpy()
+    return days, sums, counts
+
+def walk_forward(prices, train_days=40, test_days=5, min_observations=5, slot_minutes=SLOT_MINUTES):
+    """Out-of-sample walk-forward backtest.
+    
+    Each window picks best/worst slots on the previous train_days sessions and
+    trades them over the next test_days, exactly as run_analysis does in-sample.
+    Slot sums are rolled forward one day at a time (add newest, drop oldest).
+    """
+    if prices is None or prices.empty:
+        return pd.DataFrame()
+    matrix = build_price_matrix(prices)
+    labels = slot_labels(slot_minutes)
+    days, sums, counts = daily_slot_sums(prices, slot_minutes)
+    test_sessions = 0
+    run_sums = sums[:train_days].sum(axis=0)
+    run_counts = counts[:train_days].sum(axis=0)
+    
+    trades = []
+    for window, test_start in enumerate(range(train_days, len(days), test_days)):
+        test_end = min(test_start + test_days, len(days))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(run_counts > min_observations, run_sums / run_counts, np.nan)
+        if not np.isnan(means).all():
+            buy_slot, sell_slot = int(np.nanargmin(means)), int(np.nanargmax(means))
+            test_days_index = days[test_start:test_end]
+            buy = slot_close(matrix, labels[buy_slot]).reindex(test_days_index)
+            sell = slot_close(matrix, labels[sell_slot]).reindex(test_days_index)
+            day_returns = ((sell - buy) / buy).dropna()
+            test_sessions += len(test_days_index)
+            trades.append(pd.DataFrame({
+                'window': window,
+                'train_start': days[test_start - train_days],
+                'train_end': days[test_start - 1],
+                'date': day_returns.index,
+                'buy_time': slot_end_time(buy_slot, slot_minutes),
+                'sell_time': slot_end_time(sell_slot, slot_minutes),
+                'return': day_returns.values
+            }))
+        for day in range(test_start, test_end):
+            run_sums += sums[day] - sums[day - train_days]
+            run_counts += counts[day] - counts[day - train_days]
+    
+    trades = pd.concat(trades, ignore_index=True) if trades else pd.DataFrame()
+    # Test sessions where a chosen slot had no bar to trade on
+    trades.attrs['coverage'] = {'test_days': test_sessions, 'trades': len(trades),
+                                'dropped': test_sessions - len(trades)}
+    return trades
+
+def run_walk_forward(tickers, train_days=40, test_days=5):
+    all_trades = []
+    print("\n" + "="*80)
+    print(f"WALK-FORWARD OUT-OF-SAMPLE BACKTEST ({train_days}d train / {test_days}d test)")
+    print("="*80)
+    for ticker in tickers:
+        prices = get_stock_prices(ticker)
+        with recorder.stage('walk_forward', ticker) as record:
+            trades = walk_forward(prices, train_days, test_days)
+            record.add(rows=0 if prices is None else len(prices))
+        if trades.empty:
+            continue
+        coverage = trades.attrs['coverage']
+        trades.insert(0, 'ticker', ticker)
+        all_trades.append(trades)
+        print(f"{ticker}: {trades['window'].nunique()} windows | {len(trades)} trades | "
+              f"{trades['return'].mean() * 100:.2f}% avg | {(trades['return'] > 0).mean() * 100:.0f}% wins "
+              f"| {coverage['dropped']} dropped (no bar in slot)")
     
-    return pd.DataFrame(daily_trades)
+    if all_trades:
+        walk_forward_df = pd.concat(all_trades, ignore_index=True)
+        walk_forward_df.to_csv("mining_walk_forward_backtest.csv", index=False)
+        return walk_forward_df
+    return pd.DataFrame()
 
 def run_analysis(ticker):
     prices = get_stock_prices(ticker)
     if prices is None: 
         return None
     
-    best_time, worst_time = find_daily_patterns(prices)
-    if not best_time: 
-        return None
-    
-    results = test_strategy(prices, worst_time, best_time)
+    with recorder.stage('analyze', ticker) as record:
+        record.add(rows=len(prices))
+        best_time, worst_time = find_daily_patterns(prices)
+        if not best_time: 
+            record['error'] = "no slot with enough returns"
+            return None
+        
+        matrix = build_price_matrix(prices)
+        results = test_strategy(prices, worst_time, best_time, matrix=matrix)
     
     if not results.empty:
         avg_return = results['return'].mean() * 100
         win_rate = (results['return'] > 0).mean() * 100
-        print(f"{ticker}: {len(results)} days | {avg_return:.2f}% avg | {win_rate:.0f}% wins")
+        coverage = results.attrs['coverage']
+        slot_coverage = price_matrix_coverage(matrix)
+        print(f"{ticker}: {len(results)} days | {avg_return:.2f}% avg | {win_rate:.0f}% wins "
+              f"| {coverage['trades']}/{coverage['days']} days with both bars, {coverage['dropped']} dropped "
+              f"| thinnest slot {slot_coverage.idxmin()} priced on {slot_coverage.min()}/{coverage['days']} days")
     
     return results
 
@@ -107,6 +340,7 @@ def print_summary_dashboard(all_results):
     for ticker, ret, win, trades in stock_performance[:10]:
         print(f"{ticker:<8} | {ret:>8.2f}% | {win:>6.0f}%  | {trades:>6}")
 
+@recorder.wrap('plot')
 def create_results_plot(all_results):
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6), facecolor='black')
     
@@ -142,6 +376,7 @@ def create_results_plot(all_results):
     plt.savefig('mining_backtest_results.png', facecolor='black', dpi=150)
     plt.show()
 
+@recorder.wrap('excel')
 def export_detailed_csv(all_results):
     detailed_data = []
     
@@ -160,16 +395,31 @@ def export_detailed_csv(all_results):
         print(f"Exported {len(final_df)} detailed trades to CSV")
 
 if __name__ == "__main__":
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        all_results = list(executor.map(run_analysis, TOP_ASX_MINING))
+    parser = argparse.ArgumentParser(description='ASX mining time-of-day backtest')
+    parser.add_argument('--track-memory', action='store_true',
+                        help='record peak memory per stage in the run report (slower; tickers run one at a time)')
+    args = parser.parse_args()
+    if args.track_memory:
+        # Peaks are process-wide, so overlapping threads would leave every stage without one
+        recorder.enable_memory_tracking()
+        all_results = [run_analysis(ticker) for ticker in TOP_ASX_MINING]
+    else:
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            all_results = list(executor.map(run_analysis, TOP_ASX_MINING))
     
     print_summary_dashboard(all_results)
     export_detailed_csv(all_results)
     create_results_plot(all_results)
+    run_pair_search(TOP_ASX_MINING)
+    run_walk_forward(TOP_ASX_MINING)
     
     valid_results = [r for r in all_results if r is not None and not r.empty]
     if valid_results:
         profitable_trades = sum(len(r[r['return'] > 0]) for r in valid_results)
         total_trades = sum(len(r) for r in valid_results)
         print(f"\nOverall Strategy Performance:")
-        print(f"Profitable Trades: {profitable_trades}/{total_trades} ({profitable_trades/total_trades*100:.1f}%)")
\ No newline at end of file
+        print(f"Profitable Trades: {profitable_trades}/{total_trades} ({profitable_trades/total_trades*100:.1f}%)")
+    
+    recorder.print_summary()
+    run_stem = f"mining_backtest_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    print(f"Run report saved: {', '.join(recorder.write_report(run_stem))}")
@@ -1,298 +1,95 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
+import hashlib
+import os
+import pickle
+import time
 from datetime import datetime
+from PIL import Image
 import warnings
 warnings.filterwarnings('ignore')
 
 # Import the mining analysis class
 from ASX_Mining_TOD import MiningTimeOfDayAnalyzer
+from asx_results import sector_period_returns, stock_swing_summary
+from asx_slots import AFTERNOON_SESSION_MINUTES, MORNING_SESSION_MINUTES, SESSION_START_MINUTE, in_session_window
 
 plt.style.use('dark_background')
 
-class MiningTODPlotter:
-    def __init__(self):
-        self.analyzer = MiningTimeOfDayAnalyzer()
-        
-    def create_comprehensive_dashboard(self):
-        """Create one large comprehensive dashboard with all mining plots"""
-        print("Running ASX mining TOD analysis and creating comprehensive dashboard...")
-        
-        # Run the analysis
-        if not self.analyzer.filter_mining_stocks():
-            print("No valid mining stocks found")
-            return
-        
-        print(f"Analyzing {len(self.analyzer.valid_stocks)} mining stocks...")
-        
-        # Get analysis results
-        successful = 0
-        for ticker in self.analyzer.valid_stocks.keys():
-            stock_data = self.analyzer.fetch_stock_intraday_data(ticker)
-            if stock_data:
-                stock_results = self.analyzer.analyze_stock_tod_patterns(ticker, stock_data)
-                if stock_results:
-                    self.analyzer.all_results[ticker] = stock_results
-                    successful += 1
-        
-        if not self.analyzer.all_results:
-            print("No analysis results generated")
-            return
-        
-        print(f"Analysis complete: {successful} mining stocks processed")
-        
-        # Create MEGA dashboard - 6 plots in one large figure
-        fig = plt.figure(figsize=(30, 20), facecolor='black')
-        
-        # Extract data for plotting
-        sector_periods = {}
-        stock_swings = {}
-        
-        # Aggregate data
-        for ticker, stock_results in self.analyzer.all_results.items():
-            stock_periods = []
-            
-            for timeframe, df in stock_results.items():
-                for _, row in df.iterrows():
-                    period = row['Time_Period_AWST']
-                    return_val = row['Avg_Return_%']
-                    
-                    # Add to sector data
-                    if period not in sector_periods:
-                        sector_periods[period] = []
-                    sector_periods[period].append(return_val)
-                    
-                    # Track for stock swing calculation
-                    stock_periods.append(return_val)
-            
-            if stock_periods:
-                swing = max(stock_periods) - min(stock_periods)
-                stock_swings[ticker] = {
-                    'swing': swing,
-                    'price': self.analyzer.valid_stocks[ticker]['current_price'],
-                    'best_return': max(stock_periods),
-                    'worst_return': min(stock_periods)
-                }
-        
-        # 1. Mining Sector Time-of-Day Pattern (Large plot)
-        ax1 = plt.subplot(3, 3, (1, 3))
-        
-        if sector_periods:
-            periods = sorted(sector_periods.keys())
-            avg_returns = [np.mean(sector_periods[p]) for p in periods]
-            
-            # Convert periods to numeric for plotting
-            time_numeric = []
-            for period in periods:
-                try:
-                    hour, minute = period.split('-')[0].split(':')
-                    time_numeric.append(int(hour) + int(minute)/60)
-                except:
-                    time_numeric.append(12)
-            
-            # Plot line with color-coded points
-            ax1.plot(time_numeric, avg_returns, 'cyan', linewidth=4, alpha=0.9, marker='o', markersize=8)
-            
-            # Color points by performance
-            colors = ['red' if r < -0.05 else 'green' if r > 0.05 else 'gold' for r in avg_returns]
-            ax1.scatter(time_numeric, avg_returns, c=colors, s=150, alpha=0.9, edgecolors='white', linewidth=2, zorder=5)
-            
-            ax1.axhline(0, color='white', alpha=0.7, linestyle='-', linewidth=2)
-            ax1.axvspan(10, 11, alpha=0.15, color='red', label='Morning Hour')
-            ax1.axvspan(13, 15, alpha=0.15, color='green', label='Afternoon Hours')
-            
-            # Annotate best and worst times
-            best_idx = np.argmax(avg_returns)
-            worst_idx = np.argmin(avg_returns)
-            
-            ax1.annotate(f'PEAK TIME\n{periods[best_idx]}\n{avg_returns[best_idx]:+.3f}%',
-                        xy=(time_numeric[best_idx], avg_returns[best_idx]),
-                        xytext=(20, 30), textcoords='offset points',
-                        bbox=dict(boxstyle='round,pad=0.5', facecolor='lime', alpha=0.9),
-                        arrowprops=dict(arrowstyle='->', color='white', lw=2),
-                        fontsize=12, color='black', fontweight='bold')
-            
-            ax1.annotate(f'DIP TIME\n{periods[worst_idx]}\n{avg_returns[worst_idx]:+.3f}%',
-                        xy=(time_numeric[worst_idx], avg_returns[worst_idx]),
-                        xytext=(20, -40), textcoords='offset points',
-                        bbox=dict(boxstyle='round,pad=0.5', facecolor='red', alpha=0.9),
-                        arrowprops=dict(arrowstyle='->', color='white', lw=2),
-                        fontsize=12, color='white', fontweight='bold')
-            
-            ax1.set_xlabel('Trading Time (AWST)', color='white', fontsize=14)
-            ax1.set_ylabel('Mining Sector Average Return (%)', color='white', fontsize=14)
-            ax1.set_title('ASX MINING SECTOR TIME-OF-DAY PATTERN', color='white', fontsize=18, fontweight='bold')
-            ax1.grid(True, alpha=0.4)
-            ax1.legend(fontsize=12)
-            
-            # Format x-axis
-            ax1.set_xticks([10, 10.5, 11, 11.5, 12, 12.5, 13, 13.5, 14, 14.5, 15])
-            ax1.set_xticklabels(['10:00', '10:30', '11:00', '11:30', '12:00', '12:30',
-                               '13:00', '13:30', '14:00', '14:30', '15:00'], fontsize=12)
-        
-        # 2. Mining Stock Swing Ranking
-        ax2 = plt.subplot(3, 3, 4)
-        
-        if stock_swings:
-            # Sort by swing magnitude
-            sorted_items = sorted(stock_swings.items(), key=lambda x: x[1]['swing'], reverse=True)[:15]
-            
-            tickers = [item[0].replace('.AX', '') for item in sorted_items]
-            swings = [item[1]['swing'] for item in sorted_items]
-            
-            colors = ['darkgreen' if s > 0.5 else 'green' if s > 0.3 else 'gold' if s > 0.15 else 'orange' 
-                     for s in swings]
-            
-            bars = ax2.barh(range(len(tickers)), swings, color=colors, alpha=0.8)
-            ax2.set_yticks(range(len(tickers)))
-            ax2.set_yticklabels(tickers, color='white', fontsize=9)
-            ax2.set_xlabel('Intraday Swing (%)', color='white', fontsize=12)
-            ax2.set_title('TOP MINING STOCKS BY SWING', color='white', fontsize=14, fontweight='bold')
-            ax2.grid(True, alpha=0.3)
-            
-            # Add percentages
-            for bar, swing in zip(bars, swings):
-                ax2.text(bar.get_width() + 0.02, bar.get_y() + bar.get_height()/2,
-                        f'{swing:.2f}%', va='center', color='white', fontweight='bold', fontsize=8)
-        
-        # 3. Best vs Worst Time Scatter
-        ax3 = plt.subplot(3, 3, 5)
-        
-        if stock_swings:
-            best_returns = [data['best_return'] for data in stock_swings.values()]
-            worst_returns = [data['worst_return'] for data in stock_swings.values()]
-            prices = [data['price'] for data in stock_swings.values()]
-            
-            scatter = ax3.scatter(worst_returns, best_returns, c=prices, s=120, 
-                                cmap='viridis', alpha=0.8, edgecolors='white', linewidth=1)
-            
-            ax3.axhline(0, color='white', alpha=0.5)
-            ax3.axvline(0, color='white', alpha=0.5)
-            ax3.plot([-1, 1], [-1, 1], 'yellow', linestyle='--', alpha=0.7, linewidth=2)
-            
-            ax3.set_xlabel('Worst Period Return (%)', color='white', fontsize=12)
-            ax3.set_ylabel('Best Period Return (%)', color='white', fontsize=12)
-            ax3.set_title('WORST vs BEST PERIODS - MINING STOCKS', color='white', fontsize=14, fontweight='bold')
-            ax3.grid(True, alpha=0.3)
-            
-            # Colorbar
-            cbar = plt.colorbar(scatter, ax=ax3)
-            cbar.set_label('Stock Price ($)', color='white', fontsize=10)
-            cbar.ax.tick_params(colors='white')
-        
-        # 4. Strategy Viability Pie Chart
-        ax4 = plt.subplot(3, 3, 6)
-        
-        if stock_swings:
-            swings_list = [data['swing'] for data in stock_swings.values()]
-            
-            strong_count = len([s for s in swings_list if s > 0.5])
-            viable_count = len([s for s in swings_list if 0.3 < s <= 0.5])
-            weak_count = len([s for s in swings_list if 0.1 < s <= 0.3])
-            poor_count = len([s for s in swings_list if s <= 0.1])
-            
-            sizes = [strong_count, viable_count, weak_count, poor_count]
-            labels = [f'Strong (>0.5%)\n{strong_count} stocks', 
-                     f'Viable (0.3-0.5%)\n{viable_count} stocks',
-                     f'Weak (0.1-0.3%)\n{weak_count} stocks', 
-                     f'Poor (<0.1%)\n{poor_count} stocks']
-            colors = ['darkgreen', 'green', 'gold', 'red']
-            
-            # Only include non-zero segments
-            non_zero = [(s, l, c) for s, l, c in zip(sizes, labels, colors) if s > 0]
-            if non_zero:
-                sizes, labels, colors = zip(*non_zero)
-                
-                ax4.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-                ax4.set_title('MINING STRATEGY VIABILITY', color='white', fontsize=14, fontweight='bold')
-        
-        # 5. Morning Dip Analysis
-        ax5 = plt.subplot(3, 3, 7)
-        
-        morning_data = {}
-        for period, returns in sector_periods.items():
-            if period.startswith(('10:', '11:')):  # Morning periods
-                morning_data[period] = np.mean(returns)
-        
-        if morning_data:
-            periods = list(morning_data.keys())
-            returns = list(morning_data.values())
-            
-            bars = ax5.bar(range(len(periods)), returns,
-                          color=['red' if r < -0.05 else 'orange' if r < 0 else 'green' for r in returns],
-                          alpha=0.8)
-            
-            ax5.set_xticks(range(len(periods)))
-            ax5.set_xticklabels([p[-5:] for p in periods], rotation=45, color='white', fontsize=9)
-            ax5.set_ylabel('Average Return (%)', color='white')
-            ax5.set_title('MINING MORNING ANALYSIS', color='white', fontsize=14, fontweight='bold')
-            ax5.axhline(0, color='white', alpha=0.5)
-            ax5.grid(True, alpha=0.3)
-            
-            # Add value labels
-            for bar, val in zip(bars, returns):
-                ax5.text(bar.get_x() + bar.get_width()/2., 
-                        bar.get_height() + (0.01 if val > 0 else -0.03),
-                        f'{val:.3f}%', ha='center', va='bottom' if val > 0 else 'top',
-                        color='white', fontweight='bold', fontsize=8)
-        
-        # 6. Afternoon Rally Analysis  
-        ax6 = plt.subplot(3, 3, 8)
-        
-        afternoon_data = {}
-        for period, returns in sector_periods.items():
-            if period.startswith(('13:', '14:')):  # Afternoon periods
-                afternoon_data[period] = np.mean(returns)
-        
-        if afternoon_data:
-            periods = list(afternoon_data.keys())
-            returns = list(afternoon_data.values())
-            
-            bars = ax6.bar(range(len(periods)), returns,
-                          color=['green' if r > 0.05 else 'orange' if r > 0 else 'red' for r in returns],
-                          alpha=0.8)
-            
-            ax6.set_xticks(range(len(periods)))
-            ax6.set_xticklabels([p[-5:] for p in periods], rotation=45, color='white', fontsize=9)
-            ax6.set_ylabel('Average Return (%)', color='white')
-            ax6.set_title('MINING AFTERNOON ANALYSIS', color='white', fontsize=14, fontweight='bold')
-            ax6.axhline(0, color='white', alpha=0.5)
-            ax6.grid(True, alpha=0.3)
-            
-            # Add value labels
-            for bar, val in zip(bars, returns):
-                ax6.text(bar.get_x() + bar.get_width()/2., 
-                        bar.get_height() + (0.01 if val > 0 else -0.03),
-                        f'{val:.3f}%', ha='center', va='bottom' if val > 0 else 'top',
-                        color='white', fontweight='bold', fontsize=8)
-        
-        # 7. Summary Statistics Box
-        ax7 = plt.subplot(3, 3, 9)
-        ax7.axis('off')
-        
-        if stock_swings and sector_periods:
-            # Calculate summary stats
-            avg_swing = np.mean([data['swing'] for data in stock_swings.values()])
-            viable_stocks = len([s for s in stock_swings.values() if s['swing'] > 0.3])
-            total_stocks = len(stock_swings)
-            
-            # Find best sector timing
-            sector_avg = {period: np.mean(returns) for period, returns in sector_periods.items()}
-            best_period = max(sector_avg.keys(), key=lambda x: sector_avg[x])
-            worst_period = min(sector_avg.keys(), key=lambda x: sector_avg[x])
-            sector_swing = sector_avg[best_period] - sector_avg[worst_period]
-            
-            # Best individual opportunity
-            best_stock = max(stock_swings.keys(), key=lambda x: stock_swings[x]['swing'])
-            best_swing = stock_swings[best_stock]['swing']
-            
-            summary_text = f"""
+RENDER_DPI = {'preview': 72, 'full': 300}
+# Cached panel PNGs are evicted least recently used first past this total size, and once unused this long
+DASHBOARD_CACHE_MAX_BYTES = 256 * 2 ** 20
+DASHBOARD_CACHE_MAX_AGE_DAYS = 30
+DASHBOARD_SIZE = (30, 20)
+TITLE_HEIGHT = 0.8  # inches above the panel grid for the dashboard title
+DASHBOARD_TITLE = 'ASX MINING SECTOR COMPREHENSIVE TIME-OF-DAY TRADING ANALYSIS DASHBOARD'
+# Panel -> (first grid cell, last grid cell) on the 3x3 dashboard grid, numbered like plt.subplot
+PANEL_CELLS = {
+    'sector_pattern': (1, 3),
+    'swing_ranking': (4, 4),
+    'best_worst': (5, 5),
+    'viability': (6, 6),
+    'morning': (7, 7),
+    'afternoon': (8, 8),
+    'summary': (9, 9),
+}
+
+
+def panel_size(name):
+    if name == 'title':
+        return DASHBOARD_SIZE[0], TITLE_HEIGHT
+    first, last = PANEL_CELLS[name]
+    return DASHBOARD_SIZE[0] / 3 * (last - first + 1), DASHBOARD_SIZE[1] / 3
+
+
+def panel_key(name, data, dpi):
+    """Cache key: changes only when the panel's own input data (or resolution) changes"""
+    return hashlib.sha256(pickle.dumps((name, data, dpi))).hexdigest()[:16]
+
+
+def dashboard_inputs(results, valid_stocks):
+    """Input data for each of the seven panels, in plain Python types so it hashes stably"""
+    sector_avg = sector_period_returns(results)['return'].to_dict()
+    periods = list(sector_avg)
+    morning = in_session_window(periods, MORNING_SESSION_MINUTES)
+    afternoon = in_session_window(periods, AFTERNOON_SESSION_MINUTES)
+    stock_swings = stock_swing_summary(results, valid_stocks).to_dict('index')
+    top_swings = sorted(stock_swings.items(), key=lambda x: x[1]['swing'], reverse=True)[:15]
+    return {
+        'sector_pattern': sector_avg,
+        'swing_ranking': [(ticker.replace('.AX', ''), data['swing']) for ticker, data in top_swings],
+        'best_worst': [(data['best_return'], data['worst_return'], data['price']) for data in stock_swings.values()],
+        'viability': [data['swing'] for data in stock_swings.values()],
+        'morning': {p: sector_avg[p] for p, keep in zip(periods, morning) if keep},
+        'afternoon': {p: sector_avg[p] for p, keep in zip(periods, afternoon) if keep},
+        'summary': summary_text(stock_swings, sector_avg, len(results)),
+    }
+
+
+def summary_text(stock_swings, sector_avg, total_observations):
+    if not (stock_swings and sector_avg):
+        return None
+    # Calculate summary stats
+    avg_swing = np.mean([data['swing'] for data in stock_swings.values()])
+    viable_stocks = len([s for s in stock_swings.values() if s['swing'] > 0.3])
+    total_stocks = len(stock_swings)
+
+    # Find best sector timing
+    best_period = max(sector_avg.keys(), key=lambda x: sector_avg[x])
+    worst_period = min(sector_avg.keys(), key=lambda x: sector_avg[x])
+    sector_swing = sector_avg[best_period] - sector_avg[worst_period]
+
+    # Best individual opportunity
+    best_stock = max(stock_swings.keys(), key=lambda x: stock_swings[x]['swing'])
+    best_swing = stock_swings[best_stock]['swing']
+
+    return f"""
 ASX MINING SECTOR TIME-OF-DAY ANALYSIS
 COMPREHENSIVE SUMMARY
 
 SECTOR STATISTICS:
 • Mining Stocks Analyzed: {total_stocks}
-• Total Observations: {sum(len(df) for stock_results in self.analyzer.all_results.values() for df in stock_results.values()):,}
+• Total Observations: {total_observations:,}
 • Average Stock Swing: {avg_swing:.2f}%
 • Sector-Wide Swing: {sector_swing:.3f}%
 
@@ -314,27 +111,337 @@ TRADING RECOMMENDATION:
 Risk Level: {'HIGH' if avg_swing > 0.8 else 'MEDIUM' if avg_swing > 0.4 else 'LOW'}
 Position Size: {'5-10%' if viable_stocks >= total_stocks*0.5 else '2-5%' if viable_stocks > 0 else '1-2%'}
             """
-            
-            ax7.text(0.05, 0.95, summary_text, transform=ax7.transAxes,
-                    fontsize=13, color='white', va='top', ha='left', family='monospace',
-                    bbox=dict(boxstyle='round,pad=0.8', facecolor='darkblue', alpha=0.95))
-        
-        plt.suptitle('ASX MINING SECTOR COMPREHENSIVE TIME-OF-DAY TRADING ANALYSIS DASHBOARD', 
-                     fontsize=24, color='white', fontweight='bold', y=0.98)
-        plt.tight_layout()
-        
+
+
+def draw_sector_pattern(ax, sector_avg):
+    """1. Mining Sector Time-of-Day Pattern (Large plot)"""
+    if not sector_avg:
+        return
+    periods = sorted(sector_avg.keys())
+    avg_returns = [sector_avg[p] for p in periods]
+
+    # Convert periods to numeric for plotting
+    time_numeric = []
+    for period in periods:
+        try:
+            hour, minute = period.split('-')[0].split(':')
+            time_numeric.append(int(hour) + int(minute)/60)
+        except:
+            time_numeric.append(12)
+
+    # Plot line with color-coded points
+    ax.plot(time_numeric, avg_returns, 'cyan', linewidth=4, alpha=0.9, marker='o', markersize=8)
+
+    # Color points by performance
+    colors = ['red' if r < -0.05 else 'green' if r > 0.05 else 'gold' for r in avg_returns]
+    ax.scatter(time_numeric, avg_returns, c=colors, s=150, alpha=0.9, edgecolors='white', linewidth=2, zorder=5)
+
+    ax.axhline(0, color='white', alpha=0.7, linestyle='-', linewidth=2)
+    for (start, end), color, label in ((MORNING_SESSION_MINUTES, 'red', 'Morning (first 2h)'),
+                                       (AFTERNOON_SESSION_MINUTES, 'green', 'Afternoon (last 2h)')):
+        ax.axvspan((SESSION_START_MINUTE + start) / 60, (SESSION_START_MINUTE + end) / 60,
+                   alpha=0.15, color=color, label=label)
+
+    # Annotate best and worst times
+    best_idx = np.argmax(avg_returns)
+    worst_idx = np.argmin(avg_returns)
+
+    ax.annotate(f'PEAK TIME\n{periods[best_idx]}\n{avg_returns[best_idx]:+.3f}%',
+                xy=(time_numeric[best_idx], avg_returns[best_idx]),
+                xytext=(20, 30), textcoords='offset points',
+                bbox=dict(boxstyle='round,pad=0.5', facecolor='lime', alpha=0.9),
+                arrowprops=dict(arrowstyle='->', color='white', lw=2),
+                fontsize=12, color='black', fontweight='bold')
+
+    ax.annotate(f'DIP TIME\n{periods[worst_idx]}\n{avg_returns[worst_idx]:+.3f}%',
+                xy=(time_numeric[worst_idx], avg_returns[worst_idx]),
+                xytext=(20, -40), textcoords='offset points',
+                bbox=dict(boxstyle='round,pad=0.5', facecolor='red', alpha=0.9),
+                arrowprops=dict(arrowstyle='->', color='white', lw=2),
+                fontsize=12, color='white', fontweight='bold')
+
+    ax.set_xlabel('Session Time (ASX, Sydney)', color='white', fontsize=14)
+    ax.set_ylabel('Mining Sector Average Return (%)', color='white', fontsize=14)
+    ax.set_title('ASX MINING SECTOR TIME-OF-DAY PATTERN', color='white', fontsize=18, fontweight='bold')
+    ax.grid(True, alpha=0.4)
+    ax.legend(fontsize=12)
+
+    # Format x-axis
+    ax.set_xticks([10, 10.5, 11, 11.5, 12, 12.5, 13, 13.5, 14, 14.5, 15, 15.5, 16])
+    ax.set_xticklabels(['10:00', '10:30', '11:00', '11:30', '12:00', '12:30',
+                        '13:00', '13:30', '14:00', '14:30', '15:00', '15:30', '16:00'], fontsize=12)
+
+
+def draw_swing_ranking(ax, top_swings):
+    """2. Mining Stock Swing Ranking"""
+    if not top_swings:
+        return
+    tickers = [ticker for ticker, _ in top_swings]
+    swings = [swing for _, swing in top_swings]
+
+    colors = ['darkgreen' if s > 0.5 else 'green' if s > 0.3 else 'gold' if s > 0.15 else 'orange'
+              for s in swings]
+
+    bars = ax.barh(range(len(tickers)), swings, color=colors, alpha=0.8)
+    ax.set_yticks(range(len(tickers)))
+    ax.set_yticklabels(tickers, color='white', fontsize=9)
+    ax.set_xlabel('Intraday Swing (%)', color='white', fontsize=12)
+    ax.set_title('TOP MINING STOCKS BY SWING', color='white', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+    # Add percentages, one label collection for the whole bar container
+    ax.bar_label(bars, labels=[f'{swing:.2f}%' for swing in swings], padding=3,
+                 color='white', fontweight='bold', fontsize=8)
+
+
+def draw_best_worst(ax, points):
+    """3. Best vs Worst Time Scatter"""
+    if not points:
+        return
+    best_returns, worst_returns, prices = zip(*points)
+
+    scatter = ax.scatter(worst_returns, best_returns, c=prices, s=120,
+                         cmap='viridis', alpha=0.8, edgecolors='white', linewidth=1)
+
+    ax.axhline(0, color='white', alpha=0.5)
+    ax.axvline(0, color='white', alpha=0.5)
+    ax.plot([-1, 1], [-1, 1], 'yellow', linestyle='--', alpha=0.7, linewidth=2)
+
+    ax.set_xlabel('Worst Period Return (%)', color='white', fontsize=12)
+    ax.set_ylabel('Best Period Return (%)', color='white', fontsize=12)
+    ax.set_title('WORST vs BEST PERIODS - MINING STOCKS', color='white', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+    # Colorbar
+    cbar = ax.figure.colorbar(scatter, ax=ax)
+    cbar.set_label('Stock Price ($)', color='white', fontsize=10)
+    cbar.ax.tick_params(colors='white')
+
+
+def draw_viability(ax, swings_list):
+    """4. Strategy Viability Pie Chart"""
+    if not swings_list:
+        return
+    strong_count = len([s for s in swings_list if s > 0.5])
+    viable_count = len([s for s in swings_list if 0.3 < s <= 0.5])
+    weak_count = len([s for s in swings_list if 0.1 < s <= 0.3])
+    poor_count = len([s for s in swings_list if s <= 0.1])
+
+    sizes = [strong_count, viable_count, weak_count, poor_count]
+    labels = [f'Strong (>0.5%)\n{strong_count} stocks',
+              f'Viable (0.3-0.5%)\n{viable_count} stocks',
+              f'Weak (0.1-0.3%)\n{weak_count} stocks',
+              f'Poor (<0.1%)\n{poor_count} stocks']
+    colors = ['darkgreen', 'green', 'gold', 'red']
+
+    # Only include non-zero segments
+    non_zero = [(s, l, c) for s, l, c in zip(sizes, labels, colors) if s > 0]
+    if non_zero:
+        sizes, labels, colors = zip(*non_zero)
+
+        ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+        ax.set_title('MINING STRATEGY VIABILITY', color='white', fontsize=14, fontweight='bold')
+
+
+def draw_period_bars(ax, period_returns, colors, title):
+    if not period_returns:
+        return
+    periods = list(period_returns.keys())
+    returns = list(period_returns.values())
+
+    bars = ax.bar(range(len(periods)), returns, color=colors(returns), alpha=0.8)
+
+    ax.set_xticks(range(len(periods)))
+    ax.set_xticklabels([p[-5:] for p in periods], rotation=45, color='white', fontsize=9)
+    ax.set_ylabel('Average Return (%)', color='white')
+    ax.set_title(title, color='white', fontsize=14, fontweight='bold')
+    ax.axhline(0, color='white', alpha=0.5)
+    ax.grid(True, alpha=0.3)
+
+    # Add value labels
+    ax.bar_label(bars, labels=[f'{val:.3f}%' for val in returns], padding=2,
+                 color='white', fontweight='bold', fontsize=8)
+
+
+def draw_morning(ax, morning_data):
+    """5. Morning Dip Analysis"""
+    draw_period_bars(ax, morning_data,
+                     lambda returns: ['red' if r < -0.05 else 'orange' if r < 0 else 'green' for r in returns],
+                     'MINING MORNING ANALYSIS')
+
+
+def draw_afternoon(ax, afternoon_data):
+    """6. Afternoon Rally Analysis"""
+    draw_period_bars(ax, afternoon_data,
+                     lambda returns: ['green' if r > 0.05 else 'orange' if r > 0 else 'red' for r in returns],
+                     'MINING AFTERNOON ANALYSIS')
+
+
+def draw_summary(ax, text):
+    """7. Summary Statistics Box"""
+    ax.axis('off')
+    if text:
+        ax.text(0.05, 0.95, text, transform=ax.transAxes,
+                fontsize=13, color='white', va='top', ha='left', family='monospace',
+                bbox=dict(boxstyle='round,pad=0.8', facecolor='darkblue', alpha=0.95))
+
+
+def draw_title(ax, title):
+    ax.axis('off')
+    ax.text(0.5, 0.5, title, transform=ax.transAxes, ha='center', va='center',
+            fontsize=24, color='white', fontweight='bold')
+
+
+PANEL_RENDERERS = {
+    'sector_pattern': draw_sector_pattern,
+    'swing_ranking': draw_swing_ranking,
+    'best_worst': draw_best_worst,
+    'viability': draw_viability,
+    'morning': draw_morning,
+    'afternoon': draw_afternoon,
+    'summary': draw_summary,
+    'title': draw_title,
+}
+
+
+class MiningTODPlotter:
+    def __init__(self, headless=False, cache_dir='dashboard_cache'):
+        self.analyzer = MiningTimeOfDayAnalyzer()
+        self.headless = headless
+        self.cache_dir = cache_dir
+        # (mode, panel or 'assemble') -> seconds for the latest render, 0 for a cache hit
+        self.render_times = {}
+        if headless:
+            # Non-interactive: nothing ever opens a window or blocks
+            plt.switch_backend('Agg')
+
+    def render_panel(self, name, data, mode='full'):
+        """Render one panel on its own to a cached PNG; re-renders only when its data changes"""
+        dpi = RENDER_DPI[mode]
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, f"{name}_{mode}_{panel_key(name, data, dpi)}.png")
+        started = time.perf_counter()
+        if os.path.exists(path):
+            # Mark the hit as recently used for prune_cache
+            os.utime(path)
+        else:
+            fig = plt.figure(figsize=panel_size(name), facecolor='black')
+            try:
+                ax = fig.add_subplot(1, 1, 1)
+                PANEL_RENDERERS[name](ax, data)
+                if name != 'title':
+                    fig.tight_layout()
+                fig.savefig(path, dpi=dpi, facecolor='black')
+            finally:
+                plt.close(fig)
+        self.render_times[(mode, name)] = time.perf_counter() - started
+        return path
+
+    def prune_cache(self, keep=(), max_bytes=DASHBOARD_CACHE_MAX_BYTES, max_age_days=DASHBOARD_CACHE_MAX_AGE_DAYS):
+        """Delete cached panels unused for max_age_days, then the least recently used until under max_bytes"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        keep = {os.path.abspath(path) for path in keep}
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.png') and os.path.abspath(path) not in keep:
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries) + sum(os.path.getsize(path) for path in keep if os.path.exists(path))
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for mtime, size, path in sorted(entries):
+            if mtime >= cutoff and total <= max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def render_title(self, mode='full'):
+        return self.render_panel('title', DASHBOARD_TITLE, mode)
+
+    def assemble_dashboard(self, panel_paths, filename, mode='full'):
+        """Paste the cached panel images onto the dashboard grid; no re-rendering at full size"""
+        started = time.perf_counter()
+        dpi = RENDER_DPI[mode]
+        width, height = DASHBOARD_SIZE
+        title = np.asarray(Image.open(panel_paths['title']).convert('RGB'))
+        canvas = np.zeros((title.shape[0] + round(height * dpi), round(width * dpi), 3), dtype=np.uint8)
+        canvas[:title.shape[0]] = title
+        for name, (first, last) in PANEL_CELLS.items():
+            row, column = divmod(first - 1, 3)
+            image = np.asarray(Image.open(panel_paths[name]).convert('RGB'))
+            top = title.shape[0] + round(row * height / 3 * dpi)
+            left = round(column * width / 3 * dpi)
+            canvas[top:top + image.shape[0], left:left + image.shape[1]] = image
+        Image.fromarray(canvas).save(filename, dpi=(dpi, dpi), compress_level=1)
+        self.render_times[(mode, 'assemble')] = time.perf_counter() - started
+
+    def render_dashboard(self, results, mode='full', filename=None):
+        """Render (or reuse) every panel and assemble the dashboard PNG; returns its filename"""
+        with self.analyzer.recorder.stage('plot') as record:
+            inputs = dashboard_inputs(results, self.analyzer.valid_stocks)
+            panel_paths = {name: self.render_panel(name, data, mode) for name, data in inputs.items()}
+            panel_paths['title'] = self.render_title(mode)
+            if filename is None:
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                suffix = '' if mode == 'full' else f'_{mode}'
+                filename = f"Mining_TOD_Mega_Dashboard_{timestamp}{suffix}.png"
+            self.assemble_dashboard(panel_paths, filename, mode)
+            self.prune_cache(keep=panel_paths.values())
+            record.add(rows=len(results))
+        self.print_render_times(mode)
+        return filename
+
+    def print_render_times(self, mode):
+        times = {name: seconds for (m, name), seconds in self.render_times.items() if m == mode}
+        print(f"\nDashboard render times ({mode}, {RENDER_DPI[mode]} dpi):")
+        for name, seconds in times.items():
+            print(f"  {name:<16} {seconds*1000:8.1f} ms")
+        print(f"  {'total':<16} {sum(times.values())*1000:8.1f} ms")
+
+    def create_comprehensive_dashboard(self, workers=1, mode='full'):
+        """Create one large comprehensive dashboard with all mining plots"""
+        print("Running ASX mining TOD analysis and creating comprehensive dashboard...")
+
+        # Run the analysis
+        if not self.analyzer.filter_mining_stocks():
+            print("No valid mining stocks found")
+            return
+
+        print(f"Analyzing {len(self.analyzer.valid_stocks)} mining stocks...")
+
+        # Get analysis results
+        successful = self.analyzer.analyze_universe(workers)
+
+        if not self.analyzer.all_results:
+            print("No analysis results generated")
+            return
+
+        print(f"Analysis complete: {successful} mining stocks processed")
+
+        # Extract data for plotting
+        results = self.analyzer.get_results_frame()
+        sector_avg = sector_period_returns(results)['return'].to_dict()
+        stock_swings = stock_swing_summary(results, self.analyzer.valid_stocks).to_dict('index')
+
         # Save mega dashboard
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"Mining_TOD_Mega_Dashboard_{timestamp}.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='black')
+        filename = self.render_dashboard(results, mode)
         print(f"\nMEGA mining dashboard saved: {filename}")
-        
-        plt.show()
-        
+
+        if not self.headless:
+            plt.figure(figsize=(DASHBOARD_SIZE[0], DASHBOARD_SIZE[1] + TITLE_HEIGHT), facecolor='black')
+            plt.imshow(Image.open(filename))
+            plt.axis('off')
+            plt.show()
+
         # Print key insights
-        self.print_dashboard_summary(stock_swings, sector_periods)
-    
-    def print_dashboard_summary(self, stock_swings, sector_periods):
+        self.print_dashboard_summary(stock_swings, sector_avg)
+        return filename
+
+    def print_dashboard_summary(self, stock_swings, sector_avg):
         """Print mining dashboard summary"""
         print(f"\n{'='*80}")
         print(f"ASX MINING TOD DASHBOARD SUMMARY")
@@ -356,9 +463,8 @@ Position Size: {'5-10%' if viable_stocks >= total_stocks*0.5 else '2-5%' if viab
             print(f"  Average Swing: {avg_swing:.2f}%")
             print(f"  Viable Strategies: {viable}/{len(stock_swings)} ({viable/len(stock_swings)*100:.0f}%)")
         
-        if sector_periods:
+        if sector_avg:
             # Best timing
-            sector_avg = {period: np.mean(returns) for period, returns in sector_periods.items()}
             best_time = max(sector_avg.keys(), key=lambda x: sector_avg[x])
             worst_time = min(sector_avg.keys(), key=lambda x: sector_avg[x])
             
@@ -372,4 +478,4 @@ Position Size: {'5-10%' if viable_stocks >= total_stocks*0.5 else '2-5%' if viab
 # Execute
 if __name__ == "__main__":
     plotter = MiningTODPlotter()
-    plotter.create_comprehensive_dashboard()
\ No newline at end of file
+    plotter.create_comprehensive_dashboard()
@@ -0,0 +1,243 @@
+import os
+import random
+import time
+import pandas as pd
+import yfinance as yf
+from asx_calendar import EXCHANGE_TZ, session_calendar
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pkl'
+
+# Furthest back Yahoo will serve each intraday interval
+MAX_LOOKBACK_DAYS = {'1m': 7, '2m': 60, '5m': 60, '15m': 60, '30m': 60, '60m': 730, '1h': 730, '1d': 36500}
+
+
+def period_to_timedelta(period):
+    if period is None or period == 'max':
+        return None
+    if period.endswith('d'):
+        return pd.Timedelta(days=int(period[:-1]))
+    if period.endswith('mo'):
+        return pd.Timedelta(days=31 * int(period[:-2]))
+    if period.endswith('y'):
+        return pd.Timedelta(days=366 * int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def normalize_bars(data):
+    """Flatten yfinance output to one column per field with a tz-aware index"""
+    if data is None or data.empty:
+        return pd.DataFrame()
+    data = data.copy()
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.droplevel(1)
+    data = data.loc[:, ~data.columns.duplicated()]
+    data.columns = [str(c) for c in data.columns]
+    if data.index.tz is None:
+        data.index = data.index.tz_localize('UTC')
+    data.index.name = 'Datetime'
+    return data[~data.index.duplicated(keep='last')].sort_index()
+
+
+def trim_to_period(data, period, end=None):
+    """Bars in the `period` ending at `end` (default: the last bar)"""
+    window = period_to_timedelta(period)
+    if window is None or data.empty:
+        return data
+    end = data.index[-1] if end is None else pd.Timestamp(end).tz_convert(data.index.tz)
+    return data[data.index > end - window]
+
+
+def bars_since(data, start):
+    if data.empty:
+        return data
+    start = pd.Timestamp(start)
+    if start.tz is None:
+        start = start.tz_localize(data.index.tz)
+    return data[data.index >= start]
+
+
+def frame_path(root, ticker, interval, fmt=None):
+    return os.path.join(root, ticker.replace('/', '_'), f"{interval}.{fmt or CACHE_FORMAT}")
+
+
+def write_frame(path, data):
+    """Write a frame atomically so a crash never leaves a half-written file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    if path.endswith('.parquet'):
+        data.to_parquet(tmp_path)
+    else:
+        data.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_frame(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def find_frame(root, ticker, interval):
+    for fmt in ('parquet', 'pkl'):
+        path = frame_path(root, ticker, interval, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def provider_identity(provider):
+    """Hashable identity shared by provider instances that serve the same bars.
+
+    Providers opt in with a cache_identity() method; any other provider is
+    only ever the same as itself.
+    """
+    identity = getattr(provider, 'cache_identity', None)
+    return identity() if identity is not None else ('instance', id(provider))
+
+
+class YahooBarProvider:
+    """Downloads bars straight from Yahoo Finance"""
+
+    def cache_identity(self):
+        return (type(self).__name__,)
+
+    def get_bars(self, ticker, interval, period, start=None):
+        if start is not None:
+            data = yf.download(ticker, start=start, interval=interval, progress=False, threads=False)
+        else:
+            data = yf.download(ticker, period=period, interval=interval, progress=False, threads=False)
+        return normalize_bars(data)
+
+    def get_bars_batch(self, tickers, interval, period, start=None):
+        """One multi-symbol request for a whole batch of tickers"""
+        kwargs = {'start': start} if start is not None else {'period': period}
+        data = yf.download(list(tickers), interval=interval, group_by='ticker', progress=False, **kwargs)
+        batch = {}
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex) and ticker in data.columns.get_level_values(0):
+                batch[ticker] = normalize_bars(data[ticker].dropna(how='all'))
+            else:
+                batch[ticker] = pd.DataFrame()
+        return batch
+
+
+class FileBarProvider:
+    """Replays bars recorded under root/<ticker>/<interval> with no network access"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def cache_identity(self):
+        return (type(self).__name__, os.path.abspath(self.root))
+
+    def get_bars(self, ticker, interval, period, start=None):
+        path = find_frame(self.root, ticker, interval)
+        if path is None:
+            return pd.DataFrame()
+        data = normalize_bars(read_frame(path))
+        if start is not None:
+            return bars_since(data, start)
+        return trim_to_period(data, period)
+
+    def get_bars_batch(self, tickers, interval, period, start=None):
+        return {ticker: self.get_bars(ticker, interval, period, start) for ticker in tickers}
+
+    def record(self, ticker, interval, data):
+        write_frame(frame_path(self.root, ticker, interval), normalize_bars(data))
+
+
+class StandInBarProvider:
+    """Wraps another provider with simulated network latency and transient failures, for offline testing"""
+
+    def __init__(self, source, latency=0.05, failure_rate=0.0, seed=0):
+        self.source = source
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+    def get_bars(self, ticker, interval, period, start=None):
+        time.sleep(self.latency)
+        if self.random.random() < self.failure_rate:
+            raise ConnectionError(f"simulated transient failure for {ticker} {interval}")
+        return self.source.get_bars(ticker, interval, period, start)
+
+    def get_bars_batch(self, tickers, interval, period, start=None):
+        time.sleep(self.latency)
+        return self.source.get_bars_batch(tickers, interval, period, start)
+
+
+class CachedBarProvider:
+    """Keeps a columnar on-disk copy of every (ticker, interval) series and only
+    asks the source provider for bars newer than the cached high-water mark."""
+
+    def __init__(self, source=None, cache_dir='bar_cache'):
+        self.source = source if source is not None else YahooBarProvider()
+        self.cache_dir = cache_dir
+        self.requests_made = 0
+
+    def cache_identity(self):
+        return (type(self).__name__, provider_identity(self.source), os.path.abspath(self.cache_dir))
+
+    def load_cached(self, ticker, interval):
+        path = find_frame(self.cache_dir, ticker, interval)
+        if path is None:
+            return pd.DataFrame()
+        return normalize_bars(read_frame(path))
+
+    def get_bars(self, ticker, interval, period, start=None):
+        cached = self.load_cached(ticker, interval)
+        self.requests_made += 1
+        fresh = self.source.get_bars(ticker, interval, period, start=self.restart_date(interval, cached))
+        merged = self.merge(ticker, interval, cached, fresh)
+        if start is not None:
+            return bars_since(merged, start)
+        return self.trim(merged, interval, period)
+
+    def get_bars_batch(self, tickers, interval, period, start=None):
+        """Batched variant of get_bars; tickers sharing a restart date share one request"""
+        cached = {ticker: self.load_cached(ticker, interval) for ticker in tickers}
+        restart_groups = {}
+        for ticker, bars in cached.items():
+            restart_groups.setdefault(self.restart_date(interval, bars), []).append(ticker)
+        batch = {}
+        for restart, group in restart_groups.items():
+            self.requests_made += 1
+            fresh = self.source.get_bars_batch(group, interval, period, start=restart)
+            for ticker in group:
+                merged = self.merge(ticker, interval, cached[ticker], fresh.get(ticker, pd.DataFrame()))
+                batch[ticker] = bars_since(merged, start) if start is not None else self.trim(merged, interval, period)
+        return batch
+
+    def trim(self, merged, interval, period):
+        # Anchored to now, not the last cached bar, so a stale or delisted ticker's old bars age out
+        now = pd.Timestamp.now(tz='UTC')
+        if interval == '1d' and period.endswith('d') and not merged.empty:
+            # Yahoo's daily periods count sessions, so a Monday or post-holiday screen still sees 5 of them
+            sessions = session_calendar().recent_sessions(int(period[:-1]), now)
+            if sessions.empty:
+                return merged.iloc[:0]
+            dates = pd.Index(merged.index.tz_convert(EXCHANGE_TZ).date)
+            return merged[dates >= sessions[0].date()]
+        return trim_to_period(merged, period, now)
+
+    def merge(self, ticker, interval, cached, fresh):
+        if fresh.empty:
+            return cached
+        merged = normalize_bars(pd.concat([cached, fresh]) if not cached.empty else fresh)
+        write_frame(frame_path(self.cache_dir, ticker, interval), merged)
+        return merged
+
+    def restart_date(self, interval, cached):
+        """Date to resume downloading from, or None when a full-period fetch is needed"""
+        if cached.empty:
+            return None
+        high_water = cached.index[-1]
+        lookback = pd.Timedelta(days=MAX_LOOKBACK_DAYS.get(interval, 60) - 1)
+        if pd.Timestamp.now(tz=high_water.tz) - high_water >= lookback:
+            return None
+        # Restart from the high-water session so a partially cached day is completed
+        return high_water.date()
@@ -0,0 +1,177 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from ASX_Mining_TOD import MiningTimeOfDayAnalyzer
+from ASX_TOD_Backtest import build_price_matrix, find_daily_patterns, test_strategy
+from asx_synthetic import SyntheticBarProvider, synthetic_universe
+
+STAGES = ['screen', 'analyze', 'excel', 'backtest', 'dashboard', 'sweep']
+DEFAULT_TICKERS = [10, 100, 1000, 5000]
+DEFAULT_DAYS = [60, 730]
+BASELINE_PATH = 'benchmark_baseline.json'
+
+
+def measure(fn, track_memory=True):
+    """Run fn() and return (result, wall seconds, peak traced bytes or None)"""
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = fn()
+    finally:
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+        if track_memory:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def backtest_universe(analyzer, provider):
+    """The backtest's per-ticker path (patterns, then one strategy test) on 5min closes; returns rows scanned"""
+    rows = 0
+    for ticker in analyzer.valid_stocks:
+        prices = analyzer.to_awst_trading_hours(provider.get_bars(ticker, '5m', '60d'))[['Close']]
+        rows += len(prices)
+        best_time, worst_time = find_daily_patterns(prices)
+        if best_time:
+            test_strategy(prices, worst_time, best_time, matrix=build_price_matrix(prices))
+    return rows
+
+
+def render_dashboard(analyzer, cache_dir):
+    # Imported here so the other stages never pull in matplotlib
+    from ASX_TOD_plots import MiningTODPlotter
+    plotter = MiningTODPlotter(headless=True, cache_dir=cache_dir)
+    plotter.analyzer = analyzer
+    return plotter.render_dashboard(analyzer.get_results_frame(), 'preview',
+                                     os.path.join(cache_dir, 'dashboard.png'))
+
+
+def run_configuration(n_tickers, days, stages=STAGES, seed=0, track_memory=True):
+    """Time each stage on a synthetic universe; returns one record per stage"""
+    provider = SyntheticBarProvider(seed=seed, days=days)
+    analyzer = MiningTimeOfDayAnalyzer(provider)
+    analyzer.mining_stocks = synthetic_universe(n_tickers)
+    with tempfile.TemporaryDirectory(prefix='asx_benchmark_') as workdir:
+        steps = {
+            'screen': lambda: analyzer.filter_mining_stocks(),
+            'analyze': lambda: analyzer.analyze_universe(),
+            'excel': lambda: analyzer.create_comprehensive_excel(),
+            'backtest': lambda: backtest_universe(analyzer, provider),
+            'dashboard': lambda: render_dashboard(analyzer, os.path.join(workdir, 'dashboard_cache')),
+            'sweep': lambda: analyzer.resolution_sweep(),
+        }
+        # Later stages need the earlier ones' output even when they are not being timed
+        needed = STAGES[:max(STAGES.index(stage) for stage in stages) + 1]
+        records = []
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for stage in needed:
+                served = provider.bars_served
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result, seconds, peak = measure(steps[stage], track_memory and stage in stages)
+                if stage not in stages:
+                    continue
+                if stage == 'backtest':
+                    rows = result
+                elif stage in ('screen', 'analyze', 'sweep'):
+                    rows = provider.bars_served - served
+                else:
+                    rows = len(analyzer.get_results_frame())
+                records.append({
+                    'stage': stage,
+                    'tickers': n_tickers,
+                    'days': days,
+                    'seconds': round(seconds, 4),
+                    'rows': rows,
+                    'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+                    'peak_mb': round(peak / 2 ** 20, 2) if peak is not None else None,
+                })
+        finally:
+            os.chdir(cwd)
+    return records
+
+
+def record_key(record):
+    return f"{record['stage']}/{record['tickers']}/{record['days']}"
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(records, path=BASELINE_PATH):
+    baseline = load_baseline(path)
+    baseline.update({record_key(record): record for record in records})
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def find_regressions(records, baseline, tolerance=0.2):
+    """Records whose time or peak memory grew more than `tolerance` over the stored baseline"""
+    regressions = []
+    for record in records:
+        base = baseline.get(record_key(record))
+        if base is None:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            if record[metric] is not None and base.get(metric):
+                change = record[metric] / base[metric] - 1
+                if change > tolerance:
+                    regressions.append((record_key(record), metric, base[metric], record[metric], change))
+    return regressions
+
+
+def print_records(records):
+    print(f"{'Stage':<10} {'Tickers':>7} {'Days':>5} {'Seconds':>9} {'Rows':>11} {'Rows/sec':>12} {'Peak MB':>9}")
+    print('-' * 69)
+    for r in records:
+        rate = f"{r['rows_per_sec']:,.0f}" if r['rows_per_sec'] is not None else '-'
+        peak = f"{r['peak_mb']:.1f}" if r['peak_mb'] is not None else '-'
+        print(f"{r['stage']:<10} {r['tickers']:>7} {r['days']:>5} {r['seconds']:>9.3f} {r['rows']:>11,} {rate:>12} {peak:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark analysis stages on synthetic ASX bars')
+    parser.add_argument('--tickers', type=int, nargs='+', default=DEFAULT_TICKERS)
+    parser.add_argument('--days', type=int, nargs='+', default=DEFAULT_DAYS)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (it slows the stages down)')
+    parser.add_argument('--output', help='write the records as JSON')
+    args = parser.parse_args(argv)
+
+    records = []
+    for days in args.days:
+        for n_tickers in args.tickers:
+            print(f"Benchmarking {n_tickers} tickers x {days} days...")
+            records.extend(run_configuration(n_tickers, days, args.stages, args.seed, not args.no_memory))
+    print_records(records)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(records, f, indent=2)
+
+    regressions = find_regressions(records, load_baseline(args.baseline), args.tolerance)
+    for key, metric, before, after, change in regressions:
+        print(f"  REGRESSION {key} {metric}: {before} -> {after} ({change:+.0%})")
+    if args.save_baseline:
+        save_baseline(records, args.baseline)
+        print(f"Baseline saved: {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import functools
+from collections import namedtuple
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+# ASX hours are set in Sydney time; naive timestamps in this codebase are AWST wall clock
+EXCHANGE_TZ = 'Australia/Sydney'
+ANALYSIS_TZ = 'Australia/Perth'
+# Minutes after midnight, exchange time
+OPEN_MINUTE = 10 * 60
+CLOSE_MINUTE = 16 * 60
+EARLY_CLOSE_MINUTE = 14 * 60
+# The staggered open runs a call auction per alphabetical group; every group is trading by about 10:10.
+# After the close comes the pre-CSPA phase and the closing single price auction, done by close + 12 minutes.
+OPENING_AUCTION_MINUTES = 10
+CLOSING_AUCTION_MINUTES = 12
+
+CLOSED, OPENING_AUCTION, CONTINUOUS, CLOSING_AUCTION = range(4)
+PHASE_NAMES = ['closed', 'opening_auction', 'continuous', 'closing_auction']
+
+SessionPosition = namedtuple('SessionPosition', ['session', 'minute', 'phase'])
+
+
+def easter_sunday(year):
+    """Gregorian Easter (anonymous Gregorian algorithm)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def next_weekday(day, taken=()):
+    while day.weekday() >= 5 or day in taken:
+        day += timedelta(days=1)
+    return day
+
+
+def asx_holidays(year):
+    """{date: name} of ASX market holidays.
+
+    New Year's Day, Australia Day, Christmas and Boxing Day move to the next
+    free weekday when they fall on a weekend; Anzac Day does not. The King's
+    (Queen's) Birthday is the second Monday in June.
+    """
+    easter = easter_sunday(year)
+    june_first = date(year, 6, 1)
+    christmas = next_weekday(date(year, 12, 25))
+    holidays = {
+        next_weekday(date(year, 1, 1)): "New Year's Day",
+        next_weekday(date(year, 1, 26)): 'Australia Day',
+        easter - timedelta(days=2): 'Good Friday',
+        easter + timedelta(days=1): 'Easter Monday',
+        june_first + timedelta(days=(7 - june_first.weekday()) % 7 + 7): "King's Birthday",
+        christmas: 'Christmas Day',
+        next_weekday(date(year, 12, 26), taken=(christmas,)): 'Boxing Day',
+    }
+    anzac = date(year, 4, 25)
+    if anzac.weekday() < 5:
+        holidays[anzac] = 'Anzac Day'
+    return holidays
+
+
+class SessionCalendar:
+    """Precomputed ASX trading sessions for a span of years.
+
+    One row per trading day with the open, the end of continuous trading and
+    the end of the closing auction as UTC nanoseconds, so any bar index is
+    placed with one searchsorted: its session, minute of session and phase.
+    Christmas Eve and New Year's Eve close early at 14:00 (auction to 14:12).
+    """
+
+    def __init__(self, first_year, last_year):
+        self.first_year, self.last_year = first_year, last_year
+        self.holidays = {}
+        for year in range(first_year, last_year + 1):
+            self.holidays.update(asx_holidays(year))
+        weekdays = pd.bdate_range(f"{first_year}-01-01", f"{last_year}-12-31")
+        days = weekdays[~weekdays.isin(pd.DatetimeIndex(list(self.holidays)))]
+        early = (days.month == 12) & np.isin(days.day, [24, 31])
+        close_minute = np.where(early, EARLY_CLOSE_MINUTE, CLOSE_MINUTE)
+        midnight = days.tz_localize(EXCHANGE_TZ)
+        opens = midnight + pd.Timedelta(minutes=OPEN_MINUTE)
+        closes = midnight + pd.to_timedelta(close_minute, unit='min')
+        self.sessions = pd.DataFrame({
+            'open': opens,
+            'close': closes,
+            'auction_end': closes + pd.Timedelta(minutes=CLOSING_AUCTION_MINUTES),
+            'early_close': early,
+        }, index=pd.Index(days.date, name='date'))
+        self.open_ns = utc_nanoseconds(self.sessions['open'])
+        self.close_ns = utc_nanoseconds(self.sessions['close'])
+        self.auction_end_ns = utc_nanoseconds(self.sessions['auction_end'])
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def is_trading_day(self, day):
+        return pd.Timestamp(day).date() in self.sessions.index
+
+    def trading_days(self, start, end):
+        """Trading dates from start to end inclusive, as a DatetimeIndex"""
+        dates = pd.DatetimeIndex(self.sessions.index)
+        return dates[(dates >= pd.Timestamp(start).normalize()) & (dates <= pd.Timestamp(end).normalize())]
+
+    def recent_sessions(self, n, now=None):
+        """Dates of the last n sessions to have opened by `now` (default: the current time)"""
+        now = pd.Timestamp.now(tz='UTC') if now is None else now
+        opened = np.searchsorted(self.open_ns, utc_nanoseconds([now])[0], side='right')
+        return pd.DatetimeIndex(self.sessions.index[max(opened - n, 0):opened])
+
+    def locate(self, index):
+        """SessionPosition arrays for a bar index (naive timestamps are AWST).
+
+        session numbers calendar rows (-1 when closed); minute is minutes since
+        that session's open while trading is on (opening auction or continuous,
+        -1 otherwise); phase is one of the PHASE constants.
+        """
+        times = utc_nanoseconds(index)
+        rows = np.searchsorted(self.open_ns, times, side='right') - 1
+        known = rows >= 0
+        safe = np.where(known, rows, 0)
+        opens, closes, auction_ends = self.open_ns[safe], self.close_ns[safe], self.auction_end_ns[safe]
+        phase = np.select(
+            [~known | (times >= auction_ends), times >= closes, times < opens + OPENING_AUCTION_MINUTES * 60 * 10 ** 9],
+            [CLOSED, CLOSING_AUCTION, OPENING_AUCTION], CONTINUOUS)
+        trading = (phase == OPENING_AUCTION) | (phase == CONTINUOUS)
+        return SessionPosition(
+            session=np.where(phase != CLOSED, rows, -1),
+            minute=np.where(trading, (times - opens) // (60 * 10 ** 9), -1),
+            phase=phase,
+        )
+
+    def minute_of_session(self, index):
+        return self.locate(index).minute
+
+    def in_session(self, index):
+        """Bars inside trading hours (open to close) on a trading day"""
+        return self.locate(index).minute >= 0
+
+    def windows(self, day, tz=ANALYSIS_TZ):
+        """The session's phase boundaries for one trading date, in `tz`"""
+        row = self.sessions.loc[pd.Timestamp(day).date()]
+        return {
+            'open': row['open'].tz_convert(tz),
+            'opening_auction_end': (row['open'] + pd.Timedelta(minutes=OPENING_AUCTION_MINUTES)).tz_convert(tz),
+            'close': row['close'].tz_convert(tz),
+            'closing_auction_end': row['auction_end'].tz_convert(tz),
+        }
+
+
+def utc_nanoseconds(times):
+    index = pd.DatetimeIndex(times)
+    if index.tz is None:
+        index = index.tz_localize(ANALYSIS_TZ)
+    return index.tz_convert('UTC').as_unit('ns').asi8
+
+
+@functools.lru_cache(maxsize=None)
+def session_calendar(first_year=2000, last_year=None):
+    """The shared calendar every consumer uses, built once per process"""
+    return SessionCalendar(first_year, last_year if last_year is not None else date.today().year + 1)
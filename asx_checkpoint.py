@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import pickle
+
+MANIFEST = 'manifest.jsonl'
+
+
+def config_key(config):
+    """Short stable hash of a JSON-able run configuration"""
+    text = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def write_atomic(path, data):
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + '.tmp', path)
+
+
+class RunCheckpoint:
+    """Per-ticker checkpoints for one run configuration, under root/<config hash>/.
+
+    Each completed ticker's packed results are written atomically to their own
+    file and only then recorded in an append-only manifest, so a crash leaves
+    at most an unreferenced file or a torn manifest line, both ignored; the
+    next record starts on a new line.
+    Any change to the configuration gives a new hash and so a fresh directory.
+    Failed tickers are recorded but not treated as done, so a resumed run
+    retries them.
+    """
+
+    def __init__(self, root, config):
+        self.config = config
+        self.key = config_key(config)
+        self.directory = os.path.join(root, self.key)
+        os.makedirs(self.directory, exist_ok=True)
+        config_path = os.path.join(self.directory, 'config.json')
+        if not os.path.exists(config_path):
+            write_atomic(config_path, json.dumps(config, indent=2, sort_keys=True, default=str).encode())
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def entries(self):
+        """Latest manifest entry per ticker"""
+        entries = {}
+        if not os.path.exists(self.path(MANIFEST)):
+            return entries
+        with open(self.path(MANIFEST)) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entries[entry['ticker']] = entry
+        return entries
+
+    def completed(self):
+        return [t for t, entry in self.entries().items()
+                if entry['status'] == 'done' and os.path.exists(self.path(entry['file']))]
+
+    def record(self, ticker, results=None, error=None):
+        """Checkpoint one ticker: its packed SlotResults on success, or its error"""
+        entry = {'ticker': ticker, 'status': 'failed', 'error': error}
+        if results is not None:
+            entry = {'ticker': ticker, 'status': 'done', 'file': f"{ticker}.pkl"}
+            write_atomic(self.path(entry['file']), pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL))
+        line = (json.dumps(entry) + '\n').encode()
+        with open(self.path(MANIFEST), 'ab+') as f:
+            # Start on a fresh line if the last append was torn, so only that line is lost
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    line = b'\n' + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self, ticker):
+        with open(self.path(f"{ticker}.pkl"), 'rb') as f:
+            return pickle.load(f)
+
+    def save_screen(self, valid_stocks):
+        write_atomic(self.path('screen.json'), json.dumps(valid_stocks, default=float).encode())
+
+    def load_screen(self):
+        """valid_stocks from an earlier screening pass of this run, or None"""
+        if not os.path.exists(self.path('screen.json')):
+            return None
+        with open(self.path('screen.json')) as f:
+            return json.load(f)
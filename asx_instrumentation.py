@@ -0,0 +1,232 @@
+import contextlib
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+RECORD_FIELDS = ['stage', 'ticker', 'seconds', 'rows', 'bytes', 'retries', 'peak_bytes', 'error']
+PROMETHEUS_COUNTERS = {
+    'seconds': 'Wall time spent in the stage',
+    'rows': 'Rows processed by the stage',
+    'bytes': 'Bytes of bar data fetched by the stage',
+    'retries': 'Transient-error retries in the stage',
+    'calls': 'Times the stage ran',
+    'errors': 'Stage runs that ended in an error',
+}
+
+
+def frame_bytes(frame):
+    """In-memory size of a bar frame, our stand-in for bytes downloaded (yfinance hides the payload size)"""
+    return int(frame.memory_usage(index=True).sum()) if frame is not None and len(frame) else 0
+
+
+class StageRecord(dict):
+    """One timed run of a stage, optionally for one ticker; callers fill in rows/bytes/retries/error"""
+
+    def add(self, rows=0, bytes=0, retries=0):
+        self['rows'] += rows
+        self['bytes'] += bytes
+        self['retries'] += retries
+
+
+class RunRecorder:
+    """Per-stage and per-ticker run metrics: wall time, rows, bytes, retries, peak memory, errors.
+
+    Wrap work in `with recorder.stage('fetch', ticker) as record:` and fill in
+    the record. Peak memory is tracked with tracemalloc only when track_memory
+    is set (it slows everything down); nested stages roll their peak up into
+    the enclosing one. tracemalloc's peak is process-wide, so memory is only
+    meaningful for stages run serially: any stage that overlaps a stage on
+    another thread gets peak_bytes None. Stages named in profile_stages also run under cProfile
+    and their stats are written next to the run report.
+    """
+
+    def __init__(self, run_name, track_memory=False, profile_stages=()):
+        self.run_name = run_name
+        self.track_memory = track_memory
+        self.profile_stages = set(profile_stages)
+        self.profiles = {}
+        self.records = []
+        self.started = datetime.now()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        # Threads with a stage open, and a count of stages opened while another thread had one
+        self.open_stages = {}
+        self.overlaps = 0
+        if track_memory:
+            self.enable_memory_tracking()
+
+    def enable_memory_tracking(self):
+        """Start tracking peak memory for stages opened from now on (for recorders created at import time)"""
+        self.track_memory = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def new_record(self, stage, ticker=None, **values):
+        record = StageRecord(stage=stage, ticker=ticker, seconds=0.0, rows=0, bytes=0, retries=0,
+                             peak_bytes=None, error=None)
+        record.update(values)
+        return record
+
+    def add(self, stage, ticker=None, **values):
+        """Record a stage that was timed elsewhere (e.g. inside the async pipeline)"""
+        record = self.new_record(stage, ticker, **values)
+        with self.lock:
+            self.records.append(record)
+        return record
+
+    def extend(self, records):
+        """Fold in records from another recorder, e.g. one living in a worker process"""
+        with self.lock:
+            self.records.extend(self.new_record(**record) for record in records)
+
+    @contextlib.contextmanager
+    def stage(self, stage, ticker=None):
+        record = self.new_record(stage, ticker)
+        memory_stack = self.local.__dict__.setdefault('memory_stack', [])
+        if self.track_memory:
+            overlaps = self.enter_memory_stage()
+            if memory_stack:
+                memory_stack[-1]['peak'] = max(memory_stack[-1]['peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            memory_stack.append({'peak': 0, 'overlaps': overlaps})
+        profiler = self.start_profile(stage)
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+            if self.track_memory:
+                entry = memory_stack.pop()
+                peak = max(entry['peak'], tracemalloc.get_traced_memory()[1])
+                if not self.exit_memory_stage(entry['overlaps']):
+                    record['peak_bytes'] = peak
+                if memory_stack:
+                    memory_stack[-1]['peak'] = max(memory_stack[-1]['peak'], peak)
+                tracemalloc.reset_peak()
+            with self.lock:
+                self.records.append(record)
+
+    def enter_memory_stage(self):
+        """Note a stage opening on this thread; returns the overlap count from before it"""
+        thread = threading.get_ident()
+        with self.lock:
+            overlaps = self.overlaps
+            if any(other != thread for other in self.open_stages):
+                self.overlaps += 1
+            self.open_stages[thread] = self.open_stages.get(thread, 0) + 1
+        return overlaps
+
+    def exit_memory_stage(self, overlaps):
+        """Note a stage closing on this thread; True when another thread's stages overlapped it"""
+        thread = threading.get_ident()
+        with self.lock:
+            self.open_stages[thread] -= 1
+            if not self.open_stages[thread]:
+                del self.open_stages[thread]
+            return self.overlaps != overlaps or bool(self.open_stages.keys() - {thread})
+
+    def start_profile(self, stage):
+        # One profiler per stage, re-enabled for every run; only one may be active at a time
+        if stage not in self.profile_stages or getattr(self.local, 'profiling', False):
+            return None
+        profiler = self.profiles.setdefault(stage, cProfile.Profile())
+        try:
+            profiler.enable()
+        except ValueError:
+            return None
+        return _ProfileHandle(profiler, self.local)
+
+    def wrap(self, stage):
+        """Decorator form of stage(), for timing (and optionally profiling) any function"""
+        def decorator(fn):
+            def wrapper(*args, **kwargs):
+                with self.stage(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stage_summary(self):
+        summary = {}
+        for record in self.records:
+            totals = summary.setdefault(record['stage'], {
+                'calls': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0, 'retries': 0, 'errors': 0, 'peak_bytes': None})
+            totals['calls'] += 1
+            for field in ('seconds', 'rows', 'bytes', 'retries'):
+                totals[field] += record[field]
+            totals['errors'] += record['error'] is not None
+            if record['peak_bytes'] is not None:
+                totals['peak_bytes'] = max(totals['peak_bytes'] or 0, record['peak_bytes'])
+        return summary
+
+    def slowest(self, stage, n=10):
+        ticker_records = [r for r in self.records if r['stage'] == stage and r['ticker'] is not None]
+        return sorted(ticker_records, key=lambda r: r['seconds'], reverse=True)[:n]
+
+    def report(self):
+        return {
+            'run': self.run_name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'stages': self.stage_summary(),
+            'slowest_tickers': {stage: self.slowest(stage) for stage in self.stage_summary()},
+            'records': self.records,
+        }
+
+    def prometheus_text(self):
+        labels = f'run="{self.run_name}"'
+        summary = self.stage_summary()
+        lines = []
+        for field, help_text in PROMETHEUS_COUNTERS.items():
+            name = f"asx_stage_{field}_total"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{{labels},stage="{stage}"}} {totals[field]}' for stage, totals in summary.items()]
+        lines += ["# HELP asx_stage_peak_bytes Peak traced memory during the stage",
+                  "# TYPE asx_stage_peak_bytes gauge"]
+        lines += [f'asx_stage_peak_bytes{{{labels},stage="{stage}"}} {totals["peak_bytes"]}'
+                  for stage, totals in summary.items() if totals['peak_bytes'] is not None]
+        lines += ["# HELP asx_ticker_stage_seconds Wall time per ticker and stage",
+                  "# TYPE asx_ticker_stage_seconds gauge"]
+        lines += [f'asx_ticker_stage_seconds{{{labels},stage="{r["stage"]}",ticker="{r["ticker"]}"}} {r["seconds"]:.6f}'
+                  for r in self.records if r['ticker'] is not None]
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, stem):
+        """Write stem.json and stem.prom (atomically, for a textfile collector) plus any stage profiles"""
+        paths = []
+        for path, text in ((f"{stem}.json", json.dumps(self.report(), indent=2, default=str)),
+                           (f"{stem}.prom", self.prometheus_text())):
+            with open(path + '.tmp', 'w') as f:
+                f.write(text)
+            os.replace(path + '.tmp', path)
+            paths.append(path)
+        for stage, profiler in self.profiles.items():
+            profiler.dump_stats(f"{stem}_{stage}.prof")
+            paths.append(f"{stem}_{stage}.prof")
+        return paths
+
+    def print_summary(self):
+        print(f"\nRun metrics ({self.run_name}):")
+        print(f"  {'Stage':<12} {'Calls':>6} {'Seconds':>9} {'Rows':>11} {'MB':>9} {'Retries':>8} {'Errors':>7}")
+        for stage, t in self.stage_summary().items():
+            print(f"  {stage:<12} {t['calls']:>6} {t['seconds']:>9.2f} {t['rows']:>11,} "
+                  f"{t['bytes'] / 2 ** 20:>9.1f} {t['retries']:>8} {t['errors']:>7}")
+
+
+class _ProfileHandle:
+    def __init__(self, profiler, local):
+        self.profiler = profiler
+        self.local = local
+        local.profiling = True
+
+    def disable(self):
+        self.profiler.disable()
+        self.local.profiling = False
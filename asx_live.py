@@ -0,0 +1,165 @@
+import asyncio
+import math
+import time
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from asx_calendar import ANALYSIS_TZ, session_calendar
+from asx_slots import MAX_ABS_RETURN_PCT, SLOT_MINUTES, slot_labels
+
+SignalUpdate = namedtuple('SignalUpdate', [
+    'ticker', 'timestamp', 'period', 'bars_in_slot', 'live_return_pct', 'historical_mean_pct',
+    'historical_std_pct', 'z_score', 'signal', 'historical_signal', 'latency_ms'
+])
+# |z| of the live slot mean against the historical one that counts as a departure from the usual pattern
+LIVE_Z_THRESHOLD = 2.0
+
+
+def live_signal(z_score, threshold=LIVE_Z_THRESHOLD):
+    if math.isnan(z_score):
+        return 'INSUFFICIENT_DATA'
+    if z_score >= threshold:
+        return 'ABOVE_HISTORY'
+    if z_score <= -threshold:
+        return 'BELOW_HISTORY'
+    return 'IN_LINE'
+
+
+class LiveSlotMonitor:
+    """Tracks the current session's per-slot bar returns against the historical slot distributions.
+
+    Built from the analyzer's long results frame. Each ingested bar updates its
+    ticker's running slot mean and returns a SignalUpdate comparing it with the
+    historical mean/std for that slot: the z-score of the live mean and a live
+    signal from it (see live_signal), alongside the slot's historical trading
+    signal. Bar returns follow prepare_returns, so the live numbers are on the
+    same footing as the history: a session's first bar is measured from its
+    open (skipped when no open is given) and returns of MAX_ABS_RETURN_PCT or
+    more are dropped. Bars are AWST wall-clock timestamps, the same convention
+    as the analyzer, placed on the session clock via the ASX calendar.
+    """
+
+    def __init__(self, results, timeframe='5min', slot_minutes=SLOT_MINUTES):
+        self.slot_minutes = slot_minutes
+        self.labels = slot_labels(slot_minutes)
+        history = results[results['Timeframe'] == timeframe]
+        slot_index = {label: i for i, label in enumerate(self.labels)}
+        self.history = {}
+        for ticker, rows in history.groupby('Ticker', sort=False):
+            codes = rows['Time_Period_ASX'].map(slot_index).to_numpy()
+            mean = np.full(len(self.labels), np.nan)
+            std = np.full(len(self.labels), np.nan)
+            signals = ['INSUFFICIENT_DATA'] * len(self.labels)
+            mean[codes] = rows['Avg_Return_%'].to_numpy()
+            std[codes] = rows['Std_Dev_%'].to_numpy()
+            for code, signal in zip(codes, rows['Trading_Signal']):
+                signals[code] = signal
+            self.history[ticker] = (mean.tolist(), std.tolist(), signals)
+        self.state = {}
+        self.session_opens = {}
+
+    def session_open(self, day):
+        """AWST wall-clock open of a trading day (None on holidays and weekends), looked up once per day"""
+        if day not in self.session_opens:
+            calendar = session_calendar()
+            opens = None
+            if calendar.is_trading_day(day):
+                opens = calendar.windows(day)['open'].tz_convert(ANALYSIS_TZ).tz_localize(None)
+            self.session_opens[day] = opens
+        return self.session_opens[day]
+
+    def reset_session(self):
+        self.state.clear()
+
+    def ingest(self, ticker, timestamp, close, open_price=None):
+        started = time.perf_counter()
+        history = self.history.get(ticker)
+        if history is None:
+            return None
+        opens = self.session_open(timestamp.date())
+        if opens is None:
+            return None
+        slot = int((timestamp - opens).total_seconds() // 60) // self.slot_minutes
+        if slot < 0 or slot >= len(self.labels):
+            return None
+        state = self.state.get(ticker)
+        day = (timestamp.year, timestamp.month, timestamp.day)
+        if state is None or state['day'] != day:
+            # First bar of the session: measured from its own open, so no overnight gap leaks in
+            state = self.state[ticker] = {'day': day, 'close': close, 'slot': -1, 'sum': 0.0, 'bars': 0}
+            reference = open_price if open_price is not None else float('nan')
+        else:
+            reference = state['close']
+            state['close'] = close
+        bar_return = (close / reference - 1) * 100
+        if math.isnan(bar_return) or abs(bar_return) >= MAX_ABS_RETURN_PCT:
+            return None
+        if slot != state['slot']:
+            state['slot'], state['sum'], state['bars'] = slot, 0.0, 0
+        state['sum'] += bar_return
+        state['bars'] += 1
+
+        mean, std, signals = history
+        live_mean = state['sum'] / state['bars']
+        hist_std = std[slot]
+        if hist_std and not math.isnan(hist_std):
+            z_score = (live_mean - mean[slot]) / (hist_std / math.sqrt(state['bars']))
+        else:
+            z_score = float('nan')
+        return SignalUpdate(ticker, timestamp, self.labels[slot], state['bars'], live_mean, mean[slot],
+                            hist_std, z_score, live_signal(z_score), signals[slot],
+                            (time.perf_counter() - started) * 1000)
+
+    def run(self, bars):
+        """Generator: consume (ticker, timestamp, close[, open]) bars, yield signal updates"""
+        for bar in bars:
+            update = self.ingest(*bar)
+            if update is not None:
+                yield update
+
+    async def run_async(self, bars):
+        """Async-iterator counterpart of run() for live feeds"""
+        async for bar in bars:
+            update = self.ingest(*bar)
+            if update is not None:
+                yield update
+
+
+def record_session(bars_by_ticker, path):
+    """Write {ticker: AWST bars} as one time-ordered session file for replay"""
+    frames = [bars[[c for c in ('Open', 'Close') if c in bars.columns]].assign(Ticker=ticker)
+              for ticker, bars in bars_by_ticker.items() if not bars.empty]
+    session = pd.concat(frames).rename_axis('Datetime').reset_index().sort_values(['Datetime', 'Ticker'], kind='stable')
+    if path.endswith('.parquet'):
+        session.to_parquet(path, index=False)
+    else:
+        session.to_csv(path, index=False)
+
+
+def load_session(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, parse_dates=['Datetime'])
+
+
+def replay_session(path, speed=60.0):
+    """Yield recorded bars in time order, sleeping real gaps divided by speed (None = as fast as possible)"""
+    session = load_session(path)
+    previous = None
+    opens = session['Open'] if 'Open' in session.columns else [None] * len(session)
+    for timestamp, ticker, close, open_price in zip(session['Datetime'], session['Ticker'], session['Close'], opens):
+        if speed and previous is not None and timestamp > previous:
+            time.sleep((timestamp - previous).total_seconds() / speed)
+        previous = timestamp
+        yield ticker, timestamp, close, open_price
+
+
+async def replay_session_async(path, speed=60.0):
+    session = load_session(path)
+    previous = None
+    opens = session['Open'] if 'Open' in session.columns else [None] * len(session)
+    for timestamp, ticker, close, open_price in zip(session['Datetime'], session['Ticker'], session['Close'], opens):
+        if speed and previous is not None and timestamp > previous:
+            await asyncio.sleep((timestamp - previous).total_seconds() / speed)
+        previous = timestamp
+        yield ticker, timestamp, close, open_price
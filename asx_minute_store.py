@@ -0,0 +1,176 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from asx_bar_cache import CachedBarProvider, YahooBarProvider, bars_since, normalize_bars
+
+# One fixed-width record per 1-minute bar; time is the bar start in UTC nanoseconds
+MINUTE_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                         ('close', '<f8'), ('volume', '<f8')])
+# One record per stored session: AWST trading date (days since 1970-01-01) and its [start, stop) bar rows
+DAY_DTYPE = np.dtype([('day', '<i4'), ('start', '<i8'), ('stop', '<i8')])
+FIELDS = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'}
+SESSION_TZ = 'Australia/Perth'
+
+
+def session_days(times):
+    """AWST trading date of each UTC-nanosecond timestamp, as days since the epoch"""
+    local = pd.DatetimeIndex(times, tz='UTC').tz_convert(SESSION_TZ).tz_localize(None)
+    return (local.values.astype('datetime64[D]').astype(np.int64)).astype(np.int32)
+
+
+def day_number(date):
+    return int(np.datetime64(pd.Timestamp(date).date(), 'D').astype(np.int64))
+
+
+class MinuteStore:
+    """Append-only, memory-mapped 1-minute OHLCV history, one pair of files per ticker.
+
+    root/<ticker>/bars.bin holds MINUTE_DTYPE records in time order and
+    root/<ticker>/days.bin a DAY_DTYPE row per session pointing into it.
+    Appends only ever add bars newer than the last stored one. Bars are
+    written before the day index that references them, so a crash leaves
+    unindexed trailing bars that the next append truncates away. Reads map
+    the files and slice them through the day index: nothing outside the
+    requested sessions is touched.
+    """
+
+    def __init__(self, root='minute_store'):
+        self.root = root
+
+    def path(self, ticker, name):
+        return os.path.join(self.root, ticker.replace('/', '_'), name)
+
+    def tickers(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(t for t in os.listdir(self.root) if os.path.exists(self.path(t, 'days.bin')))
+
+    def map(self, ticker, name, dtype, mode='r'):
+        path = self.path(ticker, name)
+        if not os.path.exists(path) or os.path.getsize(path) < dtype.itemsize:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode=mode, shape=os.path.getsize(path) // dtype.itemsize)
+
+    def days(self, ticker):
+        return self.map(ticker, 'days.bin', DAY_DTYPE)
+
+    def last_time(self, ticker):
+        """Start of the newest stored bar, or None"""
+        days = self.days(ticker)
+        if len(days) == 0:
+            return None
+        bars = self.map(ticker, 'bars.bin', MINUTE_DTYPE)
+        return pd.Timestamp(int(bars[days[-1]['stop'] - 1]['time']), tz='UTC')
+
+    def append(self, ticker, data):
+        """Add the bars newer than anything stored; returns how many were written"""
+        data = normalize_bars(data)
+        if data.empty:
+            return 0
+        times = data.index.tz_convert('UTC').tz_localize(None).values.astype('datetime64[ns]').astype(np.int64)
+        days = self.days(ticker)
+        stored = int(days[-1]['stop']) if len(days) else 0
+        if stored:
+            newer = times > int(self.map(ticker, 'bars.bin', MINUTE_DTYPE)[stored - 1]['time'])
+            data, times = data[newer], times[newer]
+        if len(times) == 0:
+            return 0
+        records = np.zeros(len(times), dtype=MINUTE_DTYPE)
+        records['time'] = times
+        for column, field in FIELDS.items():
+            if column in data.columns:
+                records[field] = data[column].to_numpy(dtype=np.float64)
+
+        os.makedirs(os.path.dirname(self.path(ticker, 'bars.bin')), exist_ok=True)
+        with open(self.path(ticker, 'bars.bin'), 'ab') as f:
+            f.truncate(stored * MINUTE_DTYPE.itemsize)
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        record_days = session_days(times)
+        new_days, first = np.unique(record_days, return_index=True)
+        entries = np.zeros(len(new_days), dtype=DAY_DTYPE)
+        entries['day'] = new_days
+        entries['start'] = stored + first
+        entries['stop'] = stored + np.append(first[1:], len(times))
+        with open(self.path(ticker, 'days.bin'), 'r+b' if len(days) else 'wb') as f:
+            if len(days) and days[-1]['day'] == new_days[0]:
+                # The newest stored session continued: extend its entry in place
+                f.seek((len(days) - 1) * DAY_DTYPE.itemsize)
+                entries[0]['start'] = days[-1]['start']
+            else:
+                f.seek(len(days) * DAY_DTYPE.itemsize)
+            f.write(entries.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        return len(times)
+
+    def read(self, ticker, start=None, end=None):
+        """Zero-copy MINUTE_DTYPE view of the sessions from start to end (AWST dates, inclusive)"""
+        days = self.days(ticker)
+        if len(days) == 0:
+            return np.empty(0, dtype=MINUTE_DTYPE)
+        first = 0 if start is None else np.searchsorted(days['day'], day_number(start), side='left')
+        last = len(days) if end is None else np.searchsorted(days['day'], day_number(end), side='right')
+        if first >= last:
+            return np.empty(0, dtype=MINUTE_DTYPE)
+        bars = self.map(ticker, 'bars.bin', MINUTE_DTYPE)
+        return bars[days[first]['start']:days[last - 1]['stop']]
+
+    def frame(self, ticker, start=None, end=None):
+        """read() as a bar-provider style DataFrame (UTC index); this copies only the selected slice"""
+        bars = self.read(ticker, start, end)
+        if len(bars) == 0:
+            return pd.DataFrame()
+        index = pd.DatetimeIndex(bars['time'], tz='UTC', name='Datetime')
+        return pd.DataFrame({column: bars[field] for column, field in FIELDS.items()}, index=index)
+
+    def update(self, ticker, bar_provider, period='7d'):
+        """Daily job: fetch the latest 1m bars Yahoo still serves and append the new sessions"""
+        return self.append(ticker, bar_provider.get_bars(ticker, '1m', period))
+
+
+class MinuteHistoryProvider:
+    """Serves '1m' bars from a MinuteStore (any history depth) and every other interval from `source`.
+
+    history_days limits how far back 1m requests reach; None serves the whole
+    store. Tickers the store has never seen fall back to the source.
+    """
+
+    def __init__(self, store, source=None, history_days=None):
+        self.store = store
+        self.source = source if source is not None else CachedBarProvider()
+        self.history_days = history_days
+
+    def get_bars(self, ticker, interval, period, start=None):
+        if interval != '1m' or self.store.last_time(ticker) is None:
+            return self.source.get_bars(ticker, interval, period, start)
+        if start is None and self.history_days is not None:
+            start = self.store.last_time(ticker) - pd.Timedelta(days=self.history_days)
+        if start is None:
+            return self.store.frame(ticker)
+        start = pd.Timestamp(start)
+        first_day = start.tz_convert(SESSION_TZ).date() if start.tz is not None else start.date()
+        return bars_since(self.store.frame(ticker, start=first_day), start)
+
+    def get_bars_batch(self, tickers, interval, period, start=None):
+        if interval != '1m':
+            return self.source.get_bars_batch(tickers, interval, period, start)
+        return {ticker: self.get_bars(ticker, interval, period, start) for ticker in tickers}
+
+
+if __name__ == "__main__":
+    from asx_universe import DEFAULT_UNIVERSE, universe_tickers
+    parser = argparse.ArgumentParser(description='Append the latest 1-minute sessions to the minute store')
+    parser.add_argument('--universe', default=DEFAULT_UNIVERSE)
+    parser.add_argument('--root', default='minute_store')
+    args = parser.parse_args()
+    store = MinuteStore(args.root)
+    provider = YahooBarProvider()
+    for ticker in universe_tickers(args.universe):
+        try:
+            print(f"  {ticker}: {store.update(ticker, provider)} new bars")
+        except Exception as e:
+            print(f"  {ticker}: update failed ({e})")
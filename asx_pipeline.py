@@ -0,0 +1,115 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from asx_instrumentation import frame_bytes
+
+# Errors worth retrying; anything else fails the ticker straight away
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError, OSError)
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter: at most `rate` acquisitions per second, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens=1):
+        if tokens > self.capacity:
+            raise ValueError(f"cannot acquire {tokens} tokens from a bucket of {self.capacity}")
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class FetchFailed(Exception):
+    """A fetch that gave up, carrying how many retries were made before it did"""
+
+    def __init__(self, error, retries):
+        super().__init__(str(error))
+        self.retries = retries
+
+
+async def fetch_with_backoff(fetch, ticker, bucket, max_retries=4, base_delay=0.5, max_delay=8.0, cost=1):
+    """Run a blocking fetch in a thread, retrying transient errors with jittered exponential backoff.
+
+    Each attempt takes `cost` tokens, one per provider request the fetch makes.
+    Returns (data, retries); raises FetchFailed with the retries actually made.
+    """
+    for attempt in range(max_retries + 1):
+        await bucket.acquire(cost)
+        try:
+            return await asyncio.to_thread(fetch, ticker), attempt
+        except TRANSIENT_ERRORS as e:
+            if attempt == max_retries:
+                raise FetchFailed(e, attempt) from e
+            delay = min(max_delay, base_delay * 2 ** attempt)
+            await asyncio.sleep(delay * (0.5 + random.random() / 2))
+        except Exception as e:
+            raise FetchFailed(e, attempt) from e
+
+
+async def run_pipeline(analyzer, tickers, concurrency=8, rate=5.0, max_retries=4, analysis_workers=1):
+    """Fetch tickers concurrently and analyze each one as soon as its bars arrive.
+
+    Returns {ticker: (stock_results, error, stats)} in ticker order, where stats
+    holds retries, fetch/analyze wall times and rows/bytes fetched.
+    """
+    # load_intraday_data makes one provider request per downloaded timeframe, and each counts against the rate
+    cost = analyzer.provider_requests()
+    bucket = TokenBucket(rate, capacity=max(rate, cost))
+    gate = asyncio.Semaphore(concurrency)
+    fetched = asyncio.Queue()
+    outcomes = {}
+    loop = asyncio.get_running_loop()
+    compute_pool = ThreadPoolExecutor(max_workers=analysis_workers)
+
+    async def fetch(ticker):
+        async with gate:
+            started = time.perf_counter()
+            try:
+                stock_data, retries = await fetch_with_backoff(analyzer.load_intraday_data, ticker, bucket,
+                                                               max_retries, cost=cost)
+                error = None
+            except FetchFailed as e:
+                stock_data, retries, error = None, e.retries, f"Data fetch failed: {e}"
+            stats = {'retries': retries, 'fetch_seconds': time.perf_counter() - started}
+            if stock_data:
+                stats['rows'] = sum(len(data) for data in stock_data.values())
+                stats['bytes'] = sum(frame_bytes(data) for data in stock_data.values())
+            await fetched.put((ticker, stock_data, error, stats))
+
+    async def analyze(ticker, stock_data, error, stats):
+        if error is None and not stock_data:
+            error = "Data fetch failed: insufficient data"
+        if error is not None:
+            outcomes[ticker] = (None, error, stats)
+            return
+        started = time.perf_counter()
+        errors = []
+        stock_results = await loop.run_in_executor(
+            compute_pool, analyzer.analyze_stock_tod_patterns, ticker, stock_data, errors)
+        stats['analyze_seconds'] = time.perf_counter() - started
+        if not stock_results:
+            error = "Pattern analysis failed" + (f" ({'; '.join(errors)})" if errors else "")
+        outcomes[ticker] = (stock_results or None, error, stats)
+
+    fetchers = [asyncio.create_task(fetch(ticker)) for ticker in tickers]
+    analyses = []
+    try:
+        for _ in tickers:
+            analyses.append(asyncio.create_task(analyze(*await fetched.get())))
+        await asyncio.gather(*fetchers, *analyses)
+    finally:
+        compute_pool.shutdown(wait=False)
+    return {ticker: outcomes[ticker] for ticker in tickers}
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import pandas as pd
+from openpyxl import Workbook
+
+REPORT_BACKENDS = ('xlsx', 'parquet', 'arrow')
+SUMMARY_SHEET = 'Executive_Summary'
+
+
+def ticker_sheet_name(ticker, timeframe):
+    # Excel caps sheet names at 31 characters
+    return f'{ticker.replace(".AX", "")}_{timeframe}'[:31]
+
+
+class XlsxReportWriter:
+    """Constant-memory xlsx report: each sheet is streamed to disk and closed as soon as it is written.
+
+    The executive summary is only known once every ticker is in, so its sheet
+    is reserved first and filled at close() to keep the original sheet order.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.summary_sheet = self.workbook.create_sheet(SUMMARY_SHEET)
+        self.summary_written = False
+
+    def fill_sheet(self, sheet, df):
+        sheet.append(list(df.columns))
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(list(row))
+        sheet.close()
+
+    def write_table(self, name, df):
+        if name == SUMMARY_SHEET:
+            self.fill_sheet(self.summary_sheet, df)
+            self.summary_written = True
+        else:
+            self.fill_sheet(self.workbook.create_sheet(name), df)
+
+    def write_ticker(self, ticker, stock_results):
+        for timeframe, df in stock_results.items():
+            self.write_table(ticker_sheet_name(ticker, timeframe), df)
+
+    def close(self):
+        if not self.summary_written:
+            self.workbook.remove(self.summary_sheet)
+        self.workbook.save(self.path)
+        return self.path
+
+    def discard(self):
+        self.close()
+        os.remove(self.path)
+
+
+class ColumnarReportWriter:
+    """Same tables as the workbook, one Parquet or Arrow IPC file each, plus an index.json in sheet order"""
+
+    def __init__(self, path, fmt='parquet'):
+        self.path = path
+        self.fmt = fmt
+        self.index = []
+        os.makedirs(path, exist_ok=True)
+
+    def write_table(self, name, df, **tags):
+        filename = f"{name}.{self.fmt}"
+        target = os.path.join(self.path, filename)
+        if self.fmt == 'parquet':
+            df.to_parquet(target, index=False)
+        else:
+            df.reset_index(drop=True).to_feather(target)
+        self.index.append({'sheet': name, 'file': filename, 'rows': len(df), 'columns': list(df.columns), **tags})
+
+    def write_ticker(self, ticker, stock_results):
+        for timeframe, df in stock_results.items():
+            self.write_table(ticker_sheet_name(ticker, timeframe), df, ticker=ticker, timeframe=timeframe)
+
+    def close(self):
+        # Executive summary leads the index, as it leads the workbook
+        order = sorted(self.index, key=lambda entry: entry['sheet'] != SUMMARY_SHEET)
+        with open(os.path.join(self.path, 'index.json'), 'w') as f:
+            json.dump({'format': self.fmt, 'sheets': order}, f, indent=2)
+        return self.path
+
+    def discard(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def open_report_writer(stem, backend='xlsx'):
+    """Report writer for `backend`: stem.xlsx, or a stem/ directory of Parquet/Arrow tables"""
+    if backend == 'xlsx':
+        return XlsxReportWriter(f"{stem}.xlsx")
+    if backend in ('parquet', 'arrow'):
+        return ColumnarReportWriter(stem, backend)
+    raise ValueError(f"Unknown report backend: {backend} (expected one of {REPORT_BACKENDS})")
+
+
+def load_report(path):
+    """Read a columnar report back as {sheet name: DataFrame} in sheet order"""
+    with open(os.path.join(path, 'index.json')) as f:
+        index = json.load(f)
+    reader = pd.read_parquet if index['format'] == 'parquet' else pd.read_feather
+    return {entry['sheet']: reader(os.path.join(path, entry['file'])) for entry in index['sheets']}
@@ -0,0 +1,27 @@
+import pandas as pd
+
+OHLCV_AGGREGATION = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Adj Close': 'last', 'Volume': 'sum'}
+
+
+def resample_bars(bars, rule):
+    """Aggregate OHLCV bars into coarser bars labelled by their start time.
+
+    Buckets are aligned to midnight of the bars' own timezone. ASX sessions open
+    on the hour, so every 15m/30m/1h bucket edge is also a session-aligned edge,
+    matching the bars Yahoo serves. Empty buckets (overnight, halts) are dropped.
+    """
+    if bars.empty:
+        return bars
+    aggregation = {column: how for column, how in OHLCV_AGGREGATION.items() if column in bars.columns}
+    resampled = bars.resample(rule, label='left', closed='left', origin='start_day').agg(aggregation)
+    return resampled.dropna(subset=['Close'])
+
+
+def splice_history(long_history, recent):
+    """Prefer locally derived bars where they exist and fall back to the long downloaded history before that"""
+    if recent.empty:
+        return long_history
+    if long_history.empty:
+        return recent
+    older = long_history[long_history.index < recent.index[0]]
+    return pd.concat([older, recent])
@@ -0,0 +1,359 @@
+import numpy as np
+import pandas as pd
+from asx_sector_matrix import SlotMatrix, sector_stats, slot_correlation, slot_ranks
+from asx_slots import AFTERNOON_SESSION_MINUTES, MORNING_SESSION_MINUTES, in_session_window
+
+
+def build_results_frame(all_results):
+    """Flatten {ticker: {timeframe: DataFrame}} into one long table, one row per (ticker, timeframe, slot)"""
+    frames = [df for stock_results in all_results.values() for df in stock_results.values()]
+    if not frames:
+        return pd.DataFrame(columns=['Ticker', 'Timeframe', 'Time_Period_ASX', 'Avg_Return_%', 'Observations'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def grade(values, thresholds, labels, default):
+    return np.select([values > t for t in thresholds], labels, default)
+
+
+def period_returns(frame, window):
+    return frame['Avg_Return_%'].where(in_session_window(frame['Time_Period_ASX'], window))
+
+
+def executive_summary(frame, valid_stocks):
+    returns = frame['Avg_Return_%']
+    by_ticker = frame.groupby('Ticker', sort=False)
+    best = frame.loc[by_ticker['Avg_Return_%'].idxmax()].set_index('Ticker')
+    worst = frame.loc[by_ticker['Avg_Return_%'].idxmin()].set_index('Ticker')
+    tickers = best.index
+    window_mean = lambda window: period_returns(frame, window).groupby(frame['Ticker']).mean().reindex(tickers).fillna(0)
+    avg_morning = window_mean(MORNING_SESSION_MINUTES)
+    avg_afternoon = window_mean(AFTERNOON_SESSION_MINUTES)
+    total_swing = avg_afternoon - avg_morning
+    total_obs = by_ticker['Observations'].sum().reindex(tickers)
+    consistency = frame[returns.abs() > 0.1].groupby('Ticker')['Time_Period_ASX'].nunique().reindex(tickers).fillna(0)
+    info = pd.DataFrame.from_dict(valid_stocks, orient='index').reindex(tickers)
+    summary = pd.DataFrame({
+        'Ticker': tickers,
+        'Company': info['name'].values,
+        'Current_Price_$': info['current_price'].values,
+        'Avg_Daily_Volume': info['avg_volume'].values,
+        'Total_Time_Periods_Analyzed': by_ticker.size().reindex(tickers).values,
+        'Total_Observations': total_obs.values,
+        'Best_Time_Period_ASX': best['Time_Period_ASX'].values,
+        'Best_Period_Return_%': best['Avg_Return_%'].round(4).values,
+        'Worst_Time_Period_ASX': worst['Time_Period_ASX'].values,
+        'Worst_Period_Return_%': worst['Avg_Return_%'].round(4).values,
+        'Intraday_Range_%': (best['Avg_Return_%'] - worst['Avg_Return_%']).round(4).values,
+        'Average_Morning_Return_%': avg_morning.round(4).values,
+        'Average_Afternoon_Return_%': avg_afternoon.round(4).values,
+        'Morning_Afternoon_Swing_%': total_swing.round(4).values,
+        'Morning_Dip_Strength': grade(-avg_morning, [0.15, 0.08, 0], ['STRONG', 'MODERATE', 'WEAK'], 'NONE'),
+        'Afternoon_Rally_Strength': grade(avg_afternoon, [0.15, 0.08, 0], ['STRONG', 'MODERATE', 'WEAK'], 'NONE'),
+        'Pattern_Consistency': consistency.astype(int).values,
+        'Trading_Strategy_Viability': grade(total_swing, [0.3, 0.15], ['HIGH', 'MEDIUM'], 'LOW'),
+        'Recommended_Entry_Time': worst['Time_Period_ASX'].values,
+        'Recommended_Exit_Time': best['Time_Period_ASX'].values,
+        'Expected_Swing_%': total_swing.round(4).values,
+        'Risk_Level': grade(worst['Avg_Return_%'].abs(), [0.5, 0.2], ['HIGH', 'MEDIUM'], 'LOW'),
+        'Position_Size_Recommendation': grade(total_swing, [0.5, 0.25], ['10%', '5%'], '2%'),
+        'Data_Quality_Score': grade(total_obs, [1000, 500], ['EXCELLENT', 'GOOD'], 'FAIR'),
+    })
+    return summary.sort_values('Morning_Afternoon_Swing_%', ascending=False)
+
+
+def pattern_reliability(count, std):
+    return np.select([(count >= 5) & (std < 0.3), count >= 3], ['HIGH', 'MEDIUM'], 'LOW')
+
+
+def sector_summary(frame, trading_signal, min_stocks=3):
+    if frame.empty:
+        return pd.DataFrame()
+    stats = sector_stats(SlotMatrix(frame))
+    keep = stats['count'][0] >= min_stocks
+    count, weighted_return, std = stats['count'][0][keep], stats['weighted_return'][0][keep], stats['std'][0][keep]
+    summary = pd.DataFrame({
+        'Time_Period_ASX': stats['periods'][keep],
+        'Sector_Weighted_Return_%': weighted_return.round(5),
+        'Stocks_Confirming_Pattern': count,
+        'Total_Observations': stats['total_obs'][0][keep],
+        'Return_Standard_Deviation': std.round(4),
+        'Strongest_Stock': stats['strongest'][0][keep],
+        'Weakest_Stock': stats['weakest'][0][keep],
+        'Sector_Trading_Signal': [trading_signal(r, n) for r, n in zip(weighted_return, count)],
+        'Pattern_Reliability': pattern_reliability(count, std),
+    })
+    return summary.sort_values('Sector_Weighted_Return_%', ascending=False)
+
+
+def subsector_summary(frame, sectors, min_stocks=3, by_timeframe=True):
+    """Sector_TimeOfDay_Summary per sub-sector (and timeframe), with each sub-sector's rank among its peers"""
+    if frame.empty or not sectors:
+        return pd.DataFrame()
+    stats = sector_stats(SlotMatrix(frame), sectors, by_timeframe)
+    names = stats['groups'] if by_timeframe else [(name, 'ALL') for name in stats['groups']]
+    groups = pd.DataFrame(names, columns=['Sector', 'Timeframe'])
+    weighted_return = np.where(stats['count'] >= min_stocks, stats['weighted_return'], np.nan)
+    # Rank sub-sectors against each other within the same timeframe and slot
+    ranks = np.full_like(weighted_return, np.nan)
+    for rows in groups.groupby('Timeframe', sort=False).indices.values():
+        ranks[rows] = slot_ranks(weighted_return[rows])
+    group_rows, slot_columns = np.nonzero(~np.isnan(weighted_return))
+    count = stats['count'][group_rows, slot_columns]
+    std = stats['std'][group_rows, slot_columns]
+    return pd.DataFrame({
+        'Sector': groups['Sector'].values[group_rows],
+        'Timeframe': groups['Timeframe'].values[group_rows],
+        'Time_Period_ASX': stats['periods'][slot_columns],
+        'Sector_Weighted_Return_%': weighted_return[group_rows, slot_columns].round(5),
+        'Stocks_Confirming_Pattern': count,
+        'Total_Observations': stats['total_obs'][group_rows, slot_columns],
+        'Return_Standard_Deviation': std.round(4),
+        'Strongest_Stock': stats['strongest'][group_rows, slot_columns],
+        'Weakest_Stock': stats['weakest'][group_rows, slot_columns],
+        'Rank_Among_Sectors': ranks[group_rows, slot_columns].astype(int),
+        'Pattern_Reliability': pattern_reliability(count, std),
+    })
+
+
+def slot_correlation_table(frame):
+    """Slot-to-slot correlation of series returns, one row and column per period"""
+    if frame.empty:
+        return pd.DataFrame()
+    corr = slot_correlation(SlotMatrix(frame)).round(4)
+    return corr.rename_axis('Time_Period_ASX').reset_index()
+
+
+def best_opportunities(frame, valid_stocks, min_abs_return=0.08):
+    candidates = frame[frame['Avg_Return_%'].abs() > min_abs_return]
+    if candidates.empty:
+        return pd.DataFrame()
+    by_ticker = candidates.groupby('Ticker', sort=False)
+    best = candidates.loc[candidates['Avg_Return_%'].abs().groupby(candidates['Ticker'], sort=False).idxmax()]
+    worst = candidates.loc[by_ticker['Avg_Return_%'].idxmin()]
+    best, worst = best.set_index('Ticker'), worst.set_index('Ticker').reindex(best['Ticker'])
+    info = pd.DataFrame.from_dict(valid_stocks, orient='index').reindex(best.index)
+    min_obs = np.minimum(worst['Observations'].values, best['Observations'].values)
+    summary = pd.DataFrame({
+        'Ticker': best.index,
+        'Company': info['name'].values,
+        'Current_Price_$': info['current_price'].values,
+        'Best_Entry_Time_ASX': worst['Time_Period_ASX'].values,
+        'Entry_Expected_Return_%': worst['Avg_Return_%'].round(4).values,
+        'Best_Exit_Time_ASX': best['Time_Period_ASX'].values,
+        'Exit_Expected_Return_%': best['Avg_Return_%'].round(4).values,
+        'Total_Expected_Swing_%': (best['Avg_Return_%'] - worst['Avg_Return_%']).round(4).values,
+        'Entry_Observations': worst['Observations'].values,
+        'Exit_Observations': best['Observations'].values,
+        'Strategy_Confidence': np.where(min_obs > 20, 'HIGH', 'MEDIUM'),
+        'Risk_Reward_Ratio': (best['Avg_Return_%'].abs() / worst['Avg_Return_%'].abs().clip(lower=0.01)).round(2).values,
+    })
+    return summary.sort_values('Total_Expected_Swing_%', ascending=False)
+
+
+def stock_opportunities(frame, valid_stocks):
+    by_ticker = frame.groupby('Ticker', sort=False)
+    best = frame.loc[by_ticker['Avg_Return_%'].idxmax()].set_index('Ticker')
+    worst = frame.loc[by_ticker['Avg_Return_%'].idxmin()].set_index('Ticker')
+    min_obs = np.minimum(best['Observations'].values, worst['Observations'].values)
+    prices = pd.Series({t: info['current_price'] for t, info in valid_stocks.items()})
+    opportunities = pd.DataFrame({
+        'ticker': best.index,
+        'entry_time': worst['Time_Period_ASX'].values,
+        'exit_time': best['Time_Period_ASX'].values,
+        'swing': (best['Avg_Return_%'] - worst['Avg_Return_%']).values,
+        'price': prices.reindex(best.index).values,
+        'quality': grade(min_obs, [50, 20], ['EXCELLENT', 'GOOD'], 'FAIR'),
+    })
+    return opportunities.sort_values('swing', ascending=False, kind='stable')
+
+
+def sector_period_returns(frame):
+    """Unweighted mean slot return and contributing-row count per period, in first-seen order"""
+    if frame.empty:
+        return pd.DataFrame({'return': pd.Series(dtype=float), 'stocks': pd.Series(dtype=np.int64)})
+    stats = sector_stats(SlotMatrix(frame))
+    return pd.DataFrame({'return': stats['mean_return'][0], 'stocks': stats['count'][0]},
+                        index=pd.Index(stats['periods'], name='Time_Period_ASX'))
+
+
+def stock_swing_summary(frame, valid_stocks):
+    by_ticker = frame.groupby('Ticker', sort=False)['Avg_Return_%']
+    swings = pd.DataFrame({'best_return': by_ticker.max(), 'worst_return': by_ticker.min()})
+    swings['swing'] = swings['best_return'] - swings['worst_return']
+    swings['price'] = [valid_stocks[t]['current_price'] for t in swings.index]
+    return swings
+
+
+# Column layout of the compact store: name -> (dtype, decimals the analyzer rounds to)
+NUMERIC_COLUMNS = {
+    'Avg_Return_%': (np.float32, 5),
+    'Median_Return_%': (np.float32, 5),
+    'Std_Dev_%': (np.float32, 5),
+    'Min_Return_%': (np.float32, 5),
+    'Max_Return_%': (np.float32, 5),
+    'Observations': (np.int32, None),
+    'Positive_Returns': (np.int32, None),
+    'Negative_Returns': (np.int32, None),
+    'Win_Rate_%': (np.float32, 2),
+    # Bar volumes can pass float32's exact-integer range
+    'Avg_Volume': (np.float64, 0),
+    'Volume_Ratio_vs_Daily': (np.float32, 3),
+}
+KEY_COLUMNS = ['Ticker', 'Timeframe', 'Time_Period_ASX']
+LABEL_COLUMNS = ['Volatility_Rank', 'Pattern_Strength', 'Trading_Signal']
+RESULT_COLUMNS = KEY_COLUMNS + list(NUMERIC_COLUMNS) + LABEL_COLUMNS
+# Only present when the analyzer ran the significance engine; appended after the labels
+SIGNIFICANCE_COLUMNS = {
+    'P_Value': (np.float32, 5),
+    'P_Adjusted': (np.float32, 5),
+    'CI_Low_%': (np.float32, 5),
+    'CI_High_%': (np.float32, 5),
+}
+
+
+class SlotResults:
+    """Array-backed replacement for {ticker: {timeframe: DataFrame}}.
+
+    Keys and labels are stored as int32 codes into small category lists and the
+    statistics as float32/int32 arrays, one row per (ticker, timeframe, slot).
+    It still behaves like the old dict (items(), [ticker], len, in) and
+    to_frame() gives the long-format table used for reporting.
+    """
+
+    def __init__(self):
+        self.categories = {column: [] for column in KEY_COLUMNS + LABEL_COLUMNS}
+        self.category_codes = {column: {} for column in KEY_COLUMNS + LABEL_COLUMNS}
+        self.chunks = []
+        self.columns = None
+        self.ticker_rows = {}
+        self.row_index = None
+        self.version = 0
+        self.has_significance = False
+
+    def encode(self, column, values):
+        codes = self.category_codes[column]
+        categories = self.categories[column]
+        for value in dict.fromkeys(values):
+            if value not in codes:
+                codes[value] = len(categories)
+                categories.append(value)
+        return np.array([codes[v] for v in values], dtype=np.int32)
+
+    def __setitem__(self, ticker, stock_results):
+        if ticker in self.ticker_rows:
+            raise KeyError(f"{ticker} already stored")
+        frame = build_results_frame({ticker: stock_results})
+        chunk = {column: self.encode(column, frame[column].to_numpy()) for column in KEY_COLUMNS + LABEL_COLUMNS}
+        for column, (dtype, _) in NUMERIC_COLUMNS.items():
+            chunk[column] = frame[column].to_numpy(dtype=dtype)
+        for column, (dtype, _) in SIGNIFICANCE_COLUMNS.items():
+            if column in frame.columns:
+                chunk[column] = frame[column].to_numpy(dtype=dtype)
+                self.has_significance = True
+            else:
+                chunk[column] = np.full(len(frame), np.nan, dtype=dtype)
+        self.chunks.append(chunk)
+        self.ticker_rows[ticker] = None
+        self.columns = None
+        self.version += 1
+
+    def extend(self, other):
+        """Append another store's rows (e.g. from a worker process) without rebuilding DataFrames"""
+        overlap = set(self.ticker_rows).intersection(other.ticker_rows)
+        if overlap:
+            raise KeyError(f"{sorted(overlap)} already stored")
+        theirs = other.consolidate()
+        chunk = {}
+        for column in KEY_COLUMNS + LABEL_COLUMNS:
+            remap = self.encode(column, other.categories[column])
+            chunk[column] = remap[theirs[column]]
+        for column in list(NUMERIC_COLUMNS) + list(SIGNIFICANCE_COLUMNS):
+            chunk[column] = theirs[column]
+        self.has_significance |= other.has_significance
+        self.chunks.append(chunk)
+        self.ticker_rows.update(dict.fromkeys(other.ticker_rows))
+        self.columns = None
+        self.version += 1
+
+    def row_count(self):
+        return sum(len(chunk['Ticker']) for chunk in self.chunks)
+
+    def consolidate(self):
+        if self.columns is None:
+            if self.chunks:
+                self.columns = {c: np.concatenate([chunk[c] for chunk in self.chunks]) for c in self.chunks[0]}
+            else:
+                self.columns = {c: np.empty(0, dtype=np.int32) for c in KEY_COLUMNS + LABEL_COLUMNS}
+                numeric = {**NUMERIC_COLUMNS, **SIGNIFICANCE_COLUMNS}
+                self.columns.update({c: np.empty(0, dtype=d) for c, (d, _) in numeric.items()})
+            self.chunks = [self.columns]
+            # Group rows by ticker code in one stable sort instead of a scan per ticker
+            codes = self.columns['Ticker']
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(self.categories['Ticker']) + 1))
+            for ticker in self.ticker_rows:
+                code = self.category_codes['Ticker'][ticker]
+                self.ticker_rows[ticker] = order[bounds[code]:bounds[code + 1]]
+            self.row_index = None
+        return self.columns
+
+    def decode(self, column, rows=None):
+        codes = self.consolidate()[column]
+        return np.array(self.categories[column], dtype=object)[codes if rows is None else codes[rows]]
+
+    def to_frame(self, rows=None):
+        columns = self.consolidate()
+        data = {}
+        numeric = {**NUMERIC_COLUMNS, **SIGNIFICANCE_COLUMNS}
+        columns_out = RESULT_COLUMNS + (list(SIGNIFICANCE_COLUMNS) if self.has_significance else [])
+        for column in columns_out:
+            if column in numeric:
+                dtype, decimals = numeric[column]
+                values = columns[column] if rows is None else columns[column][rows]
+                if decimals is None:
+                    data[column] = values.astype(np.int64)
+                else:
+                    data[column] = np.round(values.astype(np.float64), decimals)
+            else:
+                data[column] = self.decode(column, rows)
+        return pd.DataFrame(data, columns=columns_out)
+
+    def lookup(self, ticker, timeframe, period):
+        """One result row as a dict, via a (ticker, timeframe, slot) hash index"""
+        if self.row_index is None:
+            keys = zip(*(self.decode(column) for column in KEY_COLUMNS))
+            self.row_index = {key: row for row, key in enumerate(keys)}
+        return self.to_frame([self.row_index[(ticker, timeframe, period)]]).iloc[0].to_dict()
+
+    def __getitem__(self, ticker):
+        self.consolidate()
+        frame = self.to_frame(self.ticker_rows[ticker])
+        return {tf: df.reset_index(drop=True) for tf, df in frame.groupby('Timeframe', sort=False)}
+
+    def __contains__(self, ticker):
+        return ticker in self.ticker_rows
+
+    def __iter__(self):
+        return iter(list(self.ticker_rows))
+
+    def __len__(self):
+        return len(self.ticker_rows)
+
+    def keys(self):
+        return list(self.ticker_rows)
+
+    def items(self):
+        return ((ticker, self[ticker]) for ticker in self)
+
+    def values(self):
+        return (self[ticker] for ticker in self)
+
+    def nbytes(self):
+        return sum(values.nbytes for values in self.consolidate().values())
+
+    def __getstate__(self):
+        self.consolidate()
+        state = dict(self.__dict__)
+        state['row_index'] = None
+        return state
@@ -0,0 +1,35 @@
+import pandas as pd
+
+
+def screen_universe(bar_provider, universe, min_price=0.10, min_avg_volume=0, min_avg_turnover=0,
+                    period='5d', batch_size=100):
+    """Screen a {ticker: name} universe on daily bars pulled in multi-symbol batches.
+
+    Returns one row per ticker with current price, average volume, average
+    turnover and a Passed flag, in universe order. Tickers with no data have
+    NaN prices and never pass; averages cover only the bars a ticker has.
+    """
+    tickers = list(universe)
+    daily = {}
+    for start in range(0, len(tickers), batch_size):
+        daily.update(bar_provider.get_bars_batch(tickers[start:start + batch_size], '1d', period))
+
+    closes = {t: bars['Close'] for t, bars in daily.items() if not bars.empty and 'Close' in bars}
+    volumes = {t: bars['Volume'] for t, bars in daily.items() if not bars.empty and 'Volume' in bars}
+    close = pd.DataFrame(closes).reindex(columns=tickers)
+    # Averages run over each ticker's own bars; days before listing or after delisting are not zero-volume days
+    volume = pd.DataFrame(volumes).reindex(index=close.index, columns=tickers).fillna(0).where(close.notna())
+
+    screen = pd.DataFrame({
+        'name': pd.Series(universe),
+        'current_price': close.ffill().iloc[-1] if len(close) else float('nan'),
+        'avg_volume': volume.mean() if len(volume) else 0.0,
+        'avg_turnover': (close * volume).mean() if len(close) else float('nan'),
+    }, index=tickers)
+    screen['avg_volume'] = screen['avg_volume'].fillna(0.0)
+    screen['Passed'] = (
+        (screen['current_price'] > min_price) &
+        (screen['avg_volume'] >= min_avg_volume) &
+        (screen['avg_turnover'].fillna(0) >= min_avg_turnover)
+    )
+    return screen
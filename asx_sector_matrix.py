@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+ALL_STOCKS = 'ALL'
+
+
+class SlotMatrix:
+    """Dense series x slot view of the long results table.
+
+    One row per (ticker, timeframe) series in first-seen order, one column per
+    slot period in first-seen order. `returns` holds Avg_Return_% (NaN where the
+    series has no such slot) and `weights` the matching Observations (0 where
+    missing), so sector aggregates reduce to matrix products against a
+    group-membership matrix instead of per-period Python loops.
+    """
+
+    def __init__(self, frame):
+        series = pd.MultiIndex.from_arrays([frame['Ticker'], frame['Timeframe']])
+        row_codes, series = pd.factorize(series)
+        col_codes, periods = pd.factorize(frame['Time_Period_ASX'])
+        self.tickers = np.asarray(series.get_level_values(0), dtype=object)
+        self.timeframes = np.asarray(series.get_level_values(1), dtype=object)
+        self.periods = np.asarray(periods, dtype=object)
+        shape = (len(series), len(periods))
+        self.returns = np.full(shape, np.nan)
+        self.weights = np.zeros(shape)
+        self.returns[row_codes, col_codes] = frame['Avg_Return_%'].to_numpy(dtype=np.float64)
+        self.weights[row_codes, col_codes] = frame['Observations'].to_numpy(dtype=np.float64)
+        self.mask = ~np.isnan(self.returns)
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def membership(self, groups=None, by_timeframe=False):
+        """(group names, groups x series 0/1 matrix) for {name: tickers}; None means one group of every series.
+
+        Groups may overlap (a ticker can sit in several sub-sectors). With
+        by_timeframe each group is split per timeframe and named (group, timeframe).
+        """
+        if groups is None:
+            groups = {ALL_STOCKS: self.tickers}
+        names, rows = [], []
+        for name, tickers in groups.items():
+            in_group = np.isin(self.tickers, list(tickers))
+            if not by_timeframe:
+                names.append(name)
+                rows.append(in_group)
+                continue
+            for timeframe in pd.unique(self.timeframes):
+                names.append((name, timeframe))
+                rows.append(in_group & (self.timeframes == timeframe))
+        return names, np.array(rows, dtype=np.float64).reshape(len(rows), len(self))
+
+
+def extreme_rows(matrix, membership, largest=True):
+    """Row index of each group's largest (or smallest) return per slot; first row wins ties, -1 if empty"""
+    fill = -np.inf if largest else np.inf
+    members = (membership[:, :, None] > 0) & matrix.mask[None]
+    values = np.where(members, matrix.returns[None], fill)
+    rows = values.argmax(axis=1) if largest else values.argmin(axis=1)
+    return np.where(members.any(axis=1), rows, -1)
+
+
+def sector_stats(matrix, groups=None, by_timeframe=False):
+    """Every sector aggregate for every group and slot in one pass, as groups x slots arrays.
+
+    count: series with the slot; total_obs and weighted_return: Observations-
+    weighted mean; mean_return: unweighted mean; std: population std of the
+    series returns; strongest/weakest: ticker with the highest/lowest return.
+    """
+    names, membership = matrix.membership(groups, by_timeframe)
+    returns = np.where(matrix.mask, matrix.returns, 0.0)
+    present = matrix.mask.astype(np.float64)
+    count = membership @ present
+    total_obs = membership @ matrix.weights
+    # Centre each slot on its overall mean first so the one-pass variance keeps its precision
+    centre = np.divide(returns.sum(axis=0), present.sum(axis=0), out=np.zeros(returns.shape[1]),
+                       where=present.sum(axis=0) > 0)
+    centred = np.where(matrix.mask, matrix.returns - centre, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weighted_return = (membership @ (returns * matrix.weights)) / total_obs
+        mean_return = (membership @ returns) / count
+        centred_mean = (membership @ centred) / count
+        variance = (membership @ centred ** 2) / count - centred_mean ** 2
+    strongest = extreme_rows(matrix, membership, largest=True)
+    weakest = extreme_rows(matrix, membership, largest=False)
+    tickers = np.append(matrix.tickers, None)
+    return {
+        'groups': names,
+        'periods': matrix.periods,
+        'count': count.astype(np.int64),
+        'total_obs': total_obs.astype(np.int64),
+        'weighted_return': weighted_return,
+        'mean_return': mean_return,
+        'std': np.sqrt(np.clip(variance, 0, None)),
+        'strongest': tickers[strongest],
+        'weakest': tickers[weakest],
+    }
+
+
+def slot_ranks(values):
+    """Cross-sectional rank of each row within each column (1 = highest); NaNs stay NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    order = np.argsort(np.where(np.isnan(values), np.inf, -values), axis=0, kind='stable')
+    ranks = np.empty_like(values)
+    np.put_along_axis(ranks, order, np.arange(1, len(values) + 1, dtype=np.float64)[:, None], axis=0)
+    return np.where(np.isnan(values), np.nan, ranks)
+
+
+def slot_correlation(matrix):
+    """Slot-to-slot Pearson correlation across series, pairwise-complete like DataFrame.corr()"""
+    present = matrix.mask.astype(np.float64)
+    values = np.where(matrix.mask, matrix.returns, 0.0)
+    n = present.T @ present
+    sum_x = values.T @ present
+    sum_xx = (values ** 2).T @ present
+    sum_xy = values.T @ values
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = n * sum_xy - sum_x * sum_x.T
+        scale = np.sqrt((n * sum_xx - sum_x ** 2) * (n * sum_xx - sum_x ** 2).T)
+        corr = np.where(n >= 2, covariance / scale, np.nan)
+    return pd.DataFrame(np.clip(corr, -1, 1), index=matrix.periods, columns=matrix.periods)
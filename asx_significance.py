@@ -0,0 +1,83 @@
+import zlib
+import numpy as np
+import pandas as pd
+from asx_slots import SLOT_MINUTES, slot_codes
+
+SIGNIFICANCE_ALPHA = 0.05
+
+
+def padded_slot_returns(data_work, slot_minutes=SLOT_MINUTES, min_observations=3):
+    """Slot codes plus a (slots x max_n) zero-padded return matrix and its 0/1 mask"""
+    codes = slot_codes(data_work, slot_minutes)
+    returns = data_work['returns'].to_numpy(dtype=np.float64)
+    in_grid = codes >= 0
+    codes, returns = codes[in_grid], returns[in_grid]
+    slots, counts = np.unique(codes, return_counts=True)
+    keep = counts >= min_observations
+    slots, counts = slots[keep], counts[keep]
+    values = np.zeros((len(slots), counts.max() if len(slots) else 0))
+    mask = np.zeros_like(values)
+    for row, slot in enumerate(slots):
+        slot_returns = returns[codes == slot]
+        values[row, :len(slot_returns)] = slot_returns
+        mask[row, :len(slot_returns)] = 1
+    return slots, values, mask
+
+
+def benjamini_hochberg(p_values):
+    """BH false-discovery-rate adjusted p-values (NaNs are left out and stay NaN)"""
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full_like(p_values, np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    if len(valid) == 0:
+        return adjusted
+    order = valid[np.argsort(p_values[valid])]
+    ranked = p_values[order] * len(valid) / np.arange(1, len(valid) + 1)
+    adjusted[order] = np.minimum(np.minimum.accumulate(ranked[::-1])[::-1], 1.0)
+    return adjusted
+
+
+def slot_significance(data_work, slot_minutes=SLOT_MINUTES, n_resamples=10000, confidence=0.95,
+                      chunk_size=2000, seed=0, min_observations=3):
+    """Permutation p-values and bootstrap CIs for every slot mean of one series, all slots at once.
+
+    p_value is a two-sided sign-flip test of mean == 0; the CI is a percentile
+    Poisson bootstrap of the mean. Each chunk of resamples is one random
+    (chunk x max_n) matrix shared by all slots, so a whole chunk reduces to a
+    matrix product against the padded slot returns; chunk_size bounds memory.
+    p_adjusted applies Benjamini-Hochberg across the series' slots.
+    Indexed by slot code like slot_statistics.
+    """
+    slots, values, mask = padded_slot_returns(data_work, slot_minutes, min_observations)
+    columns = ['p_value', 'p_adjusted', 'ci_low', 'ci_high']
+    if len(slots) == 0:
+        return pd.DataFrame(columns=columns, dtype=float)
+    rng = np.random.default_rng(seed)
+    counts = mask.sum(axis=1)
+    observed = np.abs(values.sum(axis=1))
+    extreme = np.zeros(len(slots))
+    boot_means = np.empty((n_resamples, len(slots)))
+
+    for start in range(0, n_resamples, chunk_size):
+        size = min(chunk_size, n_resamples - start)
+        signs = rng.integers(0, 2, (size, values.shape[1])) * 2.0 - 1.0
+        # Tiny tolerance so ties with the observed statistic count as extreme
+        extreme += (np.abs(signs @ values.T) >= observed * (1 - 1e-12)).sum(axis=0)
+        weights = rng.poisson(1.0, (size, values.shape[1])).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            boot_means[start:start + size] = (weights @ values.T) / (weights @ mask.T)
+
+    tail = (1 - confidence) / 2 * 100
+    p_values = (extreme + 1) / (n_resamples + 1)
+    ci_low, ci_high = np.nanpercentile(boot_means, [tail, 100 - tail], axis=0)
+    return pd.DataFrame({
+        'p_value': p_values,
+        'p_adjusted': benjamini_hochberg(p_values),
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+    }, index=pd.Index(slots, name='slot'))
+
+
+def series_seed(ticker, timeframe, seed=0):
+    """Stable per-series seed so results do not depend on processing order or worker count"""
+    return [seed, zlib.crc32(f"{ticker}|{timeframe}".encode())]
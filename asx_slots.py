@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from asx_calendar import CLOSE_MINUTE, OPEN_MINUTE, session_calendar
+
+# Slot grid on the session clock: minute 0 is the 10:00 open (Sydney time), SLOT_MINUTES slots to the 16:00 close.
+# Labels read as exchange time, so 10:00-10:15 is always the first slot whatever the AWST offset that day.
+SESSION_START_MINUTE = OPEN_MINUTE
+SESSION_END_MINUTE = CLOSE_MINUTE
+SLOT_MINUTES = 15
+# Bar returns at or beyond this size (in %) are treated as bad ticks and left out
+MAX_ABS_RETURN_PCT = 25
+# Slot sizes a resolution sweep covers; each tiles the session exactly
+SLOT_RESOLUTIONS = (5, 10, 15, 30, 60)
+# Parts of the session the morning/afternoon summaries compare, as [start, end) minutes of session:
+# the first two hours after the open and the last two before the close
+MORNING_SESSION_MINUTES = (0, 120)
+AFTERNOON_SESSION_MINUTES = (240, 360)
+
+
+def minute_label(minute):
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def slot_labels(slot_minutes=SLOT_MINUTES):
+    starts = range(SESSION_START_MINUTE, SESSION_END_MINUTE, slot_minutes)
+    return [f"{minute_label(s)}-{minute_label(min(s + slot_minutes, SESSION_END_MINUTE))}" for s in starts]
+
+
+def period_start_minutes(periods):
+    """Minute of session each 'HH:MM-HH:MM' slot label starts at"""
+    starts = pd.Series(periods, dtype=object).str.slice(0, 5).str.split(':', expand=True)
+    if starts.empty:
+        return np.empty(0, dtype=int)
+    return (starts[0].astype(int) * 60 + starts[1].astype(int) - SESSION_START_MINUTE).to_numpy()
+
+
+def in_session_window(periods, window):
+    """Slot labels that start inside a [start, end) minutes-of-session window"""
+    minutes = period_start_minutes(periods)
+    return (minutes >= window[0]) & (minutes < window[1])
+
+
+def slot_of_minute(minutes, slot_minutes=SLOT_MINUTES):
+    """Slot code for minutes-of-session, -1 outside trading hours"""
+    minutes = np.asarray(minutes)
+    return np.where(minutes >= 0, minutes // slot_minutes, -1)
+
+
+def assign_slots(index, slot_minutes=SLOT_MINUTES):
+    """Integer slot code per bar, -1 outside the session.
+
+    Bars are placed by the session calendar's minute of session, labelled by
+    their start time, so slots are half-open: with 15-minute slots 10:00-10:15
+    holds bars starting in the first 15 minutes of trading.
+    """
+    return slot_of_minute(session_calendar().minute_of_session(index), slot_minutes)
+
+
+def slot_codes(data_work, slot_minutes=SLOT_MINUTES):
+    """assign_slots, reusing the minute of session prepare_returns already worked out"""
+    if 'minute_of_session' in data_work.columns:
+        return slot_of_minute(data_work['minute_of_session'].to_numpy(), slot_minutes)
+    return assign_slots(data_work.index, slot_minutes)
+
+
+def prepare_returns(data, max_abs_return=MAX_ABS_RETURN_PCT):
+    """Session-aware bar % returns with the analyzer's usual outlier filter.
+
+    One calendar pass places every bar in its session. Bars outside trading
+    hours are dropped and returns restart each session: the first bar of a
+    session is measured from its own open rather than the previous day's
+    close, so the overnight gap never lands in the opening slot. The gap is
+    kept apart in 'overnight' (that open against the previous session's last
+    close, NaN on other bars or when the previous session is missing).
+    """
+    position = session_calendar().locate(data.index)
+    trading = position.minute >= 0
+    data_work = data[trading].copy()
+    session = position.session[trading]
+    close = data_work['Close']
+    previous_close = close.shift(1)
+    first_bar = np.r_[True, session[1:] != session[:-1]]
+    after_previous_session = np.r_[False, session[1:] == session[:-1] + 1]
+    opens = data_work['Open'] if 'Open' in data_work.columns else pd.Series(np.nan, index=data_work.index)
+    returns = np.where(first_bar, close / opens - 1, close / previous_close - 1) * 100
+    overnight = np.where(first_bar & after_previous_session, opens / previous_close - 1, np.nan) * 100
+    data_work['returns'] = returns
+    data_work['overnight'] = overnight
+    data_work['session'] = session
+    data_work['minute_of_session'] = position.minute[trading]
+    data_work = data_work.dropna(subset=list(data.columns) + ['returns'])
+    return data_work[abs(data_work['returns']) < max_abs_return]
+
+
+def slot_statistics(data_work, slot_minutes=SLOT_MINUTES, min_observations=3):
+    """Every per-slot statistic in one grouped aggregation, indexed by slot code"""
+    returns = data_work['returns']
+    codes = pd.Series(slot_codes(data_work, slot_minutes), index=data_work.index, name='slot')
+    frame = pd.DataFrame({
+        'returns': returns,
+        'positive': returns > 0,
+        'negative': returns < 0,
+        'volume': data_work['Volume'] if 'Volume' in data_work.columns else 0.0,
+    })[codes.values >= 0]
+    grouped = frame.groupby(codes[codes.values >= 0])
+    stats = grouped['returns'].agg(['mean', 'median', 'std', 'min', 'max', 'count'])
+    stats['positive'] = grouped['positive'].sum()
+    stats['negative'] = grouped['negative'].sum()
+    stats['avg_volume'] = grouped['volume'].mean()
+    if 'Volume' in data_work.columns:
+        stats['volume_ratio'] = stats['avg_volume'] / max(data_work['Volume'].mean(), 1)
+    else:
+        stats['volume_ratio'] = 1.0
+    stats = stats[stats['count'] >= min_observations]
+    labels = np.array(slot_labels(slot_minutes))
+    stats['period'] = labels[stats.index.values]
+    return stats
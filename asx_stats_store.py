@@ -0,0 +1,300 @@
+import functools
+import math
+import os
+import numpy as np
+import pandas as pd
+from asx_bar_cache import CACHE_FORMAT, read_frame, write_frame
+from asx_calendar import session_calendar, utc_nanoseconds
+from asx_slots import SLOT_MINUTES, SLOT_RESOLUTIONS, prepare_returns, slot_codes, slot_labels
+
+SLOT_KEY = ['ticker', 'timeframe', 'slot']
+SERIES_KEY = ['ticker', 'timeframe']
+SLOT_COLUMNS = ['count', 'mean', 'm2', 'min', 'max', 'positive', 'negative', 'volume_sum']
+SERIES_COLUMNS = ['rows', 'volume_sum', 'volume_count', 'last_timestamp']
+
+
+def accumulate(data_work, slot_minutes=SLOT_MINUTES):
+    """Per-slot Welford accumulators for one batch of prepared returns"""
+    returns = data_work['returns']
+    codes = slot_codes(data_work, slot_minutes)
+    in_grid = codes >= 0
+    frame = pd.DataFrame({
+        'slot': codes[in_grid],
+        'returns': returns.values[in_grid],
+        'volume': data_work['Volume'].values[in_grid] if 'Volume' in data_work.columns else 0.0,
+    })
+    grouped = frame.groupby('slot')
+    acc = grouped['returns'].agg(['count', 'mean', 'min', 'max'])
+    deviations = frame['returns'] - frame['slot'].map(acc['mean'])
+    acc['m2'] = (deviations ** 2).groupby(frame['slot']).sum()
+    acc['positive'] = (frame['returns'] > 0).groupby(frame['slot']).sum()
+    acc['negative'] = (frame['returns'] < 0).groupby(frame['slot']).sum()
+    acc['volume_sum'] = grouped['volume'].sum()
+    return acc[SLOT_COLUMNS]
+
+
+def completed_sessions(bars, now=None):
+    """Bars of the sessions whose closing auction has finished by `now` (default: the current time).
+
+    An in-progress session's last bar and resampled buckets are still
+    changing, so they are left for a later update.
+    """
+    now = pd.Timestamp.now(tz='UTC') if now is None else now
+    calendar = session_calendar()
+    position = calendar.locate(bars.index)
+    ends = calendar.auction_end_ns[np.maximum(position.session, 0)]
+    return bars[(position.session >= 0) & (ends <= utc_nanoseconds([now])[0])]
+
+
+def merge_accumulators(left, right):
+    """Chan et al. pairwise merge of two accumulator frames sharing an index"""
+    index = left.index.union(right.index)
+    a = left.reindex(index)
+    b = right.reindex(index)
+    na, nb = a['count'].fillna(0), b['count'].fillna(0)
+    n = na + nb
+    delta = b['mean'].fillna(0) - a['mean'].fillna(0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(na == 0, b['mean'], np.where(nb == 0, a['mean'], a['mean'] + delta * nb / n))
+        m2 = a['m2'].fillna(0) + b['m2'].fillna(0) + np.where((na > 0) & (nb > 0), delta ** 2 * na * nb / n, 0)
+    return pd.DataFrame({
+        'count': n,
+        'mean': mean,
+        'm2': m2,
+        'min': np.fmin(a['min'], b['min']),
+        'max': np.fmax(a['max'], b['max']),
+        'positive': a['positive'].fillna(0) + b['positive'].fillna(0),
+        'negative': a['negative'].fillna(0) + b['negative'].fillna(0),
+        'volume_sum': a['volume_sum'].fillna(0) + b['volume_sum'].fillna(0),
+    }, index=index)
+
+
+def rollup_accumulators(acc, base_minutes, resolutions):
+    """Accumulators indexed by base_minutes slot code, combined onto coarser grids and indexed by (slot_minutes, slot).
+
+    Coarse slots are whole runs of base slots, so counts, sums and extremes
+    just add up and mean/m2 combine with the same pairwise formula as
+    merge_accumulators; no bar is looked at again. Every resolution is
+    rolled up in the same vectorised pass.
+    """
+    for slot_minutes in resolutions:
+        if slot_minutes % base_minutes:
+            raise ValueError(f"{slot_minutes}-minute slots cannot be built from {base_minutes}-minute slots")
+    base_slots = acc.index.values.astype(int)
+    width = base_slots.max() + 1 if len(base_slots) else 1
+    sizes = np.repeat(np.asarray(resolutions), len(base_slots))
+    tagged = np.repeat(np.arange(len(resolutions)), len(base_slots)) * width
+    keys, coarse = np.unique(tagged + np.tile(base_slots, len(resolutions)) * base_minutes // sizes,
+                             return_inverse=True)
+    column = lambda name: np.tile(acc[name].to_numpy(dtype=float), len(resolutions))
+    total = lambda values: np.bincount(coarse, weights=values, minlength=len(keys))
+    count, mean = column('count'), column('mean')
+    rolled_count = total(count)
+    rolled_mean = total(count * mean) / rolled_count
+    low, high = np.full(len(keys), np.inf), np.full(len(keys), -np.inf)
+    np.minimum.at(low, coarse, column('min'))
+    np.maximum.at(high, coarse, column('max'))
+    index = pd.MultiIndex.from_arrays([np.asarray(resolutions)[keys // width], keys % width],
+                                      names=['slot_minutes', 'slot'])
+    return pd.DataFrame({
+        'count': rolled_count,
+        'mean': rolled_mean,
+        'm2': total(column('m2')) + total(count * (mean - rolled_mean[coarse]) ** 2),
+        'min': low,
+        'max': high,
+        'positive': total(column('positive')),
+        'negative': total(column('negative')),
+        'volume_sum': total(column('volume_sum')),
+    }, index=index)
+
+
+def accumulator_statistics(acc, volume_mean=None, min_observations=3):
+    """asx_slots.slot_statistics columns (medians NaN, no period) from accumulators, keeping acc's index.
+
+    volume_mean is the series' average bar volume, None when it has no volume.
+    """
+    acc = acc[acc['count'] >= min_observations]
+    count = acc['count'].to_numpy(dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_volume = acc['volume_sum'].to_numpy() / count if volume_mean is not None else np.zeros(len(acc))
+        stats = pd.DataFrame({
+            'mean': acc['mean'].to_numpy(),
+            'median': np.nan,
+            'std': np.sqrt(acc['m2'].to_numpy() / (count - 1)),
+            'min': acc['min'].to_numpy(),
+            'max': acc['max'].to_numpy(),
+            'count': count.astype(int),
+            'positive': acc['positive'].to_numpy().astype(int),
+            'negative': acc['negative'].to_numpy().astype(int),
+            'avg_volume': avg_volume,
+            'volume_ratio': avg_volume / max(volume_mean, 1) if volume_mean is not None else 1.0,
+        }, index=acc.index)
+    return stats
+
+
+def multi_resolution_statistics(data_work, resolutions=SLOT_RESOLUTIONS, min_observations=3, medians=True):
+    """Slot statistics at every resolution from one pass over prepared returns, indexed by (slot_minutes, slot).
+
+    The bars are accumulated once on the finest grid that tiles every
+    resolution (their gcd) and each resolution is rolled up from that.
+    Medians are not decomposable, so with medians=True they take one extra
+    grouped pass over the returns column, all resolutions stacked together.
+    """
+    base = functools.reduce(math.gcd, resolutions)
+    acc = accumulate(data_work, base)
+    rolled = rollup_accumulators(acc, base, resolutions)
+    volume_mean = data_work['Volume'].mean() if 'Volume' in data_work.columns else None
+    stats = accumulator_statistics(rolled, volume_mean, min_observations)
+    sizes = stats.index.get_level_values('slot_minutes')
+    slots = stats.index.get_level_values('slot').astype(int)
+    labels = {slot_minutes: slot_labels(slot_minutes) for slot_minutes in resolutions}
+    stats['period'] = [labels[m][slot] for m, slot in zip(sizes, slots)]
+    if medians and len(stats):
+        # Offset each resolution's codes by its position so one groupby covers them all
+        width = len(labels[base])
+        position = {slot_minutes: i for i, slot_minutes in enumerate(resolutions)}
+        codes = np.concatenate([position[m] * width + slot_codes(data_work, m) for m in resolutions])
+        returns = np.tile(data_work['returns'].to_numpy(), len(resolutions))
+        keys = sizes.map(position).to_numpy() * width + slots.to_numpy()
+        stats['median'] = pd.Series(returns).groupby(codes).median().reindex(keys).values
+    return stats
+
+
+class SlotStatsStore:
+    """Persisted, mergeable per-(ticker, timeframe, slot) return statistics.
+
+    update() ingests only bars newer than the last one seen for a series, so a
+    daily run touches one session per ticker while history keeps accumulating
+    past Yahoo's 7d/60d windows. Mean, std, min/max, win counts and volume
+    ratio match the batch path; medians are not mergeable and are left NaN.
+    Only completed sessions are folded in, so a run during trading hours
+    never freezes a partial bar.
+    Accumulators are held per series, so an update only touches its own
+    series' slots. The slot size is saved with the store and a store is never
+    reopened at a different one.
+    """
+
+    def __init__(self, root=None, slot_minutes=SLOT_MINUTES):
+        self.root = root
+        self.slot_minutes = slot_minutes
+        # (ticker, timeframe) -> accumulators indexed by slot code
+        self.accumulators = {}
+        # (ticker, timeframe) -> running totals plus the last bar seen, which seeds the next return
+        self.series = {}
+        if root is not None and os.path.isdir(root):
+            self.load()
+
+    @property
+    def slots(self):
+        """Every series' accumulators as one (ticker, timeframe, slot) frame"""
+        if not self.accumulators:
+            return pd.DataFrame(columns=SLOT_COLUMNS, index=pd.MultiIndex.from_tuples([], names=SLOT_KEY), dtype=float)
+        return pd.concat(self.accumulators, names=SLOT_KEY)
+
+    def path(self, name, fmt=CACHE_FORMAT):
+        return os.path.join(self.root, f"{name}.{fmt}")
+
+    def load(self):
+        for fmt in ('parquet', 'pkl'):
+            if os.path.exists(self.path('slots', fmt)):
+                slots = read_frame(self.path('slots', fmt))
+                series = read_frame(self.path('series', fmt))
+                if 'slot_minutes' in series.columns and len(series):
+                    stored = int(series['slot_minutes'].iloc[0])
+                    if stored != self.slot_minutes:
+                        raise ValueError(f"{self.root} holds {stored}-minute slots, not {self.slot_minutes}-minute")
+                for key, acc in slots.groupby(level=SERIES_KEY, sort=False):
+                    self.accumulators[key] = acc.droplevel(SERIES_KEY)
+                bar_columns = [c for c in series.columns if c.startswith('bar_')]
+                for key, row in series.iterrows():
+                    last_bar = row[bar_columns].dropna()
+                    last_bar.index = [c[len('bar_'):] for c in last_bar.index]
+                    self.series[key] = {c: row[c] for c in SERIES_COLUMNS}
+                    self.series[key]['last_bar'] = last_bar.astype(float)
+                return
+
+    def save(self):
+        rows = {}
+        for key, totals in self.series.items():
+            row = {c: totals[c] for c in SERIES_COLUMNS}
+            row['slot_minutes'] = self.slot_minutes
+            row.update({f"bar_{c}": v for c, v in totals['last_bar'].items()})
+            rows[key] = row
+        series = pd.DataFrame.from_dict(rows, orient='index')
+        series.index = pd.MultiIndex.from_tuples(list(rows), names=SERIES_KEY)
+        write_frame(self.path('slots'), self.slots)
+        write_frame(self.path('series'), series)
+
+    def update(self, ticker, timeframe, bars, now=None):
+        """Fold bars of completed sessions newer than the stored high-water mark; returns rows added"""
+        bars = completed_sessions(bars, now)
+        key = (ticker, timeframe)
+        previous = self.series.get(key)
+        new_bars = bars
+        if previous is not None:
+            new_bars = bars[bars.index > previous['last_timestamp']]
+            # Re-attach the last stored bar so the first new bar gets its return
+            seed = pd.DataFrame([previous['last_bar'].reindex(bars.columns)], index=[previous['last_timestamp']])
+            new_bars = pd.concat([seed, new_bars]) if not new_bars.empty else new_bars
+        if new_bars.empty:
+            return 0
+        data_work = prepare_returns(new_bars)
+        if previous is not None:
+            # The seed bar was counted by an earlier update
+            data_work = data_work[data_work.index > previous['last_timestamp']]
+
+        acc = accumulate(data_work, self.slot_minutes).astype(float)
+        self.accumulators[key] = merge_accumulators(self.accumulators[key], acc) if key in self.accumulators else acc
+
+        has_volume = 'Volume' in data_work.columns
+        totals = {
+            'rows': len(data_work),
+            'volume_sum': float(data_work['Volume'].sum()) if has_volume else 0.0,
+            'volume_count': len(data_work) if has_volume else 0,
+            'last_timestamp': new_bars.index[-1],
+            'last_bar': new_bars.iloc[-1].astype(float),
+        }
+        if previous is not None:
+            for column in ('rows', 'volume_sum', 'volume_count'):
+                totals[column] += previous[column]
+        self.series[key] = totals
+        return len(data_work)
+
+    def merge(self, other):
+        """Fold another store (e.g. a different shard) into this one"""
+        if other.slot_minutes != self.slot_minutes:
+            raise ValueError(f"cannot merge {other.slot_minutes}-minute slots into {self.slot_minutes}-minute slots")
+        for key, theirs in other.accumulators.items():
+            mine = self.accumulators.get(key)
+            self.accumulators[key] = merge_accumulators(mine, theirs.astype(float)) if mine is not None else theirs
+        for key, theirs in other.series.items():
+            mine = self.series.get(key)
+            if mine is None:
+                self.series[key] = dict(theirs)
+                continue
+            latest = mine if mine['last_timestamp'] >= theirs['last_timestamp'] else theirs
+            merged = {column: mine[column] + theirs[column] for column in ('rows', 'volume_sum', 'volume_count')}
+            merged.update(last_timestamp=latest['last_timestamp'], last_bar=latest['last_bar'])
+            self.series[key] = merged
+        return self
+
+    def slot_statistics(self, ticker, timeframe, min_rows=20, min_observations=3, slot_minutes=None):
+        """Same columns as asx_slots.slot_statistics, computed from the accumulators.
+
+        slot_minutes (a multiple of the store's own slot size) rolls the
+        stored slots up to a coarser grid.
+        """
+        series = self.series.get((ticker, timeframe))
+        if series is None or series['rows'] < min_rows:
+            return pd.DataFrame()
+        acc = self.accumulators.get((ticker, timeframe), pd.DataFrame(columns=SLOT_COLUMNS, dtype=float))
+        slot_minutes = slot_minutes or self.slot_minutes
+        acc = rollup_accumulators(acc, self.slot_minutes, [slot_minutes]).droplevel('slot_minutes')
+        volume_mean = series['volume_sum'] / series['volume_count'] if series['volume_count'] > 0 else None
+        stats = accumulator_statistics(acc, volume_mean, min_observations)
+        stats.index = stats.index.astype(int)
+        stats['period'] = np.array(slot_labels(slot_minutes))[stats.index.values]
+        return stats.sort_index()
+
+    def timeframes(self, ticker):
+        return [timeframe for t, timeframe in self.series if t == ticker]
@@ -0,0 +1,127 @@
+import zlib
+import numpy as np
+import pandas as pd
+from asx_bar_cache import bars_since, period_to_timedelta
+from asx_calendar import CLOSE_MINUTE, EARLY_CLOSE_MINUTE, EXCHANGE_TZ, OPEN_MINUTE, session_calendar
+from asx_resample import resample_bars
+
+# Fixed default end date so the same seed always gives the same bars
+DEFAULT_END = '2025-06-27'
+# The ASX session, minutes after midnight Sydney time
+SESSION_OPEN_MINUTE = OPEN_MINUTE
+SESSION_CLOSE_MINUTE = CLOSE_MINUTE
+INTERVAL_MINUTES = {'1m': 1, '2m': 2, '5m': 5, '15m': 15, '30m': 30, '60m': 60, '1h': 60}
+
+
+def synthetic_universe(n_tickers):
+    """{ticker: name} for n synthetic tickers, named like ASX codes"""
+    return {f"S{i:04d}.AX": f"Synthetic Resources {i}" for i in range(n_tickers)}
+
+
+def ticker_profile(ticker, seed=0):
+    """Per-ticker parameters shared by every interval, so 1m/5m/1h bars describe the same stock"""
+    rng = np.random.default_rng([seed, zlib.crc32(ticker.encode())])
+    return {
+        'start_price': float(np.exp(rng.normal(np.log(2.0), 1.5))),
+        'daily_vol_pct': float(np.exp(rng.normal(np.log(2.5), 0.4))),
+        # Mean return per 15-minute slot, % -- the time-of-day pattern the analysis should find
+        'slot_drift_pct': rng.normal(0, 0.02, (SESSION_CLOSE_MINUTE - SESSION_OPEN_MINUTE) // 15),
+        'volume_per_minute': float(np.exp(rng.normal(np.log(2000), 1.0))),
+        'gap_prob': 0.03,
+        'halt_prob': 0.02,
+    }
+
+
+def session_dates(end, days):
+    """ASX trading days among the `days` calendar days ending at `end`"""
+    end = pd.Timestamp(end).normalize()
+    return session_calendar().trading_days(end - pd.Timedelta(days=days - 1), end)
+
+
+def synthetic_bars(ticker, interval, days, end=DEFAULT_END, seed=0):
+    """OHLCV bars for `days` calendar days of ASX sessions, indexed in Sydney time like Yahoo.
+
+    Sessions follow the ASX calendar: 10:00-16:00 Sydney time on trading days,
+    closing at 14:00 on Christmas Eve and New Year's Eve.
+    Returns carry the ticker's per-slot drift, volatility and volume follow a
+    U-curve across the session, some sessions open with an overnight gap and
+    some lose a block of bars to a trading halt.
+    """
+    if interval == '1d':
+        intraday = synthetic_bars(ticker, '30m', days, end, seed)
+        return resample_bars(intraday, '1D')
+    step = INTERVAL_MINUTES[interval]
+    profile = ticker_profile(ticker, seed)
+    rng = np.random.default_rng([seed, zlib.crc32(ticker.encode()), step])
+    dates = session_dates(end, days)
+    minutes = np.arange(SESSION_OPEN_MINUTE, SESSION_CLOSE_MINUTE, step)
+    n_days, n_bars = len(dates), len(minutes)
+    if n_days == 0:
+        return pd.DataFrame()
+
+    # U-curve: 0 at midday, 1 at the open and close
+    half = (SESSION_CLOSE_MINUTE - SESSION_OPEN_MINUTE) / 2
+    u_curve = ((minutes + step / 2 - SESSION_OPEN_MINUTE - half) / half) ** 2
+    bar_sigma = profile['daily_vol_pct'] / 100 * np.sqrt(step / (2 * half)) * (0.7 + 0.6 * u_curve)
+    drift = profile['slot_drift_pct'][(minutes - SESSION_OPEN_MINUTE) // 15] / 100 * step / 15
+    returns = drift + bar_sigma * rng.standard_normal((n_days, n_bars))
+
+    gaps = np.zeros((n_days, n_bars))
+    gaps[:, 0] = rng.normal(0, profile['daily_vol_pct'] / 200, n_days)
+    jumps = rng.random(n_days) < profile['gap_prob']
+    gaps[jumps, 0] += rng.choice([-1, 1], jumps.sum()) * rng.uniform(0.03, 0.08, jumps.sum())
+
+    log_close = np.log(profile['start_price']) + np.cumsum((gaps + returns).ravel())
+    close = np.exp(log_close)
+    open_ = np.exp(log_close - returns.ravel())
+    wick = np.exp(np.abs(rng.standard_normal(close.size)) * np.tile(bar_sigma, n_days) / 2)
+    high = np.maximum(open_, close) * wick
+    low = np.minimum(open_, close) / wick
+    volume = np.round(profile['volume_per_minute'] * step * (0.6 + 1.4 * np.tile(u_curve, n_days))
+                      * np.exp(rng.normal(0, 0.5, close.size)))
+
+    keep = np.ones((n_days, n_bars), dtype=bool)
+    early = (dates.month == 12) & np.isin(dates.day, [24, 31])
+    keep[np.ix_(early, minutes >= EARLY_CLOSE_MINUTE)] = False
+    for day in np.flatnonzero(rng.random(n_days) < profile['halt_prob']):
+        start = rng.integers(0, n_bars)
+        keep[day, start:start + max(1, rng.integers(30, 120) // step)] = False
+    keep = keep.ravel()
+
+    stamps = (np.repeat(dates.values, n_bars)
+              + np.tile(minutes, n_days).astype('timedelta64[m]'))
+    index = pd.DatetimeIndex(stamps[keep]).tz_localize(EXCHANGE_TZ).rename('Datetime')
+    return pd.DataFrame({
+        'Open': open_[keep], 'High': high[keep], 'Low': low[keep], 'Close': close[keep],
+        'Adj Close': close[keep], 'Volume': volume[keep],
+    }, index=index)
+
+
+class SyntheticBarProvider:
+    """Seeded synthetic bars behind the bar-provider interface, for benchmarks and offline runs.
+
+    `days` overrides the requested intraday period so stages can be timed on longer
+    histories than Yahoo serves; bars_served counts rows handed out.
+    """
+
+    def __init__(self, seed=0, days=None, end=DEFAULT_END):
+        self.seed = seed
+        self.days = days
+        self.end = end
+        self.bars_served = 0
+
+    def cache_identity(self):
+        return (type(self).__name__, self.seed, self.days, str(self.end))
+
+    def get_bars(self, ticker, interval, period, start=None):
+        days = period_to_timedelta(period).days
+        if self.days and interval != '1d':
+            days = self.days
+        data = synthetic_bars(ticker, interval, days, self.end, self.seed)
+        if start is not None:
+            data = bars_since(data, start)
+        self.bars_served += len(data)
+        return data
+
+    def get_bars_batch(self, tickers, interval, period, start=None):
+        return {ticker: self.get_bars(ticker, interval, period, start) for ticker in tickers}
@@ -1,8 +1,4 @@
-#  List of active, liquid ASX mining/resource stocks (2025)
-TOP_ASX_MINING = [
-    'BHP.AX', 'RIO.AX', 'FMG.AX', 'MIN.AX', 'IGO.AX', 
-    'PLS.AX', 'LTR.AX', 'S32.AX', 'NST.AX', 'EVN.AX',
-    'WHC.AX', 'SYR.AX', 'PDN.AX', 'BOE.AX', 'CXO.AX',
-    'RMS.AX', 'RRL.AX', 'SBM.AX', 'GOR.AX', 'RSG.AX',
-    'AZJ.AX', 'LYC.AX', 'DRE.AX', 'SYA.AX', 'LKE.AX'
-]
\ No newline at end of file
+from asx_universe import universe_tickers
+
+#  Active, liquid ASX mining/resource stocks: the universe file's 'top' tag
+TOP_ASX_MINING = universe_tickers(tag='top')
@@ -0,0 +1,124 @@
+import argparse
+import csv
+import os
+import zlib
+import pandas as pd
+
+UNIVERSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'universes')
+DEFAULT_UNIVERSE = os.path.join(UNIVERSE_DIR, 'asx_mining.csv')
+UNIVERSE_COLUMNS = ['ticker', 'name', 'sector', 'tags']
+# GICS industry groups in the ASX company list that make up the resources universe
+RESOURCE_INDUSTRY_GROUPS = ('Materials', 'Energy')
+
+
+def read_universe(path=DEFAULT_UNIVERSE):
+    """Universe file as a DataFrame: one row per ticker with its sector and ';'-separated tags"""
+    universe = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = set(UNIVERSE_COLUMNS[:3]) - set(universe.columns)
+    if missing:
+        raise ValueError(f"{path}: universe file is missing columns {sorted(missing)}")
+    if 'tags' not in universe.columns:
+        universe['tags'] = ''
+    universe = universe[UNIVERSE_COLUMNS]
+    duplicated = universe['ticker'][universe['ticker'].duplicated()]
+    if len(duplicated):
+        raise ValueError(f"{path}: tickers listed twice: {sorted(duplicated)}")
+    return universe
+
+
+def has_tag(universe, tag):
+    return universe['tags'].str.split(';').apply(lambda tags: tag in tags)
+
+
+def load_universe(path=DEFAULT_UNIVERSE, tag=None):
+    """{sector: {ticker: name}} in file order, optionally only the tickers carrying `tag`"""
+    universe = read_universe(path)
+    if tag is not None:
+        universe = universe[has_tag(universe, tag)]
+    sectors = {}
+    for row in universe.itertuples(index=False):
+        sectors.setdefault(row.sector, {})[row.ticker] = row.name
+    return sectors
+
+
+def flatten_sectors(sectors):
+    """{sector: {ticker: name}} -> {ticker: name}"""
+    return {ticker: name for stocks in sectors.values() for ticker, name in stocks.items()}
+
+
+def universe_tickers(path=DEFAULT_UNIVERSE, tag=None):
+    return list(flatten_sectors(load_universe(path, tag)))
+
+
+def write_universe(sectors, path, tags=None):
+    """Write {sector: {ticker: name}} as a universe file; tags maps ticker -> list of tags"""
+    tags = tags or {}
+    with open(path + '.tmp', 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(UNIVERSE_COLUMNS)
+        for sector, stocks in sectors.items():
+            for ticker, name in stocks.items():
+                writer.writerow([ticker, name, sector, ';'.join(tags.get(ticker, []))])
+    os.replace(path + '.tmp', path)
+
+
+def load_asx_listed(path, industry_groups=RESOURCE_INDUSTRY_GROUPS):
+    """{GICS industry group: {ticker: name}} from the ASX's ASXListedCompanies.csv download.
+
+    The file opens with an "ASX listed companies as at ..." line and a blank
+    line before the "Company name,ASX code,GICS industry group" header. Pass
+    industry_groups=None to keep the whole exchange.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        lines = f.read().splitlines()
+    header = next((i for i, line in enumerate(lines) if line.startswith('Company name')), None)
+    if header is None:
+        raise ValueError(f"{path}: not an ASX listed companies file (no 'Company name' header)")
+    sectors = {}
+    for row in csv.DictReader(lines[header:]):
+        group = (row.get('GICS industry group') or '').strip() or 'Not Applic'
+        if industry_groups is not None and group not in industry_groups:
+            continue
+        code = row['ASX code'].strip().upper()
+        if code:
+            sectors.setdefault(group, {})[f"{code}.AX"] = row['Company name'].strip()
+    return sectors
+
+
+def shard_of(ticker, n_shards):
+    """Deterministic shard for a ticker: crc32, so the split never depends on file order or PYTHONHASHSEED"""
+    return zlib.crc32(ticker.encode()) % n_shards
+
+
+def shard_sectors(sectors, shard, n_shards):
+    """The slice of {sector: {ticker: name}} that belongs to one shard; sectors left empty are dropped"""
+    if not 0 <= shard < n_shards:
+        raise ValueError(f"shard {shard} is outside 0..{n_shards - 1}")
+    sharded = {sector: {t: n for t, n in stocks.items() if shard_of(t, n_shards) == shard}
+               for sector, stocks in sectors.items()}
+    return {sector: stocks for sector, stocks in sharded.items() if stocks}
+
+
+def parse_shard(spec):
+    """'3/16' -> (3, 16)"""
+    shard, n_shards = (int(part) for part in spec.split('/'))
+    if not 0 <= shard < n_shards:
+        raise ValueError(f"shard {spec} must look like i/n with 0 <= i < n")
+    return shard, n_shards
+
+
+def shard_path(shard_dir, shard, n_shards):
+    return os.path.join(shard_dir, f"shard_{shard:04d}_of_{n_shards:04d}.pkl")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build a universe file from the ASX listed companies CSV')
+    parser.add_argument('listed_csv', help='ASXListedCompanies.csv from asx.com.au')
+    parser.add_argument('output', help='universe file to write')
+    parser.add_argument('--industry-groups', nargs='+', default=list(RESOURCE_INDUSTRY_GROUPS),
+                        help="GICS industry groups to keep, or 'all'")
+    args = parser.parse_args()
+    groups = None if args.industry_groups == ['all'] else args.industry_groups
+    sectors = load_asx_listed(args.listed_csv, groups)
+    write_universe(sectors, args.output)
+    print(f"Wrote {sum(len(s) for s in sectors.values())} tickers in {len(sectors)} sectors to {args.output}")
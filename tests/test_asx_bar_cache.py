@@ -0,0 +1,79 @@
+import pandas as pd
+
+from asx_bar_cache import (CachedBarProvider, FileBarProvider, find_frame, period_to_timedelta, read_frame,
+                           trim_to_period)
+from asx_synthetic import synthetic_bars
+
+
+class PublishingSource:
+    """Serves a fixed series up to a publish cursor and logs every request's start"""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.published = len(bars)
+        self.starts = []
+
+    def published_bars(self, start):
+        data = self.bars.iloc[:self.published]
+        return data if start is None else data[data.index.date >= start]
+
+    def get_bars(self, ticker, interval, period, start=None):
+        self.starts.append(start)
+        return self.published_bars(start)
+
+    def get_bars_batch(self, tickers, interval, period, start=None):
+        self.starts.append(start)
+        return {ticker: self.published_bars(start) for ticker in tickers}
+
+
+def recent_bars(days=10):
+    return synthetic_bars('TST.AX', '5m', days, end=pd.Timestamp.now(tz='Australia/Sydney').date()).tz_convert('UTC')
+
+
+def test_period_to_timedelta():
+    assert period_to_timedelta('5d') == pd.Timedelta(days=5)
+    assert period_to_timedelta('2mo') == pd.Timedelta(days=62)
+    assert period_to_timedelta('max') is None
+
+
+def test_trim_to_period_anchors():
+    bars = recent_bars()
+    last = bars.index[-1]
+    assert trim_to_period(bars, '1d').index[0] > last - pd.Timedelta(days=1)
+    assert trim_to_period(bars, '1d', end=last + pd.Timedelta(days=30)).empty
+
+
+def test_incremental_fetch_only_asks_for_new_bars(tmp_path):
+    bars = recent_bars()
+    source = PublishingSource(bars)
+    source.published = len(bars) - 200
+    provider = CachedBarProvider(source, str(tmp_path))
+
+    first = provider.get_bars('TST.AX', '5m', '60d')
+    assert source.starts == [None]
+    assert len(first) == len(bars) - 200
+    assert find_frame(str(tmp_path), 'TST.AX', '5m') is not None
+
+    source.published = len(bars)
+    second = provider.get_bars('TST.AX', '5m', '60d')
+    # Restarted from the cached high-water session, and merged without duplicates
+    assert source.starts[-1] == first.index[-1].date()
+    assert second.index.equals(bars.index)
+    assert (second.to_numpy() == bars.to_numpy()).all()
+    assert provider.requests_made == 2
+
+    replayed = FileBarProvider(str(tmp_path)).get_bars('TST.AX', '5m', '60d')
+    assert len(replayed) == len(bars)
+
+
+def test_batch_groups_tickers_by_restart_date(tmp_path):
+    bars = recent_bars()
+    source = PublishingSource(bars)
+    provider = CachedBarProvider(source, str(tmp_path))
+    provider.get_bars('OLD.AX', '5m', '60d')
+    source.starts.clear()
+    batch = provider.get_bars_batch(['OLD.AX', 'NEW1.AX', 'NEW2.AX'], '5m', '60d')
+    # One request for the cached ticker and one full fetch shared by the two new ones
+    assert sorted(source.starts, key=str) == sorted([None, bars.index[-1].date()], key=str)
+    assert all(len(batch[t]) == len(bars) for t in batch)
+    assert len(read_frame(find_frame(str(tmp_path), 'NEW2.AX', '5m'))) == len(bars)
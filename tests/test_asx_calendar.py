@@ -0,0 +1,58 @@
+from datetime import date
+
+import pandas as pd
+
+from asx_calendar import (CLOSED, CLOSING_AUCTION, CONTINUOUS, OPENING_AUCTION, asx_holidays,
+                          session_calendar)
+
+
+def test_holidays_2025():
+    holidays = asx_holidays(2025)
+    assert holidays[date(2025, 1, 1)] == "New Year's Day"
+    assert date(2025, 4, 18) in holidays  # Good Friday
+    assert date(2025, 4, 21) in holidays  # Easter Monday
+    assert date(2025, 4, 25) in holidays  # Anzac Day, a Friday
+    assert date(2025, 12, 25) in holidays
+    assert date(2025, 12, 26) in holidays
+
+
+def test_weekend_christmas_moves_to_weekdays():
+    # Christmas 2021 was a Saturday and Boxing Day a Sunday
+    holidays = asx_holidays(2021)
+    assert date(2021, 12, 27) in holidays
+    assert date(2021, 12, 28) in holidays
+
+
+def test_trading_days_skip_weekends_and_holidays():
+    calendar = session_calendar()
+    assert calendar.is_trading_day('2025-06-02')
+    assert not calendar.is_trading_day('2025-06-01')  # Sunday
+    assert not calendar.is_trading_day('2025-04-18')  # Good Friday
+    days = calendar.trading_days('2025-04-14', '2025-04-25')
+    assert len(days) == 7
+
+
+def test_locate_places_open_on_the_sydney_clock():
+    calendar = session_calendar()
+    # AEST (June): the open is 08:00 AWST. AEDT (December): it is 07:00 AWST.
+    for awst_open in ('2025-06-02 08:00', '2025-12-01 07:00'):
+        index = pd.Timestamp(awst_open) + pd.to_timedelta([-5, 0, 15, 359], unit='min')
+        position = calendar.locate(index.tz_localize('Australia/Perth'))
+        assert list(position.minute) == [-1, 0, 15, 359]
+        assert list(position.phase[:3]) == [CLOSED, OPENING_AUCTION, CONTINUOUS]
+
+
+def test_naive_timestamps_are_awst():
+    calendar = session_calendar()
+    naive = pd.DatetimeIndex(['2025-06-02 08:30'])
+    assert calendar.minute_of_session(naive)[0] == 30
+
+
+def test_early_close_on_christmas_eve():
+    calendar = session_calendar()
+    index = pd.DatetimeIndex(['2025-12-24 13:59', '2025-12-24 14:05', '2025-12-24 15:00']).tz_localize(
+        'Australia/Sydney')
+    position = calendar.locate(index)
+    assert list(position.minute) == [239, -1, -1]
+    assert list(position.phase) == [CONTINUOUS, CLOSING_AUCTION, CLOSED]
+    assert calendar.windows('2025-12-24', 'Australia/Sydney')['close'].hour == 14
@@ -0,0 +1,54 @@
+import os
+
+from asx_checkpoint import MANIFEST, RunCheckpoint, config_key
+
+
+def test_config_key_is_stable_and_order_free():
+    assert config_key({'a': 1, 'b': [1, 2]}) == config_key({'b': [1, 2], 'a': 1})
+    assert config_key({'a': 1}) != config_key({'a': 2})
+
+
+def test_record_and_resume(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path), {'slot_minutes': 15})
+    checkpoint.record('BHP.AX', {'rows': [1, 2]})
+    checkpoint.record('RIO.AX', None, 'Data fetch failed')
+    checkpoint.save_screen({'BHP.AX': {'current_price': 40.0}})
+
+    resumed = RunCheckpoint(str(tmp_path), {'slot_minutes': 15})
+    assert resumed.directory == checkpoint.directory
+    assert resumed.completed() == ['BHP.AX']
+    assert resumed.load('BHP.AX') == {'rows': [1, 2]}
+    assert resumed.entries()['RIO.AX']['status'] == 'failed'
+    assert resumed.load_screen() == {'BHP.AX': {'current_price': 40.0}}
+
+
+def test_failed_ticker_retried_then_done(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path), {})
+    checkpoint.record('RIO.AX', None, 'timeout')
+    checkpoint.record('RIO.AX', {'ok': True})
+    assert checkpoint.completed() == ['RIO.AX']
+
+
+def test_changed_config_starts_fresh(tmp_path):
+    first = RunCheckpoint(str(tmp_path), {'slot_minutes': 15})
+    first.record('BHP.AX', {'rows': 1})
+    second = RunCheckpoint(str(tmp_path), {'slot_minutes': 30})
+    assert second.directory != first.directory
+    assert second.completed() == []
+    assert second.load_screen() is None
+
+
+def test_torn_manifest_line_loses_only_itself(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path), {})
+    checkpoint.record('BHP.AX', {'rows': 1})
+    with open(checkpoint.path(MANIFEST), 'a') as f:
+        f.write('{"ticker": "FMG.AX", "sta')
+    checkpoint.record('RIO.AX', {'rows': 2})
+    assert checkpoint.completed() == ['BHP.AX', 'RIO.AX']
+
+
+def test_missing_result_file_is_not_done(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path), {})
+    checkpoint.record('BHP.AX', {'rows': 1})
+    os.remove(checkpoint.path('BHP.AX.pkl'))
+    assert checkpoint.completed() == []
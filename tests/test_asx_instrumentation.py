@@ -0,0 +1,47 @@
+import threading
+import tracemalloc
+
+import pytest
+
+from asx_instrumentation import RunRecorder
+
+
+@pytest.fixture
+def tracing():
+    yield
+    tracemalloc.stop()
+
+
+def test_memory_tracking_can_be_enabled_after_construction(tracing):
+    recorder = RunRecorder('test')
+    with recorder.stage('untracked'):
+        pass
+    recorder.enable_memory_tracking()
+    with recorder.stage('outer'):
+        with recorder.stage('inner'):
+            block = bytearray(4 * 2 ** 20)
+        del block
+    untracked, inner, outer = recorder.records
+    assert untracked['peak_bytes'] is None
+    assert inner['peak_bytes'] >= 4 * 2 ** 20
+    # Nested peaks roll up into the enclosing stage
+    assert outer['peak_bytes'] >= inner['peak_bytes']
+
+
+def test_overlapping_stages_get_no_peak(tracing):
+    recorder = RunRecorder('test', track_memory=True)
+    opened, release = threading.Event(), threading.Event()
+
+    def other_thread():
+        with recorder.stage('background'):
+            opened.set()
+            release.wait()
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    opened.wait()
+    with recorder.stage('foreground'):
+        pass
+    release.set()
+    thread.join()
+    assert [record['peak_bytes'] for record in recorder.records] == [None, None]
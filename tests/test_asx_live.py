@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from asx_calendar import ANALYSIS_TZ
+from asx_live import LiveSlotMonitor, live_signal, record_session, replay_session
+from asx_slots import prepare_returns, slot_labels, slot_statistics
+from asx_synthetic import synthetic_bars
+
+
+def history(tickers=('TST.AX',), mean=0.0, std=1.0, signal='BUY'):
+    """A results frame with the same mean/std/signal in every 15-minute slot"""
+    labels = slot_labels(15)
+    return pd.DataFrame([{'Ticker': ticker, 'Timeframe': '5min', 'Time_Period_ASX': label, 'Avg_Return_%': mean,
+                          'Std_Dev_%': std, 'Trading_Signal': signal}
+                         for ticker in tickers for label in labels])
+
+
+@pytest.fixture(scope='module')
+def session_bars():
+    """One synthetic session of 5-minute bars as AWST wall clock, the analyzer's convention"""
+    bars = synthetic_bars('TST.AX', '5m', 7, seed=2).tz_convert(ANALYSIS_TZ).tz_localize(None)
+    return bars[bars.index.normalize() == bars.index.normalize()[-1]]
+
+
+def test_live_signal_thresholds():
+    assert live_signal(float('nan')) == 'INSUFFICIENT_DATA'
+    assert live_signal(2.0) == 'ABOVE_HISTORY'
+    assert live_signal(-2.5) == 'BELOW_HISTORY'
+    assert live_signal(1.9) == 'IN_LINE'
+
+
+def test_first_bar_is_measured_from_the_open():
+    monitor = LiveSlotMonitor(history())
+    # 2025-06-27 10:00 Sydney is 08:00 AWST
+    opening = pd.Timestamp('2025-06-27 08:00')
+    assert monitor.ingest('TST.AX', opening, 101.0) is None
+    monitor.reset_session()
+    update = monitor.ingest('TST.AX', opening, 101.0, open_price=100.0)
+    assert update.period == '10:00-10:15'
+    assert update.bars_in_slot == 1
+    assert update.live_return_pct == pytest.approx(1.0)
+    assert update.z_score == pytest.approx(1.0)
+    assert update.signal == 'IN_LINE'
+    assert update.historical_signal == 'BUY'
+
+
+def test_running_slot_mean_and_z_score():
+    monitor = LiveSlotMonitor(history())
+    start = pd.Timestamp('2025-06-27 08:00')
+    monitor.ingest('TST.AX', start, 102.0, open_price=100.0)
+    update = monitor.ingest('TST.AX', start + pd.Timedelta(minutes=5), 102.0 * 1.04)
+    assert update.bars_in_slot == 2
+    assert update.live_return_pct == pytest.approx(3.0)
+    assert update.z_score == pytest.approx(3.0 * math.sqrt(2))
+    assert update.signal == 'ABOVE_HISTORY'
+    # A new slot starts its own running mean
+    update = monitor.ingest('TST.AX', start + pd.Timedelta(minutes=15), 102.0 * 1.04 * 0.99)
+    assert update.period == '10:15-10:30'
+    assert update.bars_in_slot == 1
+    assert update.live_return_pct == pytest.approx(-1.0)
+
+
+def test_outliers_and_unknown_bars_are_skipped():
+    monitor = LiveSlotMonitor(history())
+    start = pd.Timestamp('2025-06-27 08:00')
+    monitor.ingest('TST.AX', start, 100.0, open_price=100.0)
+    assert monitor.ingest('TST.AX', start + pd.Timedelta(minutes=5), 130.0) is None
+    assert monitor.ingest('OTHER.AX', start, 100.0, open_price=100.0) is None
+    # Before the open, after the close and on a weekend
+    assert monitor.ingest('TST.AX', start - pd.Timedelta(minutes=5), 100.0) is None
+    assert monitor.ingest('TST.AX', pd.Timestamp('2025-06-27 14:00'), 100.0) is None
+    assert monitor.ingest('TST.AX', pd.Timestamp('2025-06-28 09:00'), 100.0, open_price=100.0) is None
+
+
+def test_replayed_session_matches_batch_slot_means(session_bars, tmp_path):
+    path = str(tmp_path / 'session.csv')
+    record_session({'TST.AX': session_bars}, path)
+    monitor = LiveSlotMonitor(history())
+    last = {update.period: update for update in monitor.run(replay_session(path, speed=None))}
+    batch = slot_statistics(prepare_returns(session_bars), 15, min_observations=1)
+    assert sorted(last) == sorted(batch['period'])
+    for _, row in batch.iterrows():
+        assert last[row['period']].bars_in_slot == row['count']
+        assert last[row['period']].live_return_pct == pytest.approx(row['mean'], rel=1e-9)
+    assert np.isfinite([update.latency_ms for update in last.values()]).all()
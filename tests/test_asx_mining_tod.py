@@ -0,0 +1,117 @@
+import contextlib
+import io
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from ASX_Mining_TOD import MiningTimeOfDayAnalyzer, clear_shared_bars
+from asx_bar_cache import CachedBarProvider, FileBarProvider, provider_identity
+from asx_synthetic import SyntheticBarProvider, synthetic_universe
+from asx_universe import write_universe
+
+
+class CountingSource(SyntheticBarProvider):
+    """Recent synthetic bars, counting every request that reaches the source"""
+
+    def __init__(self):
+        super().__init__(end=pd.Timestamp.now(tz='Australia/Sydney').date())
+        self.requests = 0
+
+    def get_bars(self, ticker, interval, period, start=None):
+        self.requests += 1
+        return super().get_bars(ticker, interval, period, start)
+
+    # Identity by instance, so only providers wrapping this very source share cache entries
+    cache_identity = None
+
+
+@pytest.fixture(autouse=True)
+def empty_shared_bars():
+    clear_shared_bars()
+    yield
+    clear_shared_bars()
+
+
+def test_provider_identity_survives_reinstantiation(tmp_path):
+    source = CountingSource()
+    assert provider_identity(CachedBarProvider(source, str(tmp_path))) == \
+        provider_identity(CachedBarProvider(source, str(tmp_path)))
+    assert provider_identity(FileBarProvider(str(tmp_path))) != provider_identity(CachedBarProvider(source, str(tmp_path)))
+    assert provider_identity(source) != provider_identity(CountingSource())
+
+
+def test_second_consumer_does_not_hit_the_source(tmp_path):
+    source = CountingSource()
+    first = MiningTimeOfDayAnalyzer(CachedBarProvider(source, str(tmp_path)))
+    bars = first.fetch_stock_intraday_data('BHP.AX', timeframes=['5min'], lazy=True)['5min']
+    assert source.requests == 1
+    # A fresh analyzer and provider over the same cache, as the backtest builds per ticker
+    second = MiningTimeOfDayAnalyzer(CachedBarProvider(source, str(tmp_path)))
+    again = second.fetch_stock_intraday_data('BHP.AX', timeframes=['5min'], lazy=True)['5min']
+    assert source.requests == 1
+    assert again is bars
+
+    clear_shared_bars(second.bar_provider)
+    MiningTimeOfDayAnalyzer(CachedBarProvider(source, str(tmp_path))).fetch_stock_intraday_data(
+        'BHP.AX', timeframes=['5min'], lazy=True)['5min']
+    assert source.requests == 2
+
+
+def sharded_analyzer(universe, **kwargs):
+    return MiningTimeOfDayAnalyzer(SyntheticBarProvider(days=20), universe=universe, **kwargs)
+
+
+@pytest.fixture(scope='module')
+def universe(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('universe') / 'universe.csv')
+    tickers = synthetic_universe(6)
+    write_universe({'Gold': dict(list(tickers.items())[:3]), 'Copper': dict(list(tickers.items())[3:])}, path)
+    return path
+
+
+@pytest.fixture(scope='module')
+def shard_dir(universe, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('shards'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for shard in range(3):
+            sharded_analyzer(universe).run_shard(shard, 3, shard_dir=path)
+    return path
+
+
+def test_merged_shards_match_a_single_run(universe, shard_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        single = sharded_analyzer(universe)
+        single.filter_mining_stocks()
+        single.analyze_universe()
+        merged = sharded_analyzer(universe)
+        merged.merge_shards(shard_dir, 'parquet')
+    assert sorted(merged.all_results) == sorted(single.all_results) == sorted(synthetic_universe(6))
+    key = ['Ticker', 'Timeframe', 'Time_Period_ASX']
+    pd.testing.assert_frame_equal(merged.get_results_frame().sort_values(key).reset_index(drop=True),
+                                  single.get_results_frame().sort_values(key).reset_index(drop=True))
+    assert merged.valid_stocks == single.valid_stocks
+
+
+def test_merge_refuses_incomplete_or_foreign_shards(universe, shard_dir, tmp_path):
+    partial = tmp_path / 'partial'
+    partial.mkdir()
+    for name in sorted(os.listdir(shard_dir))[:2]:
+        shutil.copy(os.path.join(shard_dir, name), partial)
+    with pytest.raises(ValueError, match=r'Shards \[2\] of 3'):
+        sharded_analyzer(universe).merge_shards(str(partial))
+
+    with pytest.raises(ValueError, match='different run configuration'):
+        sharded_analyzer(universe, slot_minutes=30).merge_shards(shard_dir)
+
+    mixed = tmp_path / 'mixed'
+    shutil.copytree(shard_dir, mixed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sharded_analyzer(universe).run_shard(0, 2, shard_dir=str(mixed))
+    with pytest.raises(ValueError, match='mixes shard counts'):
+        sharded_analyzer(universe).merge_shards(str(mixed))
+
+    with pytest.raises(FileNotFoundError):
+        sharded_analyzer(universe).merge_shards(str(tmp_path / 'empty'))
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from asx_minute_store import MINUTE_DTYPE, MinuteHistoryProvider, MinuteStore
+from asx_synthetic import SyntheticBarProvider, synthetic_bars
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+@pytest.fixture(scope='module')
+def bars():
+    return synthetic_bars('TST.AX', '1m', 7, seed=4)[COLUMNS].astype(float)
+
+
+def session_dates(bars):
+    return sorted(set(bars.index.tz_convert('Australia/Perth').date))
+
+
+def assert_same_bars(frame, bars):
+    expected = bars.set_axis(bars.index.tz_convert('UTC').as_unit('ns'))
+    pd.testing.assert_frame_equal(frame, expected, check_freq=False, check_names=False)
+
+
+def test_overlapping_appends_store_each_bar_once(bars, tmp_path):
+    store = MinuteStore(str(tmp_path))
+    # The second batch repeats the end of the first and splits a session across appends
+    split = len(bars) - 200
+    assert store.append('TST.AX', bars.iloc[:split]) == split
+    assert store.append('TST.AX', bars.iloc[split - 50:]) == 200
+    assert store.append('TST.AX', bars) == 0
+    assert store.tickers() == ['TST.AX']
+    assert_same_bars(store.frame('TST.AX'), bars)
+    assert len(store.days('TST.AX')) == len(session_dates(bars))
+    assert store.last_time('TST.AX') == bars.index[-1]
+
+
+def test_read_maps_only_the_requested_sessions(bars, tmp_path):
+    store = MinuteStore(str(tmp_path))
+    store.append('TST.AX', bars)
+    dates = session_dates(bars)
+    view = store.read('TST.AX', dates[1], dates[2])
+    assert isinstance(view, np.memmap) and view.dtype == MINUTE_DTYPE
+    local = bars.index.tz_convert('Australia/Perth').date
+    assert_same_bars(store.frame('TST.AX', dates[1], dates[2]), bars[(local >= dates[1]) & (local <= dates[2])])
+    assert len(store.read('TST.AX', '2000-01-01', '2000-01-02')) == 0
+    assert len(store.read('UNKNOWN.AX')) == 0
+
+
+def test_unindexed_trailing_bars_are_truncated(bars, tmp_path):
+    store = MinuteStore(str(tmp_path))
+    split = len(bars) - 100
+    store.append('TST.AX', bars.iloc[:split])
+    # A crash between writing bars and the day index leaves records nothing points at
+    with open(store.path('TST.AX', 'bars.bin'), 'ab') as f:
+        f.write(np.zeros(7, dtype=MINUTE_DTYPE).tobytes())
+    store.append('TST.AX', bars.iloc[split:])
+    assert os.path.getsize(store.path('TST.AX', 'bars.bin')) == len(bars) * MINUTE_DTYPE.itemsize
+    assert_same_bars(store.frame('TST.AX'), bars)
+
+
+def test_history_provider_serves_minutes_from_the_store(bars, tmp_path):
+    store = MinuteStore(str(tmp_path))
+    store.append('TST.AX', bars)
+    source = SyntheticBarProvider(seed=4)
+    provider = MinuteHistoryProvider(store, source)
+    assert_same_bars(provider.get_bars('TST.AX', '1m', '7d'), bars)
+    start = bars.index[-30]
+    assert_same_bars(provider.get_bars('TST.AX', '1m', '7d', start=start), bars.iloc[-30:])
+    # Other intervals and tickers the store has never seen go to the source
+    served = source.bars_served
+    provider.get_bars('TST.AX', '5m', '7d')
+    provider.get_bars('OTHER.AX', '1m', '7d')
+    assert source.bars_served > served
+    limited = MinuteHistoryProvider(store, source, history_days=1).get_bars('TST.AX', '1m', '7d')
+    assert limited.index[0] >= bars.index[-1] - pd.Timedelta(days=1)
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from asx_pipeline import FetchFailed, TokenBucket, fetch_with_backoff, run_pipeline
+
+
+class Flaky:
+    """Fails the first `failures` calls with `error`, then returns the ticker"""
+
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, ticker):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error(f"attempt {self.calls}")
+        return ticker
+
+
+def fetch(fn, max_retries=3, cost=1, rate=1000.0):
+    return asyncio.run(fetch_with_backoff(fn, 'BHP.AX', TokenBucket(rate, capacity=max(rate, cost)), max_retries,
+                                          base_delay=0.001, max_delay=0.002, cost=cost))
+
+
+def test_token_bucket_limits_the_rate():
+    async def take(bucket, n, cost):
+        started = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire(cost)
+        return time.monotonic() - started
+
+    # A burst of 3 tokens, then 3 tokens per attempt at 30/s: 4 more attempts need about 0.4s
+    elapsed = asyncio.run(take(TokenBucket(30, capacity=3), 5, 3))
+    assert 0.3 < elapsed < 1.0
+    with pytest.raises(ValueError):
+        asyncio.run(TokenBucket(2).acquire(3))
+
+
+def test_transient_errors_are_retried():
+    flaky = Flaky(2)
+    assert fetch(flaky) == ('BHP.AX', 2)
+    assert flaky.calls == 3
+
+
+def test_retries_reported_when_giving_up():
+    with pytest.raises(FetchFailed) as failed:
+        fetch(Flaky(10), max_retries=2)
+    assert failed.value.retries == 2
+
+
+def test_non_transient_errors_fail_at_once():
+    flaky = Flaky(10, error=ValueError)
+    with pytest.raises(FetchFailed) as failed:
+        fetch(flaky)
+    assert failed.value.retries == 0
+    assert flaky.calls == 1
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.flaky = {'RIO.AX': Flaky(1), 'BAD.AX': Flaky(10, error=KeyError)}
+
+    def provider_requests(self):
+        return 3
+
+    def load_intraday_data(self, ticker):
+        if ticker in self.flaky:
+            self.flaky[ticker](ticker)
+        if ticker == 'EMPTY.AX':
+            return {}
+        return {'5min': pd.DataFrame({'Close': [1.0, 2.0]})}
+
+    def analyze_stock_tod_patterns(self, ticker, stock_data, errors):
+        return {'5min': stock_data['5min'].assign(Ticker=ticker)}
+
+
+def test_pipeline_outcomes_in_ticker_order():
+    tickers = ['BAD.AX', 'BHP.AX', 'RIO.AX', 'EMPTY.AX']
+    outcomes = asyncio.run(run_pipeline(FakeAnalyzer(), tickers, concurrency=2, rate=100.0, max_retries=2))
+    assert list(outcomes) == tickers
+    results, error, stats = outcomes['BAD.AX']
+    assert results is None and error.startswith('Data fetch failed') and stats['retries'] == 0
+    assert outcomes['RIO.AX'][2]['retries'] == 1
+    assert outcomes['BHP.AX'][0]['5min']['Ticker'].iloc[0] == 'BHP.AX'
+    assert outcomes['BHP.AX'][2]['rows'] == 2
+    assert outcomes['EMPTY.AX'][1] == 'Data fetch failed: insufficient data'
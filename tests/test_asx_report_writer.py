@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from asx_report_writer import SUMMARY_SHEET, load_report, open_report_writer, ticker_sheet_name
+
+
+def ticker_results(ticker):
+    return {timeframe: pd.DataFrame({'Ticker': ticker, 'Timeframe': timeframe,
+                                     'Time_Period_ASX': ['10:00-10:15', '10:15-10:30'],
+                                     'Avg_Return_%': [0.12345, np.nan], 'Observations': [10, 12]})
+            for timeframe in ('5min', '15min')}
+
+
+SUMMARY = pd.DataFrame({'Ticker': ['BHP.AX', 'RIO.AX'], 'Expected_Swing_%': [0.4, 0.1]})
+
+
+def write_report(writer):
+    """Tickers first and the summary last, the order the analyzer streams them in"""
+    writer.write_ticker('BHP.AX', ticker_results('BHP.AX'))
+    writer.write_ticker('RIO.AX', ticker_results('RIO.AX'))
+    writer.write_table(SUMMARY_SHEET, SUMMARY)
+    return writer.close()
+
+
+def test_ticker_sheet_name_fits_excel():
+    assert ticker_sheet_name('BHP.AX', '5min') == 'BHP_5min'
+    assert len(ticker_sheet_name('A' * 40 + '.AX', '5min')) == 31
+
+
+def test_xlsx_keeps_summary_first(tmp_path):
+    path = write_report(open_report_writer(str(tmp_path / 'report')))
+    assert path.endswith('report.xlsx')
+    workbook = load_workbook(path, read_only=True)
+    assert workbook.sheetnames == [SUMMARY_SHEET, 'BHP_5min', 'BHP_15min', 'RIO_5min', 'RIO_15min']
+    rows = list(workbook['BHP_5min'].values)
+    assert rows[0] == ('Ticker', 'Timeframe', 'Time_Period_ASX', 'Avg_Return_%', 'Observations')
+    assert rows[1] == ('BHP.AX', '5min', '10:00-10:15', 0.12345, 10)
+    # Missing values become empty cells
+    assert rows[2][3] is None
+    workbook.close()
+
+
+def test_xlsx_without_summary_drops_the_reserved_sheet(tmp_path):
+    writer = open_report_writer(str(tmp_path / 'report'))
+    writer.write_ticker('BHP.AX', ticker_results('BHP.AX'))
+    workbook = load_workbook(writer.close(), read_only=True)
+    assert workbook.sheetnames == ['BHP_5min', 'BHP_15min']
+    workbook.close()
+
+
+@pytest.mark.parametrize('backend', ['parquet', 'arrow'])
+def test_columnar_round_trip(tmp_path, backend):
+    path = write_report(open_report_writer(str(tmp_path / 'report'), backend))
+    sheets = load_report(path)
+    assert list(sheets) == [SUMMARY_SHEET, 'BHP_5min', 'BHP_15min', 'RIO_5min', 'RIO_15min']
+    pd.testing.assert_frame_equal(sheets[SUMMARY_SHEET], SUMMARY)
+    pd.testing.assert_frame_equal(sheets['RIO_15min'], ticker_results('RIO.AX')['15min'])
+
+
+def test_discard_removes_partial_output(tmp_path):
+    for backend in ('xlsx', 'parquet'):
+        writer = open_report_writer(str(tmp_path / backend), backend)
+        writer.write_ticker('BHP.AX', ticker_results('BHP.AX'))
+        writer.discard()
+    assert os.listdir(tmp_path) == []
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match='Unknown report backend'):
+        open_report_writer('report', 'csv')
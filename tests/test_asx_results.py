@@ -0,0 +1,113 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from asx_results import NUMERIC_COLUMNS, RESULT_COLUMNS, SlotResults
+from asx_slots import slot_labels
+
+
+def stock_frame(ticker, timeframe, seed, significance=False):
+    """One analyzer result frame: a row per 15-minute slot"""
+    rng = np.random.default_rng(seed)
+    labels = slot_labels(15)
+    n = len(labels)
+    frame = pd.DataFrame({
+        'Ticker': ticker,
+        'Timeframe': timeframe,
+        'Time_Period_ASX': labels,
+        'Avg_Return_%': rng.normal(0, 0.1, n).round(5),
+        'Median_Return_%': rng.normal(0, 0.1, n).round(5),
+        'Std_Dev_%': rng.uniform(0.1, 0.5, n).round(5),
+        'Min_Return_%': rng.uniform(-2, -1, n).round(5),
+        'Max_Return_%': rng.uniform(1, 2, n).round(5),
+        'Observations': rng.integers(20, 60, n),
+        'Positive_Returns': rng.integers(0, 20, n),
+        'Negative_Returns': rng.integers(0, 20, n),
+        'Win_Rate_%': rng.uniform(30, 70, n).round(2),
+        'Avg_Volume': rng.integers(10 ** 8, 10 ** 9, n).astype(float),
+        'Volume_Ratio_vs_Daily': rng.uniform(0.5, 2, n).round(3),
+        'Volatility_Rank': rng.choice(['HIGH', 'MEDIUM', 'LOW'], n),
+        'Pattern_Strength': rng.choice(['STRONG', 'WEAK'], n),
+        'Trading_Signal': rng.choice(['BUY', 'SELL', 'NEUTRAL'], n),
+    })
+    if significance:
+        frame['P_Value'] = rng.uniform(0, 1, n).round(5)
+        frame['P_Adjusted'] = rng.uniform(0, 1, n).round(5)
+        frame['CI_Low_%'] = rng.uniform(-1, 0, n).round(5)
+        frame['CI_High_%'] = rng.uniform(0, 1, n).round(5)
+    return frame
+
+
+def stock_results(ticker, seed, significance=False):
+    return {timeframe: stock_frame(ticker, timeframe, seed + i, significance)
+            for i, timeframe in enumerate(['5min', '15min'])}
+
+
+def assert_frames_match(ours, expected):
+    pd.testing.assert_frame_equal(ours.reset_index(drop=True), expected[list(ours.columns)].reset_index(drop=True),
+                                  check_dtype=False, rtol=1e-6)
+
+
+def test_round_trip_and_dict_behaviour():
+    results = SlotResults()
+    originals = {ticker: stock_results(ticker, seed) for seed, ticker in enumerate(['AAA.AX', 'BBB.AX', 'CCC.AX'])}
+    for ticker, frames in originals.items():
+        results[ticker] = frames
+    assert len(results) == 3 and 'BBB.AX' in results and 'ZZZ.AX' not in results
+    assert results.keys() == list(originals)
+    assert list(results.to_frame().columns) == RESULT_COLUMNS
+    assert results.row_count() == 3 * 2 * len(slot_labels(15))
+    for ticker, frames in results.items():
+        assert list(frames) == ['5min', '15min']
+        for timeframe, frame in frames.items():
+            assert_frames_match(frame, originals[ticker][timeframe])
+    with pytest.raises(KeyError):
+        results['AAA.AX'] = originals['AAA.AX']
+
+
+def test_lookup_and_compact_dtypes():
+    results = SlotResults()
+    results['AAA.AX'] = stock_results('AAA.AX', 0)
+    expected = stock_frame('AAA.AX', '15min', 1).iloc[3]
+    row = results.lookup('AAA.AX', '15min', expected['Time_Period_ASX'])
+    assert row['Trading_Signal'] == expected['Trading_Signal']
+    assert row['Avg_Return_%'] == pytest.approx(expected['Avg_Return_%'], rel=1e-6)
+    columns = results.consolidate()
+    assert columns['Ticker'].dtype == np.int32
+    for column, (dtype, _) in NUMERIC_COLUMNS.items():
+        assert columns[column].dtype == dtype
+
+
+def test_extend_remaps_categories_and_keeps_significance():
+    first, second = SlotResults(), SlotResults()
+    first['AAA.AX'] = stock_results('AAA.AX', 0)
+    second['BBB.AX'] = stock_results('BBB.AX', 5, significance=True)
+    second['AAA2.AX'] = stock_results('AAA2.AX', 7, significance=True)
+    first.extend(second)
+    assert first.keys() == ['AAA.AX', 'BBB.AX', 'AAA2.AX']
+    assert first.has_significance
+    frame = first.to_frame()
+    assert frame.loc[frame['Ticker'] == 'AAA.AX', 'P_Value'].isna().all()
+    assert_frames_match(first['BBB.AX']['5min'], stock_frame('BBB.AX', '5min', 5, significance=True))
+    with pytest.raises(KeyError):
+        first.extend(second)
+
+
+def test_pickle_round_trip():
+    results = SlotResults()
+    results['AAA.AX'] = stock_results('AAA.AX', 0)
+    results.lookup('AAA.AX', '5min', '10:00-10:15')
+    restored = pickle.loads(pickle.dumps(results))
+    assert restored.row_index is None
+    pd.testing.assert_frame_equal(restored.to_frame(), results.to_frame())
+    restored['BBB.AX'] = stock_results('BBB.AX', 3)
+    assert restored.keys() == ['AAA.AX', 'BBB.AX']
+
+
+def test_empty_store():
+    results = SlotResults()
+    assert len(results) == 0
+    assert list(results.to_frame().columns) == RESULT_COLUMNS
+    assert results.to_frame().empty
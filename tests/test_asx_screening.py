@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from asx_bar_cache import CachedBarProvider
+from asx_calendar import session_calendar
+from asx_screening import screen_universe
+from asx_synthetic import synthetic_bars
+
+
+class DailyBatches:
+    def __init__(self, bars):
+        self.bars = bars
+        self.batches = []
+
+    def get_bars_batch(self, tickers, interval, period, start=None):
+        self.batches.append(list(tickers))
+        return {ticker: self.bars.get(ticker, pd.DataFrame()) for ticker in tickers}
+
+
+def daily(closes, volumes, days):
+    index = pd.DatetimeIndex(days).tz_localize('Australia/Sydney')
+    return pd.DataFrame({'Close': closes, 'Volume': volumes}, index=index)
+
+
+DAYS = ['2025-06-02', '2025-06-03', '2025-06-04', '2025-06-05', '2025-06-06']
+
+
+def test_screen_averages_each_ticker_over_its_own_bars():
+    provider = DailyBatches({
+        'OLD.AX': daily([1.0] * 5, [100] * 5, DAYS),
+        'NEW.AX': daily([2.0, 2.5], [100, 300], DAYS[3:]),  # listed mid-week
+        'LOW.AX': daily([0.05] * 5, [1000] * 5, DAYS),
+    })
+    screen = screen_universe(provider, {'OLD.AX': 'a', 'NEW.AX': 'b', 'LOW.AX': 'c', 'GONE.AX': 'd'},
+                             min_avg_volume=150, batch_size=3)
+    assert provider.batches == [['OLD.AX', 'NEW.AX', 'LOW.AX'], ['GONE.AX']]
+    assert list(screen.index) == ['OLD.AX', 'NEW.AX', 'LOW.AX', 'GONE.AX']
+    assert screen.loc['NEW.AX', 'avg_volume'] == pytest.approx(200)
+    assert screen.loc['NEW.AX', 'current_price'] == pytest.approx(2.5)
+    assert screen.loc['NEW.AX', 'avg_turnover'] == pytest.approx((200 + 750) / 2)
+    assert np.isnan(screen.loc['GONE.AX', 'current_price'])
+    assert screen['Passed'].tolist() == [False, True, False, False]
+
+
+def test_recent_sessions_skip_holidays():
+    # The Tuesday after Easter 2025, before the open: Good Friday and Easter Monday are not sessions
+    now = pd.Timestamp('2025-04-22 09:00', tz='Australia/Sydney')
+    sessions = session_calendar().recent_sessions(5, now)
+    assert [d.strftime('%m-%d') for d in sessions] == ['04-11', '04-14', '04-15', '04-16', '04-17']
+
+
+def test_cached_daily_period_counts_sessions(tmp_path):
+    class Source:
+        def get_bars(self, ticker, interval, period, start=None):
+            return synthetic_bars(ticker, '1d', 30, end=pd.Timestamp.now(tz='Australia/Sydney').date())
+
+    bars = CachedBarProvider(Source(), str(tmp_path)).get_bars('TST.AX', '1d', '5d')
+    assert len(bars) == 5
+
+
+def test_cached_daily_period_drops_stale_tickers(tmp_path):
+    class Source:
+        def get_bars(self, ticker, interval, period, start=None):
+            return synthetic_bars(ticker, '1d', 30, end='2025-06-27')
+
+    assert CachedBarProvider(Source(), str(tmp_path)).get_bars('OLD.AX', '1d', '5d').empty
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from asx_significance import benjamini_hochberg, padded_slot_returns, series_seed, slot_significance
+
+
+def slot_returns(returns_by_slot, slot_minutes=15):
+    """A prepare_returns-style frame from {slot code: returns}, placed by minute of session"""
+    minutes = [code * slot_minutes for code, returns in returns_by_slot.items() for _ in returns]
+    returns = [r for slot in returns_by_slot.values() for r in slot]
+    return pd.DataFrame({'returns': returns, 'minute_of_session': minutes})
+
+
+def test_benjamini_hochberg_by_hand():
+    adjusted = benjamini_hochberg([0.01, 0.04, np.nan, 0.03, 0.005])
+    np.testing.assert_allclose(adjusted, [0.02, 0.04, np.nan, 0.04, 0.02])
+    # Step-up: a larger p-value further down caps the ones above it
+    np.testing.assert_allclose(benjamini_hochberg([0.01, 0.02, 0.025]), [0.025, 0.025, 0.025])
+    np.testing.assert_allclose(benjamini_hochberg([0.5, 0.9]), [0.9, 0.9])
+    assert np.isnan(benjamini_hochberg([np.nan, np.nan])).all()
+
+
+def test_padded_slot_returns_drops_thin_slots():
+    slots, values, mask = padded_slot_returns(slot_returns({0: [1.0, 2.0, 3.0, 4.0], 2: [5.0, 6.0, 7.0], 3: [1.0]}))
+    np.testing.assert_array_equal(slots, [0, 2])
+    np.testing.assert_array_equal(values, [[1, 2, 3, 4], [5, 6, 7, 0]])
+    np.testing.assert_array_equal(mask, [[1, 1, 1, 1], [1, 1, 1, 0]])
+
+
+def test_sign_flip_p_value_and_bootstrap_ci():
+    rng = np.random.default_rng(3)
+    data = slot_returns({
+        # Three equal returns: only the all-same sign flips are as extreme, p = 2 / 2**3
+        0: [0.5, 0.5, 0.5],
+        1: list(rng.normal(1.0, 0.2, 40)),
+        2: list(rng.normal(0.0, 0.2, 40)),
+    })
+    result = slot_significance(data, n_resamples=20000, chunk_size=3000)
+    assert list(result.index) == [0, 1, 2]
+    assert result.loc[0, 'p_value'] == pytest.approx(0.25, abs=0.015)
+    assert result.loc[1, 'p_value'] < 0.001
+    assert result.loc[2, 'p_value'] > 0.05
+    np.testing.assert_allclose(result['p_adjusted'], benjamini_hochberg(result['p_value']))
+    for slot in (1, 2):
+        mean = data.loc[data['minute_of_session'] == slot * 15, 'returns'].mean()
+        assert result.loc[slot, 'ci_low'] < mean < result.loc[slot, 'ci_high']
+    assert result.loc[1, 'ci_low'] > 0
+
+
+def test_seeded_results_repeat():
+    data = slot_returns({0: [0.1, -0.3, 0.2, 0.4], 5: [0.2, 0.1, -0.1]})
+    seed = series_seed('BHP.AX', '5min')
+    first = slot_significance(data, n_resamples=500, seed=seed)
+    pd.testing.assert_frame_equal(first, slot_significance(data, n_resamples=500, seed=seed))
+    assert series_seed('BHP.AX', '5min') != series_seed('BHP.AX', '15min')
+
+
+def test_no_slots_with_enough_observations():
+    result = slot_significance(slot_returns({0: [0.1, 0.2]}))
+    assert result.empty
+    assert list(result.columns) == ['p_value', 'p_adjusted', 'ci_low', 'ci_high']
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from asx_slots import (AFTERNOON_SESSION_MINUTES, MORNING_SESSION_MINUTES, assign_slots, in_session_window,
+                       prepare_returns, slot_labels)
+
+
+def sydney_bars(rows):
+    """Bars from (Sydney timestamp, open, close) rows"""
+    index = pd.DatetimeIndex([row[0] for row in rows]).tz_localize('Australia/Sydney')
+    return pd.DataFrame({'Open': [row[1] for row in rows], 'Close': [row[2] for row in rows],
+                         'Volume': 1000.0}, index=index)
+
+
+def test_slot_labels_follow_the_session_clock():
+    labels = slot_labels(15)
+    assert len(labels) == 24
+    assert labels[0] == '10:00-10:15'
+    assert labels[-1] == '15:45-16:00'
+    assert slot_labels(60)[-1] == '15:00-16:00'
+
+
+def test_assign_slots_half_open():
+    index = pd.DatetimeIndex(['2025-06-02 09:55', '2025-06-02 10:00', '2025-06-02 10:14',
+                              '2025-06-02 10:15']).tz_localize('Australia/Sydney')
+    assert list(assign_slots(index, 15)) == [-1, 0, 0, 1]
+
+
+def test_session_windows():
+    labels = slot_labels(15)
+    morning = np.array(labels)[in_session_window(labels, MORNING_SESSION_MINUTES)]
+    afternoon = np.array(labels)[in_session_window(labels, AFTERNOON_SESSION_MINUTES)]
+    assert morning[0] == '10:00-10:15' and morning[-1] == '11:45-12:00'
+    assert afternoon[0] == '14:00-14:15' and afternoon[-1] == '15:45-16:00'
+
+
+def test_prepare_returns_restarts_each_session():
+    bars = sydney_bars([
+        ('2025-06-02 09:55', 9.0, 9.0),   # before the open, dropped
+        ('2025-06-02 10:00', 10.0, 10.5),
+        ('2025-06-02 10:05', 10.5, 10.0),
+        ('2025-06-03 10:00', 11.0, 11.0),
+        ('2025-06-03 10:05', 11.0, 12.1),
+    ])
+    work = prepare_returns(bars)
+    assert len(work) == 4
+    assert work['returns'].tolist() == pytest.approx([5.0, 10.0 / 10.5 * 100 - 100, 0.0, 10.0])
+    # The 10.0 -> 11.0 gap is the overnight return, not the first slot's
+    assert work['overnight'].iloc[2] == pytest.approx(10.0)
+    assert work['overnight'].isna().sum() == 3
+    assert work['minute_of_session'].tolist() == [0, 5, 0, 5]
+    assert work['session'].iloc[0] + 1 == work['session'].iloc[2]
+
+
+def test_prepare_returns_drops_outliers_and_missing_opens():
+    bars = sydney_bars([
+        ('2025-06-02 10:00', np.nan, 10.0),  # first bar without an open has no return
+        ('2025-06-02 10:05', 10.0, 10.1),
+        ('2025-06-02 10:10', 10.1, 13.0),    # +28.7%, over the 25% filter
+        ('2025-06-02 10:15', 13.0, 13.0),
+    ])
+    work = prepare_returns(bars)
+    assert work.index.strftime('%H:%M').tolist() == ['10:05', '10:15']
+    assert (work['returns'].abs() < 25).all()
+    assert len(prepare_returns(bars, max_abs_return=50)) == 3
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from asx_slots import prepare_returns, slot_statistics
+from asx_stats_store import (SlotStatsStore, accumulate, merge_accumulators, multi_resolution_statistics,
+                             rollup_accumulators)
+from asx_synthetic import synthetic_bars
+
+COMPARED = ['mean', 'std', 'min', 'max', 'count', 'positive', 'negative', 'avg_volume', 'volume_ratio']
+
+
+@pytest.fixture(scope='module')
+def bars():
+    return synthetic_bars('TST.AX', '5m', 30, seed=1)
+
+
+def assert_matches_batch(stats, bars, slot_minutes=15):
+    batch = slot_statistics(prepare_returns(bars), slot_minutes)
+    assert list(stats.index) == list(batch.index)
+    assert list(stats['period']) == list(batch['period'])
+    for column in COMPARED:
+        np.testing.assert_allclose(stats[column].to_numpy(dtype=float), batch[column].to_numpy(dtype=float),
+                                   rtol=1e-9, err_msg=column)
+
+
+def test_merge_accumulators_matches_one_pass(bars):
+    work = prepare_returns(bars)
+    half = len(work) // 2
+    merged = merge_accumulators(accumulate(work.iloc[:half]).astype(float), accumulate(work.iloc[half:]).astype(float))
+    whole = accumulate(work).astype(float)
+    pd.testing.assert_frame_equal(merged, whole, check_names=False, rtol=1e-9)
+
+
+def test_rollup_matches_direct_accumulation(bars):
+    work = prepare_returns(bars)
+    rolled = rollup_accumulators(accumulate(work, 5).astype(float), 5, [15, 60])
+    for slot_minutes in (15, 60):
+        direct = accumulate(work, slot_minutes).astype(float)
+        ours = rolled.xs(slot_minutes, level='slot_minutes')
+        np.testing.assert_allclose(ours.to_numpy(), direct.to_numpy(), rtol=1e-9)
+
+
+def test_multi_resolution_matches_single_resolution(bars):
+    work = prepare_returns(bars)
+    stats = multi_resolution_statistics(work, (15, 30))
+    for slot_minutes in (15, 30):
+        single = slot_statistics(work, slot_minutes)
+        ours = stats.xs(slot_minutes, level='slot_minutes')
+        np.testing.assert_allclose(ours['mean'], single['mean'], rtol=1e-9)
+        np.testing.assert_allclose(ours['median'], single['median'], rtol=1e-9)
+
+
+def test_incremental_updates_match_batch(bars):
+    store = SlotStatsStore()
+    sessions = np.unique(bars.index.date)
+    added = 0
+    for cut in (sessions[5], sessions[12], sessions[-1]):
+        added += store.update('TST.AX', '5min', bars[bars.index.date <= cut])
+    assert added == len(prepare_returns(bars))
+    # Nothing new: nothing is counted twice
+    assert store.update('TST.AX', '5min', bars) == 0
+    assert_matches_batch(store.slot_statistics('TST.AX', '5min'), bars)
+
+
+def test_save_and_reload(bars, tmp_path):
+    store = SlotStatsStore(str(tmp_path))
+    store.update('TST.AX', '5min', bars.iloc[:600])
+    store.save()
+    reopened = SlotStatsStore(str(tmp_path))
+    assert reopened.timeframes('TST.AX') == ['5min']
+    reopened.update('TST.AX', '5min', bars)
+    assert_matches_batch(reopened.slot_statistics('TST.AX', '5min'), bars)
+    with pytest.raises(ValueError):
+        SlotStatsStore(str(tmp_path), slot_minutes=5)
+
+
+def test_merge_keeps_series_apart(bars):
+    other_bars = synthetic_bars('OTH.AX', '5m', 30, seed=2)
+    left, right = SlotStatsStore(), SlotStatsStore()
+    left.update('TST.AX', '5min', bars)
+    right.update('OTH.AX', '5min', other_bars)
+    left.merge(right)
+    assert sorted(left.slots.index.get_level_values('ticker').unique()) == ['OTH.AX', 'TST.AX']
+    assert_matches_batch(left.slot_statistics('OTH.AX', '5min'), other_bars)
+    assert_matches_batch(left.slot_statistics('TST.AX', '5min', slot_minutes=30), bars, slot_minutes=30)
+    with pytest.raises(ValueError):
+        left.merge(SlotStatsStore(slot_minutes=5))
+
+
+def test_in_progress_session_is_left_for_later(bars):
+    last_session = bars.index[-1].date()
+    during = pd.Timestamp(f"{last_session} 12:00", tz='Australia/Sydney')
+    store = SlotStatsStore()
+    store.update('TST.AX', '5min', bars[bars.index < during], now=during)
+    assert store.series[('TST.AX', '5min')]['last_timestamp'].date() < last_session
+    # After the close the whole session goes in, including the bars seen earlier in the day
+    store.update('TST.AX', '5min', bars, now=during + pd.Timedelta(hours=6))
+    assert_matches_batch(store.slot_statistics('TST.AX', '5min'), bars)
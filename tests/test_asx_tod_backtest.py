@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ASX_TOD_Backtest as backtest
+from asx_synthetic import synthetic_bars
+
+
+def sydney_closes(day, times, closes):
+    index = pd.DatetimeIndex([f"{day} {t}" for t in times]).tz_localize('Australia/Sydney')
+    return pd.DataFrame({'Close': closes}, index=index)
+
+
+@pytest.fixture(scope='module')
+def prices():
+    return synthetic_bars('TST.AX', '5m', 120, seed=3)[['Close']]
+
+
+def test_last_slot_trades_on_its_last_bar():
+    prices = pd.concat([
+        sydney_closes('2025-06-02', ['10:00', '10:05', '10:10', '15:50', '15:55'], [10.0, 10.1, 10.2, 10.8, 11.0]),
+        sydney_closes('2025-12-24', ['10:00', '10:05', '10:10', '13:55'], [10.0, 10.0, 10.0, 9.0]),  # early close
+    ])
+    results = backtest.test_strategy(prices, '10:00-10:15', '15:45-16:00')
+    assert results['return'].tolist() == pytest.approx([11.0 / 10.2 - 1])
+    coverage = results.attrs['coverage']
+    assert coverage['trades'] == 1 and coverage['dropped'] == 1
+    assert coverage['sell_bars'] == 1
+
+
+def test_walk_forward_reports_dropped_trades(prices):
+    trades = backtest.walk_forward(prices, train_days=40, test_days=5)
+    coverage = trades.attrs['coverage']
+    assert coverage['test_days'] == coverage['trades'] + coverage['dropped']
+    assert coverage['dropped'] == 0
+    assert set(trades['window']) == set(range(trades['window'].max() + 1))
+
+
+def test_price_matrix_is_session_by_session_clock():
+    sydney = pd.concat([
+        sydney_closes('2025-06-02', ['09:55', '10:00', '10:05'], [9.0, 10.0, 10.5]),
+        sydney_closes('2025-06-03', ['10:05', '16:05'], [11.0, 12.0]),
+    ])
+    matrix = backtest.build_price_matrix(sydney)
+    assert list(matrix.columns) == ['10:00', '10:05']
+    assert [d.isoformat() for d in matrix.index] == ['2025-06-02', '2025-06-03']
+    assert np.isnan(matrix.loc[matrix.index[1], '10:00'])
+    assert matrix.loc[matrix.index[1], '10:05'] == 11.0
+    # Naive timestamps are AWST wall clock: 08:00 AWST is the 10:00 Sydney open in June
+    awst = sydney.tz_convert('Australia/Perth').tz_localize(None)
+    pd.testing.assert_frame_equal(backtest.build_price_matrix(awst), matrix)
+
+
+def test_price_matrix_coverage_counts_tradable_slot_ends():
+    prices = pd.concat([
+        sydney_closes('2025-06-02', ['10:00', '10:20', '15:55'], [10.0, 10.1, 10.2]),
+        sydney_closes('2025-06-03', ['10:05', '15:40'], [11.0, 11.1]),
+    ])
+    coverage = backtest.price_matrix_coverage(backtest.build_price_matrix(prices))
+    assert len(coverage) == 24
+    assert coverage['10:00-10:15'] == 2
+    assert coverage['10:15-10:30'] == 1
+    assert coverage['15:30-15:45'] == 1
+    assert coverage['15:45-16:00'] == 1
+    assert coverage['12:00-12:15'] == 0
+
+
+def test_strategy_matches_a_loop_over_sessions(prices):
+    matrix = backtest.build_price_matrix(prices)
+    results = backtest.test_strategy(prices, '10:30-10:45', '14:00-14:15', matrix=matrix)
+    expected = []
+    for day, row in matrix.iterrows():
+        buy = row[[c for c in matrix.columns if '10:30' <= c < '10:45']].dropna()
+        sell = row[[c for c in matrix.columns if '14:00' <= c < '14:15']].dropna()
+        if len(buy) and len(sell):
+            expected.append(sell.iloc[-1] / buy.iloc[-1] - 1)
+    assert results['return'].tolist() == pytest.approx(expected)
+
+
+def test_slot_close_matrix_matches_slot_close(prices):
+    matrix = backtest.build_price_matrix(prices)
+    closes = backtest.slot_close_matrix(matrix, 30)
+    assert list(closes.columns) == backtest.slot_labels(30)
+    for period in ('10:00-10:30', '15:30-16:00'):
+        pd.testing.assert_series_equal(closes[period], backtest.slot_close(matrix, period), check_names=False)
+
+
+def test_pair_surface_agrees_with_test_strategy(prices):
+    other = synthetic_bars('OTH.AX', '5m', 60, seed=4)[['Close']]
+    search = backtest.search_all_pairs({'TST.AX': prices, 'OTH.AX': other, 'NONE.AX': None,
+                                        'SHUT.AX': prices.iloc[:0]}, top_n=5)
+    assert list(search['ticker_surfaces']) == ['TST.AX', 'OTH.AX']
+    surface = search['ticker_surfaces']['TST.AX']
+    assert surface['trades'].shape == (24, 24)
+    for entry, exit_ in (('10:00-10:15', '15:45-16:00'), ('11:15-11:30', '13:00-13:15')):
+        trades = backtest.test_strategy(prices, entry, exit_)
+        assert surface['trades'].loc[entry, exit_] == len(trades)
+        assert surface['mean_return_%'].loc[entry, exit_] == pytest.approx(trades['return'].mean() * 100)
+    # Only exits after the entry are priced
+    assert surface['trades'].loc['13:00-13:15', '11:15-11:30'] == 0
+    pooled = search['sector_surface']['trades']
+    assert (pooled == surface['trades'] + search['ticker_surfaces']['OTH.AX']['trades']).all().all()
+    assert len(search['ticker_top_pairs']) == 10
+
+
+def test_pair_search_follows_slot_size(prices):
+    search = backtest.search_all_pairs({'TST.AX': prices}, slot_minutes=60)
+    assert list(search['sector_surface']['trades'].index) == backtest.slot_labels(60)
+
+
+def test_walk_forward_picks_slots_from_the_training_window_only(prices):
+    train_days, test_days = 30, 7
+    trades = backtest.walk_forward(prices, train_days, test_days, min_observations=5)
+    days, sums, counts = backtest.daily_slot_sums(prices)
+    for window, rows in trades.groupby('window'):
+        first = rows.iloc[0]
+        test_start = train_days + window * test_days
+        assert first['train_start'] == days[test_start - train_days]
+        assert first['train_end'] == days[test_start - 1]
+        assert (rows['date'] > first['train_end']).all()
+        assert (rows['date'] <= days[min(test_start + test_days, len(days)) - 1]).all()
+        # The rolled sums equal a fresh sum over the training sessions
+        window_counts = counts[test_start - train_days:test_start].sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(window_counts > 5, sums[test_start - train_days:test_start].sum(axis=0) / window_counts,
+                             np.nan)
+        assert first['buy_time'] == backtest.slot_end_time(int(np.nanargmin(means)))
+        assert first['sell_time'] == backtest.slot_end_time(int(np.nanargmax(means)))
+
+
+def test_walk_forward_needs_more_than_the_training_window(prices):
+    assert backtest.walk_forward(prices, train_days=500).empty
+    assert backtest.walk_forward(None).empty